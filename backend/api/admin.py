@@ -1,8 +1,34 @@
+from django.conf import settings
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+
 from .models import PreTrial, UserAccount, Lawyer, Judge
+from .sharding import shards
+
+
+class ShardFilter(admin.SimpleListFilter):
+    """
+    Lists the rows of one shard of a sharded case table at a time.
+    """
+    title = _("shard")
+    parameter_name = "shard"
+
+    def lookups(self, request, model_admin):
+        return [(alias, alias) for alias in shards()] if settings.CASE_SHARDS else []
+
+    def queryset(self, request, queryset):
+        return queryset.using(self.value()) if self.value() else queryset
+
+
+class ShardedModelAdmin(admin.ModelAdmin):
+    """
+    Admin of a sharded case table. Rows are read from the shard their id
+    belongs to (see ``ShardedQuerySet.filter``), and saved and deleted there.
+    """
+    list_filter = (ShardFilter,)
 
 
-admin.site.register(PreTrial)
+admin.site.register(PreTrial, ShardedModelAdmin)
 admin.site.register(UserAccount)
 admin.site.register(Lawyer)
 admin.site.register(Judge)
@@ -0,0 +1,246 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from . import sharding
+from .cache import bump_namespace
+from .models import Hearing, Judge, PreTrial
+
+
+# START: Load counters
+def _weights() -> tuple[int, int]:
+    return settings.JUDGE_CASE_WEIGHT, settings.JUDGE_HEARING_WEIGHT
+
+
+def adjust_load(cases=None, hearings=None) -> None:
+    """
+    Applies counter deltas to judges with one ``UPDATE`` per judge touched.
+
+    Args:
+        cases (dict, optional): ``{judge_id: delta}`` of assigned pre-trials.
+        hearings (dict, optional): ``{judge_id: delta}`` of upcoming hearings.
+    """
+    cases, hearings = cases or {}, hearings or {}
+    case_weight, hearing_weight = _weights()
+    for judge_id in set(cases) | set(hearings):
+        if judge_id is None:
+            continue
+        case_delta, hearing_delta = cases.get(judge_id, 0), hearings.get(judge_id, 0)
+        if not case_delta and not hearing_delta:
+            continue
+        Judge.objects.filter(pk=judge_id).update(
+            caseload=Greatest(F('caseload') + case_delta, Value(0)),
+            hearing_load=Greatest(F('hearing_load') + hearing_delta, Value(0)),
+            load=Greatest(
+                F('load') + case_delta * case_weight + hearing_delta * hearing_weight,
+                Value(0)),
+        )
+
+
+def refresh_judge_load() -> int:
+    """
+    Recomputes every judge's counters from the pre-trials and hearings
+    tables with two statements.
+
+    Hearings drop out of ``hearing_load`` once their day has passed, which
+    no write notices, so this runs daily (``manage.py refresh_judge_load``);
+    it also repairs drift from writes that bypassed ``api.assignment``.
+
+    Returns:
+        int: The number of judges updated.
+    """
+    if settings.CASE_SHARDS:
+        return _refresh_sharded_judge_load()
+    case_weight, hearing_weight = _weights()
+    cases = PreTrial.objects.filter(judge=OuterRef('pk')).order_by().values(
+        'judge').annotate(count=Count('id')).values('count')
+    hearings = Hearing.objects.filter(
+        judge=OuterRef('pk'), scheduled_date__gte=timezone.localdate(),
+    ).order_by().values('judge').annotate(count=Count('id')).values('count')
+    with transaction.atomic():
+        count = Judge.objects.update(
+            caseload=Coalesce(Subquery(cases), 0),
+            hearing_load=Coalesce(Subquery(hearings), 0))
+        Judge.objects.update(
+            load=F('caseload') * case_weight + F('hearing_load') * hearing_weight)
+    return count
+
+
+def _refresh_sharded_judge_load() -> int:
+    """
+    ``refresh_judge_load`` for sharded case tables, which the judges'
+    table cannot join: the counts are gathered from every shard, then
+    written with one ``UPDATE`` per judge with cases.
+    """
+    case_weight, hearing_weight = _weights()
+    cases, hearings = Counter(), Counter()
+    for shard in sharding.scatter(PreTrial.objects.filter(judge__isnull=False)):
+        cases.update(dict(shard.order_by().values('judge').annotate(
+            count=Count('id')).values_list('judge', 'count')))
+    for shard in sharding.scatter(Hearing.objects.filter(
+            judge__isnull=False, scheduled_date__gte=timezone.localdate())):
+        hearings.update(dict(shard.order_by().values('judge').annotate(
+            count=Count('id')).values_list('judge', 'count')))
+    with transaction.atomic():
+        count = Judge.objects.update(caseload=0, hearing_load=0, load=0)
+        for judge_id in cases | hearings:
+            Judge.objects.filter(pk=judge_id).update(
+                caseload=cases[judge_id], hearing_load=hearings[judge_id],
+                load=cases[judge_id] * case_weight + hearings[judge_id] * hearing_weight)
+    return count
+# END: Load counters
+
+
+def fairness(loads) -> dict:
+    """
+    Summarizes how evenly ``loads`` are spread.
+
+    Returns:
+        dict: ``judges``, ``min``, ``max``, ``mean``, ``stddev``, the
+        coefficient of variation ``cv`` (stddev / mean), ``max_over_mean``
+        and Jain's fairness index ``jain`` (1 when perfectly even, 1/n when
+        one judge carries everything).
+    """
+    loads = list(loads)
+    n = len(loads)
+    if not n:
+        return {"judges": 0}
+    mean = sum(loads) / n
+    stddev = math.sqrt(sum((load - mean) ** 2 for load in loads) / n)
+    squares = sum(load * load for load in loads)
+    return {
+        "judges": n,
+        "min": min(loads),
+        "max": max(loads),
+        "mean": round(mean, 3),
+        "stddev": round(stddev, 3),
+        "cv": round(stddev / mean, 3) if mean else 0.0,
+        "max_over_mean": round(max(loads) / mean, 3) if mean else 0.0,
+        "jain": round(sum(loads) ** 2 / (n * squares), 3) if squares else 1.0,
+    }
+
+
+def judge_loads() -> list[dict]:
+    """
+    Returns the counters of every judge, least loaded first.
+    """
+    return list(Judge.objects.order_by('load', 'id').values(
+        'id', 'caseload', 'hearing_load', 'load'))
+
+
+# START: Assignment
+def set_pretrial_judge(pretrial_id, judge_id):
+    """
+    Assigns a pre-trial to a judge (or unassigns it with ``None``) and moves
+    the caseload counters along.
+
+    Returns:
+        The previous judge id.
+
+    Raises:
+        PreTrial.DoesNotExist: If there is no such pre-trial.
+    """
+    with sharding.atomic([sharding.DEFAULT, sharding.shard_of(pretrial_id)], write=True):
+        previous, user_id = PreTrial.objects.select_for_update().values_list(
+            'judge_id', 'user_id').get(pk=pretrial_id)
+        if previous != judge_id:
+            PreTrial.objects.filter(pk=pretrial_id).update(
+                judge_id=judge_id, updated_at=timezone.now())
+            adjust_load(cases={previous: -1, judge_id: 1})
+            bump_namespace(f"pretrial:{user_id}")
+    return previous
+
+
+def assign_pretrial(pretrial_id, reassign=False):
+    """
+    Assigns a pre-trial to the least loaded judge.
+
+    The judge is the first entry of the ``(load, id)`` index, so picking one
+    costs O(log judges) and never counts anything; the counters are then
+    moved with single-row updates.
+
+    Args:
+        pretrial_id (int): The pre-trial.
+        reassign (bool): Move a pre-trial that already has a judge.
+
+    Returns:
+        The id of the judge the pre-trial is assigned to, or ``None`` if
+        there are no judges.
+    """
+    with sharding.atomic([sharding.DEFAULT, sharding.shard_of(pretrial_id)], write=True):
+        current = PreTrial.objects.values_list('judge_id', flat=True).get(pk=pretrial_id)
+        if current is not None and not reassign:
+            return current
+        candidates = Judge.objects.order_by('load', 'id')
+        if current is not None:
+            candidates = candidates.exclude(pk=current)
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        judge_id = candidates.values_list('id', flat=True).first()
+        if judge_id is None:
+            return current
+        set_pretrial_judge(pretrial_id, judge_id)
+    return judge_id
+
+
+def assign_backlog(limit=None) -> dict:
+    """
+    Assigns every unassigned pre-trial (the oldest ``limit`` ones) at once.
+
+    Each pre-trial, oldest first, goes to the least loaded judge, popped
+    from a heap in O(log judges) and pushed back with the case weight
+    added, the same amount its caseload counter moves by. Hearings keep
+    their judges, so they are not part of the balancing. The writes are
+    one ``UPDATE`` per judge for the pre-trials and the counters.
+
+    Returns:
+        dict: ``assigned`` (the number of pre-trials), ``before`` and
+        ``after`` (``fairness`` of the judges' loads).
+
+    Raises:
+        ValueError: If there are no judges.
+    """
+    case_weight, _ = _weights()
+    with sharding.atomic(write=True):
+        judges = list(Judge.objects.select_for_update().values_list('id', 'load'))
+        if not judges:
+            raise ValueError("There are no judges to assign pre-trials to")
+        before = fairness(load for _, load in judges)
+
+        backlog = PreTrial.objects.filter(judge__isnull=True).order_by(
+            'date_registered', 'id').values_list('date_registered', 'id', 'user_id')
+        # The oldest of every shard's oldest pre-trials.
+        pending = list(heapq.merge(*(
+            shard[:limit] if limit else shard for shard in sharding.scatter(backlog))))
+        pending = [row[1:] for row in (pending[:limit] if limit else pending)]
+
+        heap = [(load, judge_id) for judge_id, load in judges]
+        heapq.heapify(heap)
+        assigned = defaultdict(list)
+        for pretrial_id, _ in pending:
+            load, judge_id = heapq.heappop(heap)
+            assigned[judge_id].append(pretrial_id)
+            heapq.heappush(heap, (load + case_weight, judge_id))
+
+        now = timezone.now()
+        step = connection.features.max_query_params or len(pending) or 1
+        for judge_id, ids in assigned.items():
+            for shard_ids in sharding.group_by_shard(ids).values():
+                for start in range(0, len(shard_ids), step):
+                    PreTrial.objects.filter(pk__in=shard_ids[start:start + step]).update(
+                        judge_id=judge_id, updated_at=now)
+        adjust_load(cases={judge_id: len(ids) for judge_id, ids in assigned.items()})
+        bump_namespace(*{f"pretrial:{user_id}" for _, user_id in pending})
+
+    return {
+        "assigned": len(pending),
+        "before": before,
+        "after": fairness(row['load'] for row in judge_loads()),
+    }
+# END: Assignment
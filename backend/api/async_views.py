@@ -0,0 +1,242 @@
+"""
+Async versions of the read-only endpoints, for serving under ASGI (see
+``nyay/asgi.py``).
+
+DRF 3.14 runs ``APIView`` handlers synchronously, so these are plain Django
+views with ``async def`` handlers. They authenticate with the same
+``ClaimsJWTAuthentication``, answer with the same bodies, share the response
+cache entries and ETags of their sync counterparts in ``api.views`` and read
+through the async ORM, so a worker keeps serving other requests while its
+queries run.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+from django.http import HttpResponse
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy as _
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+
+from .authentication import ClaimsJWTAuthentication
+from .cache import acached_response
+from .casefile import MAX_DEPTH, aattach_children, aload_case_files
+from .conditional import acached_list_validator, etag_matches
+from .models import PreTrial
+from .pagination import (KeysetPaginator, cursor_pagination_requested,
+                         get_page_size, paginator_fields)
+from .projections import PreTrialProjection
+from .replicas import ause_replica
+from .renderers import FastJSONRenderer
+from .search import search_pretrials
+from .views import CaseFileAPIView, ListLawyersAPIView, ListPreTrialsAPIView
+
+
+class AsyncAPIView(View):
+    """
+    Base of the async endpoints: authenticates the request and renders the
+    ``(data, status)`` returned by ``read`` as JSON.
+
+    The authentication runs in a worker thread, as it may have to read the
+    user's token generation or active flag from the database.
+    """
+    http_method_names = ['get']
+    authentication = ClaimsJWTAuthentication()
+    renderer = FastJSONRenderer()
+    # Read from a database replica, see api/replicas.py.
+    replica_reads = False
+
+    def respond(self, data, status_code=status.HTTP_200_OK) -> HttpResponse:
+        return HttpResponse(
+            self.renderer.render(data), status=status_code,
+            content_type="application/json")
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            credentials = await sync_to_async(self.authentication.authenticate)(request)
+            if credentials is None:
+                raise NotAuthenticated()
+        except (AuthenticationFailed, NotAuthenticated) as e:
+            response = self.respond({"detail": e.detail}, e.status_code)
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(request)
+            return response
+        request.user = credentials[0]
+        if self.replica_reads:
+            await ause_replica(request)
+
+        try:
+            return await self.read(request, *args, **kwargs)
+        except Exception as e:
+            return self.respond(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+    async def read(self, request, *args, **kwargs) -> HttpResponse:
+        raise NotImplementedError
+
+
+class _AsyncListView(AsyncAPIView):
+    """
+    Async version of the listings: the cursor and page modes, ``?fields=``
+    and ``?exclude=``, the response cache and the ETags of ``sync_view``.
+    """
+    sync_view = None
+    cache_name = None
+    replica_reads = True
+    rows_key = None
+    last_modified = ('updated_at',)
+
+    def namespaces(self, request) -> list[str]:
+        raise NotImplementedError
+
+    def scope(self, request):
+        return "all"
+
+    async def read(self, request):
+        view = self.sync_view()
+        queryset = view.get_queryset(request)
+        try:
+            etag, latest = await acached_list_validator(
+                queryset, self.last_modified, request, self.cache_name,
+                self.namespaces(request), scope=request.user.id)
+        except Exception:
+            # Invalid filters: let the listing report the error.
+            etag = latest = None
+        if etag and etag_matches(request, etag):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            response["ETag"] = etag
+            return response
+
+        async def compute():
+            return await self.listing(view, request, queryset), status.HTTP_200_OK
+
+        data, status_code, hit = await acached_response(
+            request, self.cache_name, self.namespaces(request), compute,
+            scope=self.scope(request))
+        response = self.respond(data, status_code)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        if etag:
+            response["ETag"] = etag
+            if latest is not None:
+                response["Last-Modified"] = http_date(latest.timestamp())
+        return response
+
+    async def listing(self, view, request, queryset) -> dict:
+        if cursor_pagination_requested(request):
+            projection = view.projection.from_request(
+                request, always=('id',) + paginator_fields(view.cursor_ordering))
+            paginator = KeysetPaginator(view.cursor_ordering, get_page_size(request))
+            return await paginator.apaginate(
+                projection.queryset(queryset), request.GET.get('cursor'))
+
+        projection = view.projection.from_request(request)
+        rows = await projection.arows(queryset)
+        # The page is cut from the rows already read instead of a COUNT and
+        # a second, sliced query.
+        page_obj = Paginator(rows, 10).get_page(request.GET.get('page') or 1)
+        return {
+            self.rows_key: projection.legacy_rows(rows),
+            "page_obj": projection.legacy_rows(page_obj),
+        }
+
+
+class AsyncListLawyersView(_AsyncListView):
+    """
+    Async version of ``ListLawyersAPIView``.
+    """
+    sync_view = ListLawyersAPIView
+    cache_name = "lawyers"
+    rows_key = "filtered_users"
+    last_modified = ('updated_at', 'user__updated_at')
+
+    def namespaces(self, request):
+        return ["lawyer"]
+
+
+class AsyncListPreTrialsView(_AsyncListView):
+    """
+    Async version of ``ListPreTrialsAPIView``.
+    """
+    sync_view = ListPreTrialsAPIView
+    cache_name = "pretrials"
+    rows_key = "filtered_pretrials"
+
+    def namespaces(self, request):
+        return [f"pretrial:{request.user.id}"]
+
+    def scope(self, request):
+        return request.user.id
+
+
+class AsyncSearchPreTrialsView(AsyncAPIView):
+    """
+    Async version of ``SearchPreTrialsAPIView``. The full-text queries are
+    raw SQL, which has no async API, so they run in a worker thread.
+    """
+    replica_reads = True
+
+    async def read(self, request):
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return self.respond(
+                {
+                    "message": "Something went wrong",
+                    "errors": _("The q parameter is required"),
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+        page_size = get_page_size(request)
+        page = max(1, int(request.GET.get('page', 1)))
+
+        async def compute():
+            # One extra row tells whether there is a next page without a COUNT.
+            rows = await sync_to_async(search_pretrials)(
+                query, request.user.id, limit=page_size + 1,
+                offset=(page - 1) * page_size)
+            return {
+                "results": rows[:page_size],
+                "next": page + 1 if len(rows) > page_size else None,
+                "previous": page - 1 if page > 1 else None,
+            }, status.HTTP_200_OK
+
+        data, status_code, hit = await acached_response(
+            request, "pretrial-search", [f"pretrial:{request.user.id}"], compute,
+            scope=request.user.id)
+        response = self.respond(data, status_code)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+
+class AsyncCaseFileView(AsyncAPIView):
+    """
+    Async version of ``CaseFileAPIView``, with the same parameters.
+    """
+
+    async def read(self, request, pk=None):
+        optional_int = CaseFileAPIView._optional_int
+        depth = optional_int(request, 'depth')
+        depth = MAX_DEPTH if depth is None else min(depth, MAX_DEPTH)
+        limits = dict(hearings_limit=optional_int(request, 'hearings_limit'),
+                      documents_limit=optional_int(request, 'documents_limit'))
+
+        pretrials = PreTrial.objects.filter(
+            user_id=request.user.id).order_by('date_registered', 'id')
+        if pk is not None:
+            try:
+                row = await PreTrialProjection().queryset(pretrials).aget(pk=pk)
+            except PreTrial.DoesNotExist:
+                return self.respond(
+                    {"message": "Case file not found"}, status.HTTP_404_NOT_FOUND)
+            await aattach_children([row], depth, **limits)
+            return self.respond(row)
+
+        if request.GET.get('ids'):
+            ids = [int(value) for value in request.GET['ids'].split(',') if value.strip()]
+            pretrials = pretrials.filter(pk__in=ids[:100])
+        else:
+            pretrials = pretrials[:get_page_size(request, default=10, param='limit')]
+        return self.respond({"results": await aload_case_files(pretrials, depth, **limits)})
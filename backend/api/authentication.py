@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+from .tokens import check_token_generation, is_user_active
+
+
+class GenerationJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that also rejects tokens from a revoked generation.
+
+    The check compares the token's ``gen`` claim with the user's cached
+    generation counter, so it costs a cache read instead of a query against
+    the blacklist tables.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        check_token_generation(validated_token)
+        return validated_token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Stateless user built from the claims of an access token.
+
+    Exposes the attributes the role checks need (``user_type``,
+    ``is_active``, ``lawyer_id``, ``judge_id``) without loading the
+    ``UserAccount`` row.
+    """
+
+    @cached_property
+    def user_type(self):
+        return self.token.get("user_type")
+
+    @cached_property
+    def is_active(self) -> bool:
+        return self.token.get("is_active", False)
+
+    @cached_property
+    def lawyer_id(self):
+        return self.token.get("lawyer_id")
+
+    @cached_property
+    def judge_id(self):
+        return self.token.get("judge_id")
+
+
+class ClaimsJWTAuthentication(GenerationJWTAuthentication):
+    """
+    Authenticates from token claims alone, without a ``UserAccount`` query.
+
+    Meant for read-only endpoints. Tokens issued before the role claims
+    existed fall back to loading the user. When ``TOKEN_ACTIVE_CACHE_TIMEOUT``
+    is set, deactivated accounts are rejected through a short-lived cache of
+    the ``is_active`` flag.
+    """
+
+    def get_user(self, validated_token):
+        if "user_type" not in validated_token:
+            return super().get_user(validated_token)
+
+        user = ClaimsUser(validated_token)
+        if not user.is_active or (settings.TOKEN_ACTIVE_CACHE_TIMEOUT
+                                  and not is_user_active(user.id)):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
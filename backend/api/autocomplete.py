@@ -0,0 +1,211 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import Value
+
+from .models import AutocompleteEntry, Judge, Lawyer, UserAccount
+
+Kinds = AutocompleteEntry.Kinds
+CODE_KINDS = (Kinds.ENROLLMENT_NO, Kinds.BAR_CODE)
+# Whose names anyone may look up; clients are only listed to staff.
+PUBLIC_USER_TYPES = (UserAccount.Roles.LAWYER, UserAccount.Roles.JUDGE)
+TERM_LENGTH = AutocompleteEntry._meta.get_field('term').max_length
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_NOT_ALNUM = re.compile(r"[\W_]+", re.UNICODE)
+
+
+# START: Normalization
+def words(value) -> list[str]:
+    """
+    Splits a name into lower cased words: ``"Rahul K. Sharma"`` becomes
+    ``["rahul", "k", "sharma"]``.
+    """
+    return [word[:TERM_LENGTH] for word in _WORD.findall((value or "").casefold())]
+
+
+def compact(value) -> str:
+    """
+    Normalizes an enrollment number or bar code by dropping separators and
+    case, so that ``"D/1234/2020"``, ``"d-1234-2020"`` and ``"d12342020"``
+    all index and match alike.
+    """
+    return _NOT_ALNUM.sub("", (value or "").casefold())[:TERM_LENGTH]
+
+
+def _terms(kind, value) -> list[str]:
+    if kind in CODE_KINDS:
+        return [compact(value)] if compact(value) else []
+    return list(dict.fromkeys(words(value)))
+# END: Normalization
+
+
+# START: Index maintenance
+def _entries(kind, value, user_id, user_type, object_id):
+    return [
+        AutocompleteEntry(kind=kind, term=term, label=(value or "")[:255],
+                          user_id=user_id, user_type=user_type, object_id=object_id)
+        for term in _terms(kind, value)
+    ]
+
+
+def _replace(kind, object_id, entries) -> None:
+    with transaction.atomic():
+        AutocompleteEntry.objects.filter(kind=kind, object_id=object_id).delete()
+        AutocompleteEntry.objects.bulk_create(entries)
+
+
+def index_user(user) -> None:
+    """
+    (Re)indexes the name of ``user``.
+    """
+    _replace(Kinds.NAME, user.pk, _entries(
+        Kinds.NAME, user.name, user.pk, user.user_type, user.pk))
+
+
+def index_lawyer(lawyer) -> None:
+    """
+    (Re)indexes the enrollment number of ``lawyer``.
+    """
+    _replace(Kinds.ENROLLMENT_NO, lawyer.pk, _entries(
+        Kinds.ENROLLMENT_NO, lawyer.enrollment_no, lawyer.user_id,
+        UserAccount.Roles.LAWYER, lawyer.pk))
+
+
+def index_judge(judge) -> None:
+    """
+    (Re)indexes the bar code of ``judge``.
+    """
+    _replace(Kinds.BAR_CODE, judge.pk, _entries(
+        Kinds.BAR_CODE, judge.bar_code, judge.user_id,
+        UserAccount.Roles.JUDGE, judge.pk))
+
+
+def unindex(kind, object_id) -> None:
+    """
+    Drops the entries of a deleted lawyer or judge. Entries of deleted users
+    go away with them through the foreign key.
+    """
+    AutocompleteEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index(batch_size=5000) -> int:
+    """
+    Rebuilds the whole index from the user, lawyer and judge tables.
+
+    Source rows are streamed as tuples with ``iterator()`` and written with
+    ``bulk_create`` in batches, so memory stays flat however many users
+    there are.
+
+    Returns:
+        int: The number of entries written.
+    """
+    sources = [
+        (Kinds.NAME, UserAccount.objects.values_list('name', 'id', 'user_type', 'id')),
+        (Kinds.ENROLLMENT_NO, Lawyer.objects.annotate(
+            role=Value(UserAccount.Roles.LAWYER)).values_list(
+            'enrollment_no', 'user_id', 'role', 'id')),
+        (Kinds.BAR_CODE, Judge.objects.annotate(
+            role=Value(UserAccount.Roles.JUDGE)).values_list(
+            'bar_code', 'user_id', 'role', 'id')),
+    ]
+    total = 0
+    with transaction.atomic():
+        AutocompleteEntry.objects.all().delete()
+        for kind, rows in sources:
+            batch = []
+            for value, user_id, user_type, object_id in rows.order_by().iterator(
+                    chunk_size=batch_size):
+                batch.extend(_entries(kind, value, user_id, user_type, object_id))
+                if len(batch) >= batch_size:
+                    total += len(AutocompleteEntry.objects.bulk_create(batch))
+                    batch = []
+            total += len(AutocompleteEntry.objects.bulk_create(batch))
+    return total
+# END: Index maintenance
+
+
+# START: Lookups
+def _prefix(term) -> dict:
+    if connection.vendor == 'postgresql':
+        # Served by the varchar_pattern_ops indexes.
+        return {'term__startswith': term}
+    # A range on the binary ordered term column works with any B-tree.
+    return {'term__gte': term, 'term__lt': term + "\U0010ffff"}
+
+
+def _lookup(probe, kinds, user_type, user_types, limit, accept):
+    queryset = AutocompleteEntry.objects.filter(kind__in=kinds, **_prefix(probe))
+    if user_type:
+        queryset = queryset.filter(user_type=user_type)
+    if user_types is not None:
+        queryset = queryset.filter(user_type__in=user_types)
+    queryset = queryset.order_by('term', 'id').values_list(
+        'term', 'kind', 'label', 'user_id', 'user_type', 'object_id')
+
+    results, seen = [], set()
+    # Several words of one name can share a prefix, and extra query words
+    # are checked against the label, so read ahead in a few bounded batches.
+    step = limit * 4
+    for offset in range(0, step * 4, step):
+        batch = list(queryset[offset:offset + step])
+        for term, kind, label, user_id, row_user_type, object_id in batch:
+            if (kind, object_id) in seen or not accept(label):
+                continue
+            seen.add((kind, object_id))
+            results.append((term, {
+                "kind": kind, "label": label, "id": object_id,
+                "user": user_id, "user_type": row_user_type,
+            }))
+        if len(results) >= limit or len(batch) < step:
+            break
+    return results[:limit]
+
+
+def suggest(query, kinds=None, user_type=None, user_types=None, limit=10) -> list[dict]:
+    """
+    Returns up to ``limit`` type-ahead matches for ``query``.
+
+    Names match when every word of the query is a prefix of a word of the
+    name, in any order; the longest query word is looked up in the index and
+    the others are checked on the label. Enrollment numbers and bar codes
+    match when the compacted query is a prefix of the compacted code. Matches
+    are ordered by the matched term, so shorter completions come first.
+
+    Only index rows are read, as tuples; no model instances are built.
+
+    Args:
+        query (str): What the user typed so far.
+        kinds (iterable, optional): ``AutocompleteEntry.Kinds`` to search.
+            Defaults to all of them.
+        user_type (str, optional): Only return values of users of this type.
+        user_types (iterable, optional): Only return values of users of these
+            types, e.g. ``PUBLIC_USER_TYPES``. Defaults to every type.
+        limit (int): The maximum number of matches.
+
+    Returns:
+        list[dict]: ``kind``, ``label``, ``id`` (of the user, lawyer or judge
+        row), ``user`` and ``user_type`` of every match.
+    """
+    kinds = set(kinds or Kinds.values)
+    results = []
+
+    query_words = words(query)
+    if Kinds.NAME in kinds and query_words:
+        probe = max(query_words, key=len)
+        others = [word for word in query_words if word != probe]
+
+        def accept(label):
+            label_words = words(label)
+            return all(any(w.startswith(word) for w in label_words) for word in others)
+
+        results += _lookup(probe, [Kinds.NAME], user_type, user_types, limit, accept)
+
+    code_kinds = [kind for kind in CODE_KINDS if kind in kinds]
+    if code_kinds and compact(query):
+        results += _lookup(compact(query), code_kinds, user_type, user_types, limit,
+                           lambda label: True)
+
+    results.sort(key=lambda result: result[0])
+    return [result for _, result in results[:limit]]
+# END: Lookups
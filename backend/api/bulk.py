@@ -0,0 +1,317 @@
+from collections import defaultdict
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import dashboard, sharding
+from .cache import bump_namespace
+from .calendars import sync_hearings, sync_pretrials
+from .models import Hearing, Judge, PreTrial
+from .permissions import hearing_scope, may_set_judge, pretrial_scope
+from .scheduling import check_moves
+from .serializers import HearingBulkSerializer, PreTrialBulkSerializer
+
+MAX_ITEMS = 10_000
+
+
+def existing_values(queryset, ids, field) -> dict:
+    """
+    Returns ``{id: field value}`` of those of ``ids`` that exist in
+    ``queryset``, staying under the backend's query parameter limit.
+    """
+    found = {}
+    for shard_ids in sharding.group_by_shard(ids).values():
+        step = connection.features.max_query_params or len(shard_ids)
+        for start in range(0, len(shard_ids), step):
+            found.update(queryset.filter(
+                pk__in=shard_ids[start:start + step]).values_list('pk', field))
+    return found
+
+
+def existing_ids(queryset, ids) -> set:
+    """
+    Returns which of ``ids`` exist in ``queryset``, reading ids only.
+    """
+    return set(existing_values(queryset, ids, 'pk'))
+
+
+class BulkValidationError(Exception):
+    """
+    Raised when items of a bulk write are invalid. Nothing has been written.
+
+    Attributes:
+        errors (list): ``{"index": ..., "errors": ...}`` per invalid item.
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid item(s)")
+        self.errors = errors
+
+    @classmethod
+    def from_dict(cls, errors):
+        """
+        Builds the error from ``{index: errors}``.
+        """
+        return cls([{"index": index, "errors": errors[index]} for index in sorted(errors)])
+
+
+class BulkWriter:
+    """
+    Validates and writes lists of records with ``bulk_create``/``bulk_update``.
+
+    All items are validated first, including one query per batch for the
+    rows they reference; if any item is invalid nothing is written and every
+    error is reported with the index of its item. Valid batches are written
+    inside a single transaction (one per shard written) in ``batch_size`` statements.
+
+    Bulk writes do not send ``post_save`` signals, so ``after_write`` performs
+    what the signal handlers in ``api.signals`` would have.
+
+    Attributes:
+        model (Model): The model written.
+        serializer_class (Serializer): Validates a single item.
+        batch_size (int): Rows per INSERT/UPDATE statement.
+    """
+    model = None
+    serializer_class = None
+    batch_size = 100
+
+    def __init__(self, user):
+        self.user = user
+
+    # START: Hooks
+    def scope(self, queryset):
+        """
+        Restricts ``queryset`` to the rows the user may update.
+        """
+        return queryset
+
+    def check(self, rows, errors) -> None:
+        """
+        Validates references across all ``rows`` at once, adding to ``errors``.
+        """
+
+    def prepare(self, row) -> dict:
+        """
+        Returns the model field values of a validated create ``row``.
+        """
+        return row
+
+    def check_create(self, objs, errors) -> None:
+        """
+        Validates the new ``objs`` inside the write transaction, before they
+        are written, adding to ``errors`` by item index.
+        """
+
+    def check_update(self, objs, changed, errors) -> None:
+        """
+        Validates the updated ``objs`` inside the write transaction, before
+        they are written, adding to ``errors`` by item index. ``changed``
+        holds the names of the fields each item sets.
+        """
+
+    def after_write(self, objs, created) -> None:
+        """
+        Keeps caches and derived data in sync with the written ``objs``.
+        """
+    # END: Hooks
+
+    def validate(self, items, partial=False) -> list[dict]:
+        """
+        Validates every item and returns the validated rows.
+
+        Raises:
+            ValueError: If ``items`` is not a list or is too long.
+            BulkValidationError: If any item is invalid.
+        """
+        if not isinstance(items, list):
+            raise ValueError("Expected a list of records")
+        if len(items) > MAX_ITEMS:
+            raise ValueError(f"At most {MAX_ITEMS} records can be written at once")
+
+        child = self.serializer_class(partial=partial)
+        rows, errors = [], {}
+        seen = set()
+        for index, item in enumerate(items):
+            try:
+                row = child.run_validation(item)
+            except serializers.ValidationError as e:
+                errors[index] = e.detail
+                rows.append(None)
+                continue
+            if partial:
+                if row.get('id') is None:
+                    errors[index] = {"id": ["This field is required."]}
+                elif row['id'] in seen:
+                    errors[index] = {"id": ["Duplicate id."]}
+                seen.add(row.get('id'))
+            rows.append(row)
+
+        self.check(rows, errors)
+        if errors:
+            raise BulkValidationError.from_dict(errors)
+        return rows
+
+    def create(self, items) -> list:
+        """
+        Creates one row per item.
+
+        Returns:
+            list: The primary keys of the created rows, in item order.
+        """
+        rows = self.validate(items)
+        objs = [self.model(**self.prepare(dict(row))) for row in rows]
+        # ``default`` holds the counters and calendars kept by after_write.
+        with sharding.atomic([sharding.DEFAULT, *sharding.shards_of(objs)], write=True):
+            errors = {}
+            self.check_create(objs, errors)
+            if errors:
+                raise BulkValidationError.from_dict(errors)
+            objs = self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+            self.after_write(objs, created=True)
+        return [obj.pk for obj in objs]
+
+    def update(self, items) -> int:
+        """
+        Updates the rows addressed by the ``id`` of every item with the
+        fields present in the item.
+
+        Returns:
+            int: The number of rows updated.
+        """
+        rows = self.validate(items, partial=True)
+        existing = self.scope(self.model.objects.all()).in_bulk(
+            [row['id'] for row in rows])
+        missing = [
+            {"index": index, "errors": {"id": ["Not found."]}}
+            for index, row in enumerate(rows) if row['id'] not in existing]
+        if missing:
+            raise BulkValidationError(missing)
+
+        now = timezone.now()
+        groups = defaultdict(list)
+        objs, changed = [], []
+        for row in rows:
+            obj = existing[row.pop('id')]
+            for name, value in row.items():
+                setattr(obj, name, value)
+            # Neither update() nor bulk_update() applies auto_now.
+            obj.updated_at = now
+            groups[tuple(sorted(row.items()))].append(obj)
+            objs.append(obj)
+            changed.append(set(row))
+
+        # Items setting the same values (e.g. granting a list of motions)
+        # share one UPDATE ... WHERE id IN (...); bulk_update()'s CASE WHEN
+        # per row is only used for the items that differ.
+        singles, fields = [], {'updated_at'}
+        with sharding.atomic([sharding.DEFAULT, *sharding.shards_of(objs)], write=True):
+            errors = {}
+            self.check_update(objs, changed, errors)
+            if errors:
+                raise BulkValidationError.from_dict(errors)
+            for values, group in groups.items():
+                if len(group) == 1:
+                    singles += group
+                    fields.update(name for name, _ in values)
+                    continue
+                for pks in sharding.group_by_shard(obj.pk for obj in group).values():
+                    step = connection.features.max_query_params or len(pks)
+                    for start in range(0, len(pks), step):
+                        self.model.objects.filter(pk__in=pks[start:start + step]).update(
+                            updated_at=now, **dict(values))
+            if singles:
+                self.model.objects.bulk_update(
+                    singles, sorted(fields), batch_size=self.batch_size)
+            self.after_write(objs, created=False)
+        return len(objs)
+
+
+class PreTrialBulkWriter(BulkWriter):
+    """
+    Bulk writes the requesting user's pre-trials.
+    """
+    model = PreTrial
+    serializer_class = PreTrialBulkSerializer
+
+    def scope(self, queryset):
+        return queryset.filter(user_id=self.user.id)
+
+    def prepare(self, row):
+        row['user_id'] = self.user.id
+        return row
+
+    def after_write(self, objs, created):
+        bump_namespace(f"pretrial:{self.user.id}")
+        dashboard.record(objs, created=created)
+        if not created:
+            sync_pretrials([obj.pk for obj in objs])
+
+
+class HearingBulkWriter(BulkWriter):
+    """
+    Bulk writes hearings of the requesting user's pre-trials; judges also
+    of the pre-trials and hearings assigned to them, staff of any. Only
+    staff and the pre-trial's assigned judge may set ``judge``. New hearings
+    and hearings given new slots, judges or courtrooms are checked against
+    court hours and for conflicts as in ``schedule_hearing``.
+    """
+    model = Hearing
+    serializer_class = HearingBulkSerializer
+    SLOT_FIELDS = {'scheduled_date', 'scheduled_time', 'duration', 'judge_id', 'courtroom'}
+
+    def __init__(self, user):
+        super().__init__(user)
+        self._pretrial_scope = pretrial_scope(user)
+        self._hearing_scope = hearing_scope(user)
+
+    def _pretrials(self):
+        return PreTrial.objects.filter(self._pretrial_scope)
+
+    def scope(self, queryset):
+        return queryset.filter(self._hearing_scope)
+
+    def _check_slots(self, objs, indexes, errors):
+        # The hearings must stay within court hours and must not double-book
+        # their judges or courtrooms.
+        for position, error in check_moves([objs[index] for index in indexes]).items():
+            errors.setdefault(indexes[position], {})["scheduled_time"] = [str(error)]
+
+    def _check_judges(self, objs, indexes, errors):
+        assigned = existing_values(
+            PreTrial.objects.all(), {objs[index].pretrial_id for index in indexes}, 'judge_id')
+        for index in indexes:
+            obj = objs[index]
+            if not may_set_judge(self.user, assigned.get(obj.pretrial_id), obj.judge_id):
+                errors.setdefault(index, {})["judge"] = [
+                    "Only staff or the assigned judge can choose the judge."]
+
+    def check_create(self, objs, errors):
+        self._check_judges(
+            objs, [index for index, obj in enumerate(objs) if obj.judge_id is not None], errors)
+        self._check_slots(objs, list(range(len(objs))), errors)
+
+    def check_update(self, objs, changed, errors):
+        self._check_judges(
+            objs, [index for index, names in enumerate(changed) if 'judge_id' in names], errors)
+        self._check_slots(
+            objs, [index for index, names in enumerate(changed) if names & self.SLOT_FIELDS],
+            errors)
+
+    def after_write(self, objs, created):
+        dashboard.record(objs, created=created)
+        sync_hearings([obj.pk for obj in objs])
+
+    def check(self, rows, errors):
+        referenced = {row['pretrial_id'] for row in rows if row and 'pretrial_id' in row}
+        known = existing_ids(self._pretrials(), referenced)
+        judges = existing_ids(Judge.objects.all(), {
+            row['judge_id'] for row in rows if row and row.get('judge_id') is not None})
+        for index, row in enumerate(rows):
+            if row and 'pretrial_id' in row and row['pretrial_id'] not in known:
+                errors.setdefault(index, {})["pretrial"] = [
+                    f"Invalid pk \"{row['pretrial_id']}\" - object does not exist."]
+            if row and row.get('judge_id') is not None and row['judge_id'] not in judges:
+                errors.setdefault(index, {})["judge"] = [
+                    f"Invalid pk \"{row['judge_id']}\" - object does not exist."]
@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .replicas import reading_replica
+
+
+# START: Namespaces
+def _namespace_key(namespace) -> str:
+    return f"api:ns:{namespace}"
+
+
+def namespace_version(namespace) -> int:
+    """
+    Returns the current version of a cache namespace.
+
+    Every cached list response embeds the versions of the namespaces it was
+    computed from in its key, so bumping a namespace orphans exactly those
+    entries. Versions start at the current time in nanoseconds so that a
+    namespace evicted from the cache never restarts at an old version.
+    """
+    key = _namespace_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+async def anamespace_version(namespace) -> int:
+    """
+    Async version of ``namespace_version``.
+    """
+    key = _namespace_key(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_namespace(*namespaces) -> None:
+    """
+    Invalidates every cached response computed from ``namespaces``.
+    """
+    for namespace in namespaces:
+        key = _namespace_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+# END: Namespaces
+
+
+def _cache_key(request, view_name, scope, versions) -> str:
+    params = sorted((name, tuple(request.GET.getlist(name)))
+                    for name in request.GET)
+    digest = hashlib.sha1(repr(params).encode()).hexdigest()
+    versions = ".".join(str(version) for version in versions)
+    return f"api:list:{view_name}:{scope}:{versions}:{digest}"
+
+
+def _response_key(request, view_name, namespaces, scope) -> str:
+    return _cache_key(
+        request, view_name, scope, [namespace_version(ns) for ns in namespaces])
+
+
+def single_flight(key, compute, timeout):
+    """
+    Returns the cached value of ``key``, computing it at most once at a time.
+
+    The first caller to miss takes a short lock and runs ``compute``; callers
+    that miss while the lock is held wait for its result instead of running
+    the same query in parallel. If the result does not show up within the
+    lock timeout they compute it themselves.
+
+    Args:
+        key (str): The cache key.
+        compute (callable): Returns ``(value, cacheable)``.
+        timeout (int): Seconds to keep the value for.
+
+    Returns:
+        tuple: ``(value, hit)``.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value, True
+
+    lock_key = f"{key}:lock"
+    lock_timeout = settings.LIST_CACHE_LOCK_TIMEOUT
+    if not cache.add(lock_key, 1, lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key)
+            if value is not None:
+                return value, True
+        return compute()[0], False
+
+    try:
+        value, cacheable = compute()
+        if cacheable:
+            cache.set(key, value, timeout)
+        return value, False
+    finally:
+        cache.delete(lock_key)
+
+
+async def asingle_flight(key, compute, timeout):
+    """
+    Async version of ``single_flight``; ``compute`` is a coroutine function.
+    Waiting callers yield to the event loop instead of blocking a thread.
+    """
+    value = await cache.aget(key)
+    if value is not None:
+        return value, True
+
+    lock_key = f"{key}:lock"
+    lock_timeout = settings.LIST_CACHE_LOCK_TIMEOUT
+    if not await cache.aadd(lock_key, 1, lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            value = await cache.aget(key)
+            if value is not None:
+                return value, True
+        return (await compute())[0], False
+
+    try:
+        value, cacheable = await compute()
+        if cacheable:
+            await cache.aset(key, value, timeout)
+        return value, False
+    finally:
+        await cache.adelete(lock_key)
+
+
+async def acached_response(request, view_name, namespaces, compute, scope="all"):
+    """
+    Async counterpart of ``cache_list_response`` for the async views. The
+    keys are the same, so the sync and async endpoints share their entries.
+
+    Args:
+        compute (callable): Coroutine function returning ``(data, status)``.
+
+    Returns:
+        tuple: ``(data, status, hit)``.
+    """
+    versions = [await anamespace_version(ns) for ns in namespaces]
+    key = _cache_key(request, view_name, scope, versions)
+
+    computed = {}
+
+    async def fill():
+        data, status_code = computed["result"] = await compute()
+        return data, status_code == status.HTTP_200_OK and not reading_replica()
+
+    data, hit = await asingle_flight(key, fill, settings.LIST_CACHE_TIMEOUT)
+    if "result" in computed and computed["result"][1] != status.HTTP_200_OK:
+        return (*computed["result"], False)
+    return data, status.HTTP_200_OK, hit
+
+
+def cache_list_response(view_name, namespaces, scope=None):
+    """
+    Caches successful responses of an ``APIView.get`` method.
+
+    Responses are keyed on the view, the user ``scope``, the versions of the
+    namespaces the data depends on and the normalized query parameters
+    (filters, cursor, page, ...). Signal handlers in ``api.signals`` bump the
+    namespaces when the underlying rows change. Responses read from a
+    replica are served but not cached, so that the cache only holds rows at
+    least as new as its key (see ``api.replicas``).
+
+    Args:
+        view_name (str): Distinguishes the views sharing a namespace.
+        namespaces (callable): ``request -> list[str]`` of namespaces.
+        scope (callable, optional): ``request -> str``. Defaults to a scope
+            shared by all users, for responses that don't depend on the user.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key = _response_key(
+                request, view_name, namespaces(request),
+                scope(request) if scope else "all")
+
+            computed = {}
+
+            def compute():
+                response = computed["response"] = method(
+                    view, request, *args, **kwargs)
+                # A lagging replica would cache rows older than the
+                # namespace versions in the key for every user.
+                return response.data, (response.status_code == status.HTTP_200_OK
+                                       and not reading_replica())
+
+            data, hit = single_flight(key, compute, settings.LIST_CACHE_TIMEOUT)
+            if "response" in computed and computed["response"].status_code != status.HTTP_200_OK:
+                return computed["response"]
+            response = Response(data, status=status.HTTP_200_OK)
+            response["X-Cache"] = "HIT" if hit else "MISS"
+            return response
+        return wrapper
+    return decorator
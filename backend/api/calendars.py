@@ -0,0 +1,163 @@
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .assignment import adjust_load
+from .models import CalendarEntry, Hearing, Judge, PreTrial, UserAccount
+from .sharding import group_by_shard, scatter
+
+_SOURCE_FIELDS = (
+    'id', 'pretrial_id', 'pretrial__user_id', 'pretrial__case_act', 'judge_id',
+    'judge__user_id', 'scheduled_date', 'scheduled_time', 'duration', 'courtroom')
+ENTRY_FIELDS = ('hearing', 'pretrial', 'judge', 'role', 'date', 'time',
+                'duration', 'courtroom', 'case_act')
+
+
+def _entries(row):
+    (hearing_id, pretrial_id, client_id, case_act, judge_id, judge_user_id,
+     date, time, duration, courtroom) = row
+    participants = [(client_id, UserAccount.Roles.CLIENT)]
+    if judge_user_id is not None:
+        participants.append((judge_user_id, UserAccount.Roles.JUDGE))
+    return [
+        CalendarEntry(
+            user_id=user_id, role=role, hearing_id=hearing_id, pretrial_id=pretrial_id,
+            judge_id=judge_id, date=date, time=time, duration=duration,
+            courtroom=courtroom, case_act=case_act)
+        for user_id, role in participants
+    ]
+
+
+def _chunks(ids):
+    step = connection.features.max_query_params or len(ids) or 1
+    for start in range(0, len(ids), step):
+        yield ids[start:start + step]
+
+
+def _source_rows(hearings, limit=None) -> list:
+    """
+    Reads the ``_SOURCE_FIELDS`` of ``hearings``. When the case tables are
+    sharded the judges live on another database than the hearings, so their
+    user ids are looked up with a second query instead of a join.
+    """
+    if not settings.CASE_SHARDS:
+        return list(hearings.values_list(*_SOURCE_FIELDS)[:limit])
+    judge_user = _SOURCE_FIELDS.index('judge__user_id')
+    judge = _SOURCE_FIELDS.index('judge_id')
+    rows = [list(row) for row in hearings.values_list(
+        *_SOURCE_FIELDS[:judge_user], *_SOURCE_FIELDS[judge_user + 1:])[:limit]]
+    users = dict(Judge.objects.filter(
+        pk__in={row[judge] for row in rows} - {None}).values_list('pk', 'user_id'))
+    for row in rows:
+        row.insert(judge_user, users.get(row[judge]))
+    return rows
+
+
+def _source_batches(hearings, batch_size):
+    """
+    Yields the ``_source_rows`` of ``hearings`` in batches, streaming them.
+    """
+    if not settings.CASE_SHARDS:
+        rows = hearings.values_list(*_SOURCE_FIELDS).iterator(chunk_size=batch_size)
+        while batch := list(islice(rows, batch_size)):
+            yield batch
+        return
+    last = 0
+    while batch := _source_rows(hearings.filter(id__gt=last).order_by('id'), batch_size):
+        yield batch
+        last = batch[-1][0]
+
+
+def sync_hearings(hearing_ids) -> None:
+    """
+    Rewrites the calendar entries of the given hearings from their current
+    rows. Hearings that no longer exist just lose their entries.
+
+    Costs one delete, one read joining the pre-trials and judges, and one
+    insert per parameter batch, however many hearings change. The judges'
+    ``hearing_load`` counters follow the difference between the old and the
+    new upcoming entries.
+    """
+    ids = list(hearing_ids)
+    today = timezone.localdate()
+    with transaction.atomic():
+        delta = Counter()
+        for chunk in _chunks(ids):
+            entries = CalendarEntry.objects.filter(hearing_id__in=chunk)
+            delta.subtract(entries.filter(
+                role=UserAccount.Roles.JUDGE, judge__isnull=False, date__gte=today,
+            ).values_list('judge_id', flat=True))
+            entries.delete()
+            rows = [row for ids in group_by_shard(chunk).values()
+                    for row in _source_rows(Hearing.objects.filter(id__in=ids))]
+            new = [entry for row in rows for entry in _entries(row)]
+            delta.update(entry.judge_id for entry in new
+                         if entry.role == UserAccount.Roles.JUDGE and entry.date >= today)
+            CalendarEntry.objects.bulk_create(new)
+        adjust_load(hearings=delta)
+
+
+def sync_pretrials(pretrial_ids) -> None:
+    """
+    Copies the case acts of the given pre-trials into their calendar
+    entries, with one correlated UPDATE per parameter batch.
+    """
+    if settings.CASE_SHARDS:
+        # The pre-trials are on another database than the calendar, so
+        # their case acts are read first and written with one UPDATE each.
+        for chunk in _chunks(list(pretrial_ids)):
+            acts = defaultdict(list)
+            for ids in group_by_shard(chunk).values():
+                for pk, act in PreTrial.objects.filter(pk__in=ids).values_list('pk', 'case_act'):
+                    acts[act].append(pk)
+            for act, pks in acts.items():
+                CalendarEntry.objects.filter(pretrial_id__in=pks).update(case_act=act)
+        return
+    case_act = PreTrial.objects.filter(pk=OuterRef('pretrial_id')).values('case_act')[:1]
+    for chunk in _chunks(list(pretrial_ids)):
+        CalendarEntry.objects.filter(pretrial_id__in=chunk).update(case_act=Subquery(case_act))
+
+
+def rebuild_calendar(batch_size=5000) -> int:
+    """
+    Rebuilds the calendar from all hearings, streaming them in batches.
+
+    Returns:
+        int: The number of entries written.
+    """
+    total = 0
+    with transaction.atomic():
+        CalendarEntry.objects.all().delete()
+        batch = []
+        for hearings in scatter(Hearing.objects.order_by()):
+            for rows in _source_batches(hearings, batch_size):
+                for row in rows:
+                    batch.extend(_entries(row))
+                if len(batch) >= batch_size:
+                    total += len(CalendarEntry.objects.bulk_create(batch))
+                    batch = []
+        total += len(CalendarEntry.objects.bulk_create(batch))
+    return total
+
+
+def calendar(user_id, date_from, date_to):
+    """
+    Returns the calendar of a participant between two dates (inclusive) as
+    a ``values()`` queryset ordered by date and time.
+    """
+    return CalendarEntry.objects.filter(
+        user_id=user_id, date__range=(date_from, date_to),
+    ).order_by('date', 'time').values(*ENTRY_FIELDS)
+
+
+def cause_list(judge_id, date):
+    """
+    Returns the cause list of a judge for a day, in hearing order.
+    """
+    return CalendarEntry.objects.filter(
+        judge_id=judge_id, role=UserAccount.Roles.JUDGE, date=date,
+    ).order_by('time').values(*ENTRY_FIELDS)
@@ -0,0 +1,123 @@
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+
+from .models import Document, Hearing
+from .projections import (DocumentProjection, HearingProjection,
+                          PreTrialProjection)
+
+MAX_DEPTH = 2
+
+
+def _first_per_parent(queryset, parent, ordering, limit):
+    """
+    Keeps the first ``limit`` rows of every ``parent`` in one query, using
+    ``ROW_NUMBER() OVER (PARTITION BY parent ...)``.
+    """
+    if limit is None:
+        return queryset.order_by(*ordering)
+    return queryset.annotate(
+        _position=Window(RowNumber(), partition_by=F(parent),
+                         order_by=[F(field).asc() for field in ordering]),
+    ).filter(_position__lte=limit).order_by(*ordering)
+
+
+def load_case_files(pretrials, depth=MAX_DEPTH, hearings_limit=None,
+                    documents_limit=None) -> list[dict]:
+    """
+    Loads pre-trials together with their hearings and the hearings' documents.
+
+    Each level is fetched with one query through ``prefetch_related`` and
+    ``Prefetch`` querysets restricted to the projection columns, so a case
+    file costs ``depth + 1`` queries no matter how many hearings and
+    documents it holds.
+
+    Args:
+        pretrials (QuerySet): The pre-trials to load, already filtered,
+            ordered and sliced.
+        depth (int): 0 returns the pre-trials only, 1 adds their hearings and
+            2 the hearings' documents as well.
+        hearings_limit (int, optional): Return at most this many hearings per
+            pre-trial, earliest first.
+        documents_limit (int, optional): Return at most this many documents
+            per hearing, by name.
+
+    Returns:
+        list[dict]: Pre-trial rows, each with a ``hearings`` list (depth >= 1)
+        whose rows each have a ``documents`` list (depth 2).
+    """
+    pretrial_projection = PreTrialProjection()
+    hearing_projection = HearingProjection()
+    document_projection = DocumentProjection()
+
+    queryset = pretrial_projection.only(pretrials)
+    if depth >= 1:
+        hearings = _first_per_parent(
+            hearing_projection.only(Hearing.objects.all()), 'pretrial',
+            ('scheduled_date', 'scheduled_time', 'id'), hearings_limit)
+        queryset = queryset.prefetch_related(Prefetch('hearings', queryset=hearings))
+    if depth >= 2:
+        documents = _first_per_parent(
+            document_projection.only(Document.objects.all()), 'hearing',
+            ('name', 'id'), documents_limit)
+        queryset = queryset.prefetch_related(
+            Prefetch('hearings__documents', queryset=documents))
+
+    case_files = []
+    for pretrial in queryset:
+        row = pretrial_projection.instance_row(pretrial)
+        if depth >= 1:
+            row['hearings'] = []
+            for hearing in pretrial.hearings.all():
+                hearing_row = hearing_projection.instance_row(hearing)
+                if depth >= 2:
+                    hearing_row['documents'] = [
+                        document_projection.instance_row(document)
+                        for document in hearing.documents.all()]
+                row['hearings'].append(hearing_row)
+        case_files.append(row)
+    return case_files
+
+
+async def aload_case_files(pretrials, depth=MAX_DEPTH, hearings_limit=None,
+                           documents_limit=None) -> list[dict]:
+    """
+    Async version of ``load_case_files`` with the same arguments and result.
+
+    ``prefetch_related`` is not supported with ``aiterator()``, so each level
+    is read with its own ``aiterator()`` over ``values()`` and the children
+    are attached by ``aattach_children``; still ``depth + 1`` queries.
+    """
+    rows = await PreTrialProjection().arows(pretrials)
+    await aattach_children(rows, depth, hearings_limit, documents_limit)
+    return rows
+
+
+async def aattach_children(rows, depth=MAX_DEPTH, hearings_limit=None,
+                           documents_limit=None) -> None:
+    """
+    Adds the ``hearings`` (depth >= 1) and their ``documents`` (depth 2) to
+    pre-trial ``rows`` in place, with one query per level.
+    """
+    if depth < 1:
+        return
+    pretrials = {row['id']: row for row in rows}
+    for row in rows:
+        row['hearings'] = []
+    if not pretrials:
+        return
+    hearing_rows = await HearingProjection().arows(_first_per_parent(
+        Hearing.objects.filter(pretrial_id__in=list(pretrials)), 'pretrial',
+        ('scheduled_date', 'scheduled_time', 'id'), hearings_limit))
+    for hearing in hearing_rows:
+        if depth >= 2:
+            hearing['documents'] = []
+        pretrials[hearing['pretrial']]['hearings'].append(hearing)
+
+    if depth < 2 or not hearing_rows:
+        return
+    hearings = {hearing['id']: hearing for hearing in hearing_rows}
+    document_rows = await DocumentProjection().arows(_first_per_parent(
+        Document.objects.filter(hearing_id__in=list(hearings)), 'hearing',
+        ('name', 'id'), documents_limit))
+    for document in document_rows:
+        hearings[document['hearing']]['documents'].append(document)
@@ -0,0 +1,150 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import (_cache_key, _response_key, anamespace_version,
+                    asingle_flight, single_flight)
+from .replicas import reading_replica
+
+
+def list_validator(queryset, last_modified, request, scope=""):
+    """
+    Computes the ETag and Last-Modified values of a list response.
+
+    The validator is derived from ``MAX(updated_at)`` of every field in
+    ``last_modified``, the row count and a hash of the query string, all
+    read with one aggregate query. Any insert or update moves a maximum and
+    any delete changes the count, so the ETag changes whenever the listing
+    would.
+
+    Args:
+        queryset (QuerySet): The filtered, unpaginated queryset of the view.
+        last_modified (tuple): ``updated_at`` style fields to take the max of.
+        request (Request): The request, for its query string.
+        scope (str): Anything else the response depends on (e.g. the user).
+
+    Returns:
+        tuple: ``(etag, last_modified)``, the latter ``None`` for empty lists.
+    """
+    values = queryset.order_by().aggregate(**_aggregates(last_modified))
+    return _validator(values, last_modified, request, scope)
+
+
+async def alist_validator(queryset, last_modified, request, scope=""):
+    """
+    Async version of ``list_validator``.
+    """
+    values = await queryset.order_by().aaggregate(**_aggregates(last_modified))
+    return _validator(values, last_modified, request, scope)
+
+
+def cached_list_validator(queryset, last_modified, request, view_name, namespaces,
+                          scope=""):
+    """
+    ``list_validator`` cached under the same namespace versions as the
+    cached responses of ``view_name``: a hit costs no query, and every write
+    that invalidates the response invalidates its validator too. Like the
+    responses, validators read from a replica are not cached.
+
+    Args:
+        view_name (str): The ``view_name`` of the view's ``cache_list_response``.
+        namespaces (list): The namespaces the response depends on.
+    """
+    key = _response_key(request, f"{view_name}:etag", namespaces, scope)
+    return single_flight(
+        key, lambda: (list_validator(queryset, last_modified, request, scope),
+                      not reading_replica()),
+        settings.LIST_CACHE_TIMEOUT)[0]
+
+
+async def acached_list_validator(queryset, last_modified, request, view_name,
+                                 namespaces, scope=""):
+    """
+    Async version of ``cached_list_validator``, sharing its entries.
+    """
+    versions = [await anamespace_version(ns) for ns in namespaces]
+    key = _cache_key(request, f"{view_name}:etag", scope, versions)
+
+    async def compute():
+        return (await alist_validator(queryset, last_modified, request, scope),
+                not reading_replica())
+
+    return (await asingle_flight(key, compute, settings.LIST_CACHE_TIMEOUT))[0]
+
+
+def _aggregates(last_modified) -> dict:
+    aggregates = {f"max_{i}": Max(field) for i, field in enumerate(last_modified)}
+    return dict(count=Count('pk'), **aggregates)
+
+
+def _validator(values, last_modified, request, scope):
+    timestamps = [values[f"max_{i}"] for i in range(len(last_modified))]
+    params = sorted((name, tuple(request.GET.getlist(name)))
+                    for name in request.GET)
+    digest = hashlib.sha1(
+        repr((scope, values["count"], timestamps, params)).encode()).hexdigest()
+    latest = max((value for value in timestamps if value is not None), default=None)
+    return f'W/"{digest}"', latest
+
+
+def etag_matches(request, etag) -> bool:
+    """
+    Whether the ``If-None-Match`` header of ``request`` names ``etag``.
+    """
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+    tags = parse_etags(if_none_match)
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+
+def conditional_list_response(last_modified=('updated_at',), view_name=None,
+                              namespaces=None):
+    """
+    Adds ETag/Last-Modified headers to an ``APIView.get`` and answers
+    ``If-None-Match`` hits with 304 Not Modified without running the view.
+
+    The view must implement ``get_queryset(request)`` returning the filtered,
+    unpaginated queryset the response is built from.
+
+    Args:
+        last_modified (tuple): ``updated_at`` style fields to take the max of.
+        view_name (str, optional): With ``namespaces``, caches the validator
+            next to the response cached by ``cache_list_response``.
+        namespaces (callable, optional): ``request -> list[str]`` of the
+            namespaces the response depends on.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            scope = getattr(request.user, 'id', '')
+            try:
+                queryset = view.get_queryset(request)
+                if namespaces is None:
+                    etag, latest = list_validator(queryset, last_modified, request, scope)
+                else:
+                    etag, latest = cached_list_validator(
+                        queryset, last_modified, request, view_name,
+                        namespaces(request), scope)
+            except Exception:
+                # Invalid filters: let the view report the error.
+                return method(view, request, *args, **kwargs)
+
+            if etag_matches(request, etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                response["ETag"] = etag
+                return response
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response["ETag"] = etag
+                if latest is not None:
+                    response["Last-Modified"] = http_date(latest.timestamp())
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,225 @@
+import datetime
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncMonth
+
+from .models import Hearing, Lawyer, PreTrial, SummaryCount, UserAccount
+from .sharding import scatter
+
+Metrics = SummaryCount.Metrics
+_DEFERRED = object()
+
+
+# START: Sources
+def _user_type(value):
+    return [(Metrics.USER_TYPE, value)]
+
+
+def _lawyer_type(value):
+    return [(Metrics.LAWYER_TYPE, value)]
+
+
+def _month(value):
+    # str() of a date (or of the ISO string a caller assigned) is YYYY-MM-DD.
+    return [(Metrics.PRETRIALS_PER_MONTH, str(value)[:7])]
+
+
+def _day(value):
+    # Every hearing has one date, so the motions total moves with it.
+    return [(Metrics.HEARINGS_PER_DAY, str(value)[:10]), (Metrics.MOTIONS, 'total')]
+
+
+def _granted(value):
+    return [(Metrics.MOTIONS, 'granted')] if value else []
+
+
+SOURCES = {
+    UserAccount: {'user_type': _user_type},
+    Lawyer: {'lawyer_type': _lawyer_type},
+    PreTrial: {'date_registered': _month},
+    Hearing: {'scheduled_date': _day, 'motion_granted': _granted},
+}
+# END: Sources
+
+
+# START: Maintenance
+def snapshot(instance, names=None) -> None:
+    """
+    Remembers the counted field values of ``instance`` (or of its ``names``
+    fields) as stored, so a later write can move its counts from the old
+    groups to the new ones. Fields deferred by ``only()``/``defer()`` are
+    not loaded for this.
+    """
+    stored = instance.__dict__.setdefault('_summary_values', {})
+    for name in SOURCES[type(instance)]:
+        if names is None or name in names:
+            stored[name] = instance.__dict__.get(name, _DEFERRED)
+
+
+def load_snapshot(instance) -> None:
+    """
+    Reads the stored values of the counted fields that ``instance`` was
+    loaded without, before it is saved over them.
+    """
+    stored = instance.__dict__.get('_summary_values', {})
+    missing = [name for name, value in stored.items() if value is _DEFERRED]
+    if missing and instance.pk is not None:
+        row = type(instance)._base_manager.db_manager(instance._state.db).filter(
+            pk=instance.pk).values(*missing).first()
+        stored.update(row or {})
+
+
+def stored_value(instance, name):
+    """
+    Returns the value of the counted field ``name`` of ``instance`` as last
+    loaded or saved, or ``None`` for unsaved instances. Call ``load_snapshot``
+    first if the field may have been deferred.
+    """
+    value = instance.__dict__.get('_summary_values', {}).get(name)
+    return None if value is _DEFERRED else value
+
+
+def _count(instance, sign, delta) -> None:
+    # Deleted rows are counted out of the groups they were stored in.
+    stored = instance.__dict__.get('_summary_values', {}) if sign < 0 else {}
+    for name, groups in SOURCES[type(instance)].items():
+        value = stored.get(name, _DEFERRED)
+        if value is _DEFERRED:
+            value = getattr(instance, name)
+        for group in groups(value):
+            delta[group] += sign
+
+
+def _move(instance, delta, names=None) -> None:
+    stored = instance.__dict__.get('_summary_values', {})
+    for name, groups in SOURCES[type(instance)].items():
+        old = stored.get(name, _DEFERRED)
+        if (names is not None and name not in names) or old is _DEFERRED \
+                or name not in instance.__dict__:
+            continue
+        new = getattr(instance, name)
+        if old != new:
+            for group in groups(old):
+                delta[group] -= 1
+            for group in groups(new):
+                delta[group] += 1
+
+
+def apply(delta) -> None:
+    """
+    Adds ``{(metric, key): delta}`` to the summary counts: one INSERT of the
+    missing groups and one UPDATE per distinct delta, both safe under
+    concurrent writers.
+    """
+    delta = {group: value for group, value in delta.items() if value}
+    if not delta:
+        return
+    by_value = defaultdict(list)
+    for group, value in delta.items():
+        by_value[value].append(group)
+    step = max((connection.features.max_query_params or 2 * len(delta)) // 2, 1)
+    with transaction.atomic():
+        SummaryCount.objects.bulk_create(
+            [SummaryCount(metric=metric, key=key) for metric, key in delta],
+            ignore_conflicts=True)
+        for value, groups in by_value.items():
+            for start in range(0, len(groups), step):
+                matches = Q()
+                for metric, key in groups[start:start + step]:
+                    matches |= Q(metric=metric, key=key)
+                SummaryCount.objects.filter(matches).update(count=F('count') + value)
+
+
+def record(objs, created=False, deleted=False, names=None) -> None:
+    """
+    Counts written rows: created and deleted ones into and out of their
+    groups, updated ones (in their ``names`` fields only, if given) from the
+    groups of their ``snapshot`` to their current ones. Used by the signal
+    handlers and by the bulk writers, which send no signals.
+    """
+    delta = Counter()
+    for obj in objs:
+        if created or deleted:
+            _count(obj, -1 if deleted else 1, delta)
+        else:
+            _move(obj, delta, names)
+        snapshot(obj, names)
+    apply(delta)
+
+
+def rebuild_dashboard() -> int:
+    """
+    Recounts every summary group from the source tables.
+
+    Returns:
+        int: The number of summary rows written.
+    """
+    rows = []
+    for model, field, metric in ((UserAccount, 'user_type', Metrics.USER_TYPE),
+                                 (Lawyer, 'lawyer_type', Metrics.LAWYER_TYPE)):
+        counts = model.objects.order_by().values_list(field).annotate(count=Count('pk'))
+        rows += [SummaryCount(metric=metric, key=key, count=count) for key, count in counts]
+
+    # The case tables may be sharded: their groups are counted on every
+    # shard and added up.
+    months, days, motions = Counter(), Counter(), Counter()
+    for pretrials in scatter(PreTrial.objects.order_by()):
+        months.update(dict(pretrials.annotate(
+            month=TruncMonth('date_registered')).values_list('month').annotate(count=Count('pk'))))
+    for hearings in scatter(Hearing.objects.order_by()):
+        days.update(dict(hearings.values_list('scheduled_date').annotate(count=Count('pk'))))
+        motions.update(hearings.aggregate(
+            total=Count('pk'), granted=Count('pk', filter=Q(motion_granted=True))))
+
+    rows += [SummaryCount(metric=Metrics.PRETRIALS_PER_MONTH, key=f"{month:%Y-%m}", count=count)
+             for month, count in months.items()]
+    rows += [SummaryCount(metric=Metrics.HEARINGS_PER_DAY, key=day.isoformat(), count=count)
+             for day, count in days.items()]
+    rows += [SummaryCount(metric=Metrics.MOTIONS, key=key, count=count)
+             for key, count in motions.items()]
+
+    with transaction.atomic():
+        SummaryCount.objects.all().delete()
+        SummaryCount.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+# END: Maintenance
+
+
+def dashboard(date_from: datetime.date, date_to: datetime.date) -> dict:
+    """
+    Reads the dashboard from the summary counts with one query: the lawyer
+    and user type counts, the motions granted, and pre-trials per month and
+    hearings per day between ``date_from`` and ``date_to``.
+    """
+    rows = SummaryCount.objects.filter(
+        Q(metric__in=[Metrics.LAWYER_TYPE, Metrics.USER_TYPE, Metrics.MOTIONS])
+        | Q(metric=Metrics.PRETRIALS_PER_MONTH,
+            key__range=(f"{date_from:%Y-%m}", f"{date_to:%Y-%m}"))
+        | Q(metric=Metrics.HEARINGS_PER_DAY,
+            key__range=(date_from.isoformat(), date_to.isoformat())),
+    ).order_by('metric', 'key').values_list('metric', 'key', 'count')
+
+    counts = defaultdict(dict)
+    for metric, key, count in rows:
+        counts[metric][key] = count
+    motions = counts[Metrics.MOTIONS]
+    total, granted = motions.get('total', 0), motions.get('granted', 0)
+    return {
+        "lawyers_per_type": {
+            key: count for key, count in counts[Metrics.LAWYER_TYPE].items() if count},
+        "users_per_type": {
+            key: count for key, count in counts[Metrics.USER_TYPE].items() if count},
+        "pretrials_per_month": [
+            {"month": key, "count": count}
+            for key, count in counts[Metrics.PRETRIALS_PER_MONTH].items() if count],
+        "hearings_per_day": [
+            {"date": key, "count": count}
+            for key, count in counts[Metrics.HEARINGS_PER_DAY].items() if count],
+        "motions": {
+            "total": total,
+            "granted": granted,
+            "granted_ratio": round(granted / total, 4) if total else None,
+        },
+    }
@@ -0,0 +1,77 @@
+"""
+Per-connection tuning of the SQLite database, for the small deployments
+running several gunicorn workers on one file, and locking of write
+transactions on the other databases.
+"""
+import hashlib
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+
+def configure_sqlite(connection) -> None:
+    """
+    Applies ``settings.SQLITE_PRAGMAS`` to a new SQLite connection and lets
+    ``write_atomic`` choose how its transactions begin.
+
+    WAL lets readers run alongside the one writer, ``synchronous=NORMAL``
+    only syncs at checkpoints (still safe from corruption under WAL) and
+    ``busy_timeout`` makes a blocked writer wait instead of failing at once
+    with "database is locked".
+    """
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+    def begin():
+        mode = " IMMEDIATE" if getattr(connection, "begin_immediate", False) else ""
+        connection.cursor().execute(f"BEGIN{mode}")
+    # Django begins SQLite transactions with a plain (deferred) BEGIN here.
+    connection._start_transaction_under_autocommit = begin
+
+
+@contextmanager
+def write_atomic(using=None):
+    """
+    ``transaction.atomic`` for transactions that read and then write.
+
+    A deferred transaction only takes SQLite's write lock at its first
+    write. When another connection wrote in between, the upgrade fails with
+    "database is locked" right away, without waiting for ``busy_timeout``.
+    With ``settings.SQLITE_BEGIN_IMMEDIATE`` the outermost block therefore
+    starts with ``BEGIN IMMEDIATE``, which takes the lock (waiting for it if
+    need be) before the first read. Other databases get a plain ``atomic``.
+    """
+    connection = transaction.get_connection(using)
+    connection.begin_immediate = (
+        connection.vendor == 'sqlite' and settings.SQLITE_BEGIN_IMMEDIATE
+        and not connection.in_atomic_block)
+    try:
+        with transaction.atomic(using):
+            connection.begin_immediate = False
+            yield
+    finally:
+        connection.begin_immediate = False
+
+
+def lock_keys(*keys, using=None) -> None:
+    """
+    Takes a lock on each of ``keys`` (hashable values such as
+    ``("judge", 3)``) until the current transaction ends, so that writers
+    checking and booking the same things run one after the other.
+
+    PostgreSQL gets transaction-level advisory locks, taken in a fixed order
+    so that writers locking overlapping keys cannot deadlock. On SQLite the
+    ``BEGIN IMMEDIATE`` of ``write_atomic`` already serializes the writers.
+    """
+    connection = transaction.get_connection(using)
+    if connection.vendor != 'postgresql':
+        return
+    ids = sorted({
+        int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(),
+                       'big', signed=True)
+        for key in keys})
+    with connection.cursor() as cursor:
+        for lock_id in ids:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_id])
@@ -0,0 +1,110 @@
+import csv
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Document, Hearing, PreTrial
+from .projections import (DocumentProjection, HearingProjection,
+                          PreTrialProjection)
+from .sharding import scatter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+# Export name -> (model, projection). Rows are owned as in api.sharding.OWNERS.
+EXPORTS = {
+    'pretrial': (PreTrial, PreTrialProjection()),
+    'hearing': (Hearing, HearingProjection()),
+    'document': (Document, DocumentProjection()),
+}
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+CHUNK_SIZE = 2000
+
+
+def export_queryset(name, user=None, after=None):
+    """
+    Returns the rows of export ``name`` as a ``values()`` queryset ordered
+    by id.
+
+    Args:
+        name (str): One of ``EXPORTS``.
+        user (optional): Restrict the export to rows owned by this user.
+            ``None`` exports everything.
+        after (int, optional): Resume after this id, i.e. the ``id`` of the
+            last row a previous, interrupted export delivered.
+
+    Raises:
+        ValueError: If ``name`` is not a known export.
+    """
+    if name not in EXPORTS:
+        raise ValueError(f"Unknown export: {name}. Available: {', '.join(EXPORTS)}")
+    model, projection = EXPORTS[name]
+    queryset = model.objects.all()
+    if user is not None:
+        # Pinned to the user's shard: the rows are read while the response
+        # streams, after the request's routing has ended.
+        queryset = model.objects.for_user(user.id)
+    if after is not None:
+        queryset = queryset.filter(id__gt=after)
+    return projection.queryset(queryset.order_by('id'))
+
+
+# START: Encoders
+class _Echo:
+    """
+    File-like object handing back what ``csv.writer`` writes to it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(rows):
+    encoder = JSONEncoder()
+    for row in rows:
+        if orjson is not None:
+            yield orjson.dumps(row, default=encoder.default, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            yield (json.dumps(row, cls=JSONEncoder) + "\n").encode()
+
+
+def _csv_lines(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields).encode()
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in (row[field] for field in fields)]).encode()
+# END: Encoders
+
+
+def stream_export(queryset, output='ndjson', chunk_size=CHUNK_SIZE, all_shards=False):
+    """
+    Encodes an export queryset line by line.
+
+    Rows are read with ``iterator(chunk_size=...)`` and encoded as they
+    arrive, so memory use does not depend on the size of the table.
+
+    Args:
+        queryset (QuerySet): From ``export_queryset``.
+        output (str): ``ndjson`` (one JSON object per line) or ``csv`` (with a
+            header line).
+        chunk_size (int): Rows fetched from the database at a time.
+        all_shards (bool): Read the rows of every shard, one shard after the
+            other, which keeps them in id order. For exports of all users.
+
+    Returns:
+        Iterator[bytes]: The encoded lines.
+    """
+    if output not in FORMATS:
+        raise ValueError(f"Unknown format: {output}. Available: {', '.join(FORMATS)}")
+    querysets = scatter(queryset) if all_shards else [queryset]
+    rows = (row for shard in querysets for row in shard.iterator(chunk_size=chunk_size))
+    if output == 'csv':
+        return _csv_lines(rows, queryset.query.values_select)
+    return _ndjson_lines(rows)
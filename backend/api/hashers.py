@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id hasher with its cost parameters taken from settings.
+
+    Django re-hashes a password on the next successful login whenever its
+    stored parameters differ from these (``must_update``), so changing the
+    ``ARGON2_*`` settings, or switching ``PASSWORD_HASHER`` from pbkdf2 to
+    argon2, upgrades existing users gradually without a migration.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
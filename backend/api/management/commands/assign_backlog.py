@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.assignment import assign_backlog
+
+
+class Command(BaseCommand):
+    """
+    Assigns the unassigned pre-trials to judges in one balanced batch.
+    """
+    help = "Assign unassigned pre-trials to the least loaded judges."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=None,
+            help="Assign only the oldest LIMIT unassigned pre-trials.")
+
+    def handle(self, *args, **options):
+        result = assign_backlog(limit=options["limit"])
+        self.stdout.write(
+            f"Assigned {result['assigned']} pre-trials\n"
+            f"Before: {result['before']}\nAfter: {result['after']}")
@@ -0,0 +1,59 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import CHUNK_SIZE, EXPORTS, FORMATS, export_queryset, stream_export
+
+
+class Command(BaseCommand):
+    """
+    Streams a full export of pre-trials, hearings or documents to a file or
+    stdout.
+
+    Rows are written in id order as they are read. If an export is
+    interrupted, rerun it with ``--after`` set to the last id written and
+    ``--append`` to continue where it stopped.
+    """
+    help = "Export pre-trials, hearings or documents as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=list(EXPORTS))
+        parser.add_argument(
+            "--format", dest="output", choices=list(FORMATS), default="ndjson",
+            help="Output format.")
+        parser.add_argument(
+            "--output", dest="path", default="-",
+            help="File to write to, '-' for stdout.")
+        parser.add_argument(
+            "--after", type=int, default=None,
+            help="Only export rows with an id greater than this.")
+        parser.add_argument(
+            "--append", action="store_true",
+            help="Append to the output file instead of truncating it.")
+        parser.add_argument(
+            "--chunk-size", type=int, default=CHUNK_SIZE,
+            help="Number of rows fetched from the database at a time.")
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(options["name"], after=options["after"])
+        lines = stream_export(
+            queryset, options["output"], options["chunk_size"], all_shards=True)
+        if options["output"] == "csv" and options["append"]:
+            next(lines)  # The header is already in the file.
+
+        if options["path"] == "-":
+            out = sys.stdout.buffer
+        else:
+            try:
+                out = open(options["path"], "ab" if options["append"] else "wb")
+            except OSError as e:
+                raise CommandError(e)
+        count = -1 if options["output"] == "csv" and not options["append"] else 0
+        try:
+            for line in lines:
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        self.stderr.write(f"Exported {count} {options['name']} rows")
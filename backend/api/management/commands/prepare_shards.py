@@ -0,0 +1,20 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from api.sharding import prepare_shard, shards
+
+
+class Command(BaseCommand):
+    """
+    Migrates every shard of the case tables and moves their id sequences to
+    the start of each shard's id range.
+
+    Safe to rerun, e.g. after adding migrations.
+    """
+    help = "Migrate the case table shards and reserve their id ranges."
+
+    def handle(self, *args, **options):
+        for alias in shards():
+            call_command("migrate", database=alias, verbosity=max(options["verbosity"] - 1, 0))
+            prepare_shard(alias)
+            self.stdout.write(f"Prepared shard {alias}")
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (BlacklistedToken,
+                                                             OutstandingToken)
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired OutstandingToken rows and their BlacklistedToken rows.
+
+    Unlike simplejwt's ``flushexpiredtokens`` the rows are removed in batches
+    of ``--batch-size`` ids, so every transaction stays short and the tables
+    stay writable for logins while a large backlog is pruned.
+    """
+    help = "Prune expired outstanding and blacklisted JWTs in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Number of outstanding tokens deleted per batch.")
+        parser.add_argument(
+            "--sleep", type=float, default=0.0,
+            help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        now = timezone.now()
+        total = 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lt=now)
+                .order_by()
+                .values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            total += len(ids)
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write(f"Pruned {total} expired tokens")
@@ -0,0 +1,37 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Tombstone
+
+
+class Command(BaseCommand):
+    """
+    Deletes change feed tombstones older than ``SYNC_TOMBSTONE_DAYS``.
+
+    Clients whose watermark is older are told to sync from scratch anyway.
+    Rows are removed in batches of ``--batch-size`` ids so every transaction
+    stays short.
+    """
+    help = "Prune change feed tombstones past their retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Number of tombstones deleted per batch.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+        total = 0
+        while True:
+            ids = list(
+                Tombstone.objects.filter(deleted_at__lt=cutoff)
+                .order_by()
+                .values_list("id", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            Tombstone.objects.filter(id__in=ids).delete()
+            total += len(ids)
+        self.stdout.write(f"Pruned {total} tombstones")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.autocomplete import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the autocomplete index from scratch.
+
+    Signal handlers keep the index current as profiles change; run this once
+    after deploying the index and after bulk imports that bypass signals.
+    """
+    help = "Rebuild the autocomplete index over names, enrollment numbers and bar codes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Number of index rows written per INSERT.")
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(f"Indexed {total} autocomplete entries")
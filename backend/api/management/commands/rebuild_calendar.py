@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.calendars import rebuild_calendar
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the materialized hearing calendar from the hearings table.
+
+    Signal handlers and the bulk writers keep the calendar current; run this
+    once after deploying it and after imports that bypass both.
+    """
+    help = "Rebuild the hearing calendar and cause lists from all hearings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Number of calendar entries written per INSERT.")
+
+    def handle(self, *args, **options):
+        total = rebuild_calendar(batch_size=options["batch_size"])
+        self.stdout.write(f"Wrote {total} calendar entries")
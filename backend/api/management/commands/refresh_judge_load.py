@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.assignment import fairness, judge_loads, refresh_judge_load
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the judges' load counters from the pre-trials and hearings.
+
+    Writes keep the counters current, but hearings only leave
+    ``hearing_load`` when their day passes; run this daily and once after
+    migrating.
+    """
+    help = "Recompute every judge's caseload, hearing load and load."
+
+    def handle(self, *args, **options):
+        count = refresh_judge_load()
+        stats = fairness(row['load'] for row in judge_loads())
+        self.stdout.write(f"Refreshed {count} judges: {stats}")
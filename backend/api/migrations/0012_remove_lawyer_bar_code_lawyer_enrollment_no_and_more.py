@@ -0,0 +1,61 @@
+# Generated by Django 4.2.5 on 2026-10-16 20:28
+
+import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_rename_type_lawyer_lawyer_type_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='lawyer',
+            name='bar_code',
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='enrollment_no',
+            field=models.CharField(default='', max_length=255, verbose_name='Bar council Enrollment No for lawyers'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='registeration_no',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Bar council Registration No for lawyers'),
+        ),
+        migrations.CreateModel(
+            name='Hearing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheduled_date', models.DateField(default=datetime.date.today)),
+                ('scheduled_time', models.TimeField(default=datetime.time(20, 28, 4, 795443))),
+                ('motion_details', models.TextField(blank=True, null=True)),
+                ('motion_granted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pretrial', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hearings', to='api.pretrial')),
+            ],
+            options={
+                'ordering': ('scheduled_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Document',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('document_no', models.CharField(max_length=255)),
+                ('file', models.FileField(upload_to='documents/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('hearing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='api.hearing')),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.5 on 2026-10-16 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_remove_lawyer_bar_code_lawyer_enrollment_no_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hearing',
+            index=models.Index(fields=['pretrial', 'scheduled_date'], name='hearing_pretrial_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lawyer',
+            index=models.Index(fields=['lawyer_type', '-id'], name='lawyer_type_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pretrial',
+            index=models.Index(fields=['user', 'date_registered', 'id'], name='pretrial_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useraccount',
+            index=models.Index(fields=['user_type', 'created_at'], name='user_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.5 on 2026-10-16 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useraccount',
+            name='token_generation',
+            field=models.PositiveIntegerField(default=0, verbose_name='Generation of the JWTs issued to the user'),
+        ),
+    ]
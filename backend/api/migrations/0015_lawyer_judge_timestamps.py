@@ -0,0 +1,36 @@
+# Generated by Django 4.2.5 on 2026-10-16 20:38
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_useraccount_token_generation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='judge',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='judge',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.db import migrations
+
+# Kept apart as SQLite drops them whenever it rebuilds api_pretrial (see
+# 0023_shard_foreign_keys).
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER api_pretrial_fts_insert AFTER INSERT ON api_pretrial BEGIN
+        INSERT INTO api_pretrial_fts(rowid, case_act, details)
+        VALUES (new.id, new.case_act, new.details);
+    END
+    """,
+    """
+    CREATE TRIGGER api_pretrial_fts_delete AFTER DELETE ON api_pretrial BEGIN
+        INSERT INTO api_pretrial_fts(api_pretrial_fts, rowid, case_act, details)
+        VALUES ('delete', old.id, old.case_act, old.details);
+    END
+    """,
+    """
+    CREATE TRIGGER api_pretrial_fts_update AFTER UPDATE OF case_act, details ON api_pretrial BEGIN
+        INSERT INTO api_pretrial_fts(api_pretrial_fts, rowid, case_act, details)
+        VALUES ('delete', old.id, old.case_act, old.details);
+        INSERT INTO api_pretrial_fts(rowid, case_act, details)
+        VALUES (new.id, new.case_act, new.details);
+    END
+    """,
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE api_pretrial_fts USING fts5(
+        case_act, details,
+        content='api_pretrial', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    *SQLITE_TRIGGERS,
+    "INSERT INTO api_pretrial_fts(api_pretrial_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS api_pretrial_fts_update",
+    "DROP TRIGGER IF EXISTS api_pretrial_fts_delete",
+    "DROP TRIGGER IF EXISTS api_pretrial_fts_insert",
+    "DROP TABLE IF EXISTS api_pretrial_fts",
+]
+
+# Must match api.search.POSTGRES_DOCUMENT for the planner to use the index.
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX api_pretrial_search_idx ON api_pretrial USING GIN (
+        to_tsvector('english', coalesce(case_act, '') || ' ' || coalesce(details, ''))
+    )
+    """,
+]
+
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS api_pretrial_search_idx"]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text index over PreTrial.case_act and PreTrial.details.
+
+    SQLite gets an external content FTS5 table kept in sync by triggers,
+    PostgreSQL a GIN expression index, which it maintains itself. Other
+    backends are left alone and fall back to icontains in api.search.
+    """
+
+    dependencies = [
+        ('api', '0015_lawyer_judge_timestamps'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
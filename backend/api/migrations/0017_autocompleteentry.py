@@ -0,0 +1,30 @@
+# Generated by Django 4.2.5 on 2026-10-16 20:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_pretrial_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutocompleteEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('name', 'Name'), ('enrollment_no', 'Enrollment No'), ('bar_code', 'Bar Code')], max_length=20)),
+                ('term', models.CharField(max_length=255)),
+                ('label', models.CharField(max_length=255)),
+                ('user_type', models.CharField(choices=[('CLIENT', 'Client'), ('LAWYER', 'Lawyer'), ('JUDGE', 'Judge')], max_length=50)),
+                ('object_id', models.PositiveIntegerField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term'], name='autocomplete_kind_term_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']), models.Index(fields=['term'], name='autocomplete_term_idx', opclasses=['varchar_pattern_ops']), models.Index(fields=['kind', 'object_id'], name='autocomplete_object_idx')],
+            },
+        ),
+    ]
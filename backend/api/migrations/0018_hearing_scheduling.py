@@ -0,0 +1,37 @@
+# Generated by Django 4.2.5 on 2026-10-16 20:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_autocompleteentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hearing',
+            name='courtroom',
+            field=models.CharField(blank=True, max_length=50, null=True, verbose_name='Courtroom'),
+        ),
+        migrations.AddField(
+            model_name='hearing',
+            name='duration',
+            field=models.PositiveIntegerField(default=30, verbose_name='Duration in minutes'),
+        ),
+        migrations.AddField(
+            model_name='hearing',
+            name='judge',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hearings', to='api.judge'),
+        ),
+        migrations.AddIndex(
+            model_name='hearing',
+            index=models.Index(fields=['judge', 'scheduled_date', 'scheduled_time'], name='hearing_judge_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hearing',
+            index=models.Index(fields=['courtroom', 'scheduled_date', 'scheduled_time'], name='hearing_courtroom_slot_idx'),
+        ),
+    ]
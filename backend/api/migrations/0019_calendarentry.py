@@ -0,0 +1,34 @@
+# Generated by Django 4.2.5 on 2026-10-16 21:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_hearing_scheduling'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('CLIENT', 'Client'), ('LAWYER', 'Lawyer'), ('JUDGE', 'Judge')], max_length=50)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('duration', models.PositiveIntegerField()),
+                ('courtroom', models.CharField(blank=True, max_length=50, null=True)),
+                ('case_act', models.TextField()),
+                ('hearing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.hearing')),
+                ('judge', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.judge')),
+                ('pretrial', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.pretrial')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'date', 'time'], name='calendar_user_date_idx'), models.Index(fields=['judge', 'role', 'date', 'time'], name='calendar_cause_list_idx')],
+            },
+        ),
+    ]
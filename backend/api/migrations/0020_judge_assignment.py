@@ -0,0 +1,38 @@
+# Generated by Django 4.2.5 on 2026-10-16 21:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_calendarentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='judge',
+            name='caseload',
+            field=models.PositiveIntegerField(default=0, verbose_name='Assigned pre-trials'),
+        ),
+        migrations.AddField(
+            model_name='judge',
+            name='hearing_load',
+            field=models.PositiveIntegerField(default=0, verbose_name='Upcoming hearings'),
+        ),
+        migrations.AddField(
+            model_name='judge',
+            name='load',
+            field=models.PositiveIntegerField(default=0, verbose_name='Weighted load'),
+        ),
+        migrations.AddField(
+            model_name='pretrial',
+            name='judge',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pretrials', to='api.judge'),
+        ),
+        migrations.AddIndex(
+            model_name='judge',
+            index=models.Index(fields=['load', 'id'], name='judge_load_idx'),
+        ),
+    ]
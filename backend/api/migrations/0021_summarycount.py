@@ -0,0 +1,26 @@
+# Generated by Django 4.2.5 on 2026-10-16 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_judge_assignment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SummaryCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('lawyer_type', 'Lawyers per type'), ('user_type', 'Users per type'), ('pretrials_per_month', 'Pre-trials per month'), ('hearings_per_day', 'Hearings per day'), ('motions', 'Motions')], max_length=30)),
+                ('key', models.CharField(max_length=50)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='summarycount',
+            constraint=models.UniqueConstraint(fields=('metric', 'key'), name='summary_metric_key_unique'),
+        ),
+    ]
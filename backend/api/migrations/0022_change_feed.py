@@ -0,0 +1,40 @@
+# Generated by Django 4.2.5 on 2026-10-16 21:11
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_summarycount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('user_id', models.IntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='lawyer',
+            index=models.Index(fields=['updated_at', 'id'], name='lawyer_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pretrial',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='pretrial_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['model', 'user_id', 'deleted_at', 'id'], name='tombstone_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.5 on 2026-10-16 23:40
+
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+fulltext = import_module('api.migrations.0016_pretrial_fulltext_index')
+
+
+def restore_fulltext_triggers(apps, schema_editor):
+    # SQLite alters the foreign keys by rebuilding api_pretrial, which drops
+    # the full-text index triggers along with the old table.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for trigger in ('insert', 'delete', 'update'):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS api_pretrial_fts_{trigger}")
+    for sql in fulltext.SQLITE_TRIGGERS:
+        schema_editor.execute(sql)
+    schema_editor.execute("INSERT INTO api_pretrial_fts(api_pretrial_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_change_feed'),
+    ]
+
+    operations = [
+        # Unapplying rebuilds the table as well; this runs last then.
+        migrations.RunPython(migrations.RunPython.noop, restore_fulltext_triggers),
+        migrations.AlterField(
+            model_name='pretrial',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='PreTrial', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='pretrial',
+            name='judge',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pretrials', to='api.judge'),
+        ),
+        migrations.AlterField(
+            model_name='hearing',
+            name='judge',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hearings', to='api.judge'),
+        ),
+        migrations.AlterField(
+            model_name='calendarentry',
+            name='hearing',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.hearing'),
+        ),
+        migrations.AlterField(
+            model_name='calendarentry',
+            name='pretrial',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.pretrial'),
+        ),
+        migrations.RunPython(restore_fulltext_triggers, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,11 @@ import datetime
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from api.managers import UserAccountManager
+from api.sharding import ShardedManager
 
 
 # START: Managers
@@ -46,6 +48,7 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
     - is_active: BooleanField, default True
     - is_staff: BooleanField, default False
     - is_superuser: BooleanField, default False
+    - token_generation: PositiveIntegerField, bumped to revoke every issued JWT
     - created_at: DateTimeField, auto_now_add
     - updated_at: DateTimeField, auto_now
 
@@ -79,6 +82,8 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
         _("Boolean definining staff access level"), default=False)
     is_superuser = models.BooleanField(
         _("Boolean definining staff access level"), default=False)
+    token_generation = models.PositiveIntegerField(
+        _("Generation of the JWTs issued to the user"), default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -88,6 +93,14 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["name"]
 
+    class Meta:
+        indexes = [
+            # LawyerManager / JudgeManager filter on user_type and order by
+            # created_at through the Lawyer/Judge default ordering.
+            models.Index(fields=['user_type', 'created_at'],
+                         name='user_type_created_idx'),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -110,6 +123,10 @@ class Lawyer(models.Model):
             2. Criminal
             3. Family
             4. Corporate
+    created_at : datetime
+        When the lawyer profile was created.
+    updated_at : datetime
+        When the lawyer profile was last updated.
     """
     class Roles(models.TextChoices):
         CIVIL = 'CIVIL', 'Civil'
@@ -131,10 +148,19 @@ class Lawyer(models.Model):
     lawyer_type = models.CharField(_("Lawyer Types"), max_length=50,
                                    choices=Roles.choices, default=Roles.CIVIL)
 
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = LawyerManager()
 
     class Meta:
         ordering = ('user__created_at',)
+        indexes = [
+            models.Index(fields=['lawyer_type', '-id'],
+                         name='lawyer_type_id_idx'),
+            # Change feed: ``updated_at > since`` in (updated_at, id) order.
+            models.Index(fields=['updated_at', 'id'], name='lawyer_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.bar_code}"
@@ -148,6 +174,11 @@ class Judge(models.Model):
         user (UserAccount): The user account associated with the judge.
         bar_code (str): The bar code of the judge.
         court_address (str): The address of the court where the judge presides.
+        caseload (int): Number of pre-trials assigned to the judge.
+        hearing_load (int): Number of the judge's hearings from today on.
+        load (int): Weighted sum of both, which assignments balance.
+        created_at (datetime): When the judge profile was created.
+        updated_at (datetime): When the judge profile was last updated.
 
     Meta:
         ordering (tuple): The default ordering for Judge objects, by user creation date.
@@ -164,10 +195,24 @@ class Judge(models.Model):
     court_address = models.TextField(
         _("Court Address for judges"), null=True, blank=True)
 
+    # START: Load counters
+    # Maintained incrementally by api.assignment; see refresh_judge_load.
+    caseload = models.PositiveIntegerField(_("Assigned pre-trials"), default=0)
+    hearing_load = models.PositiveIntegerField(_("Upcoming hearings"), default=0)
+    load = models.PositiveIntegerField(_("Weighted load"), default=0)
+    # END: Load counters
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = JudgeManager()
 
     class Meta:
         ordering = ('user__created_at',)
+        indexes = [
+            # The least loaded judge is the first entry of this index.
+            models.Index(fields=['load', 'id'], name='judge_load_idx'),
+        ]
 
     def __str__(self):
         return f"{self.bar_code}"
@@ -187,22 +232,43 @@ class PreTrial(models.Model):
         case_act (TextField): The case act associated with this pre-trial record.
         details (TextField): Additional details about this pre-trial record.
         date_registered (DateField): The date this pre-trial record was registered.
+        judge (ForeignKey): The judge the case is assigned to, see api.assignment.
         created_at (DateTimeField): The date and time this pre-trial record was created.
         updated_at (DateTimeField): The date and time this pre-trial record was last updated.
     """
+    # The foreign keys between case tables and the other tables are not
+    # enforced by the database, as they may live on different shards (see
+    # api.sharding).
     user = models.ForeignKey(
         UserAccount,
+        db_constraint=False,
         on_delete=models.CASCADE,
         related_name="PreTrial")
     case_act = models.TextField()
     details = models.TextField(null=True, blank=True)
     date_registered = models.DateField(default=datetime.date.today)
+    judge = models.ForeignKey(
+        Judge,
+        db_constraint=False,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="pretrials")
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ShardedManager()
+
     class Meta:
         ordering = ('date_registered',)
+        indexes = [
+            models.Index(fields=['user', 'date_registered', 'id'],
+                         name='pretrial_user_date_idx'),
+            # Change feed of one user's pre-trials in (updated_at, id) order.
+            models.Index(fields=['user', 'updated_at', 'id'],
+                         name='pretrial_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.calories}_{self.created_at}"
@@ -218,6 +284,9 @@ class Hearing(models.Model):
         scheduled_time (TimeField): The time at which the hearing is scheduled.
         motion_details (TextField): Details of any motion filed for the hearing.
         motion_granted (BooleanField): Indicates whether the motion was granted or not.
+        duration (PositiveIntegerField): The length of the hearing in minutes.
+        judge (ForeignKey): The judge hearing the case, if assigned.
+        courtroom (CharField): The courtroom the hearing takes place in, if assigned.
         created_at (DateTimeField): The date and time at which the hearing was created.
         updated_at (DateTimeField): The date and time at which the hearing was last updated.
     """
@@ -232,11 +301,35 @@ class Hearing(models.Model):
     motion_details = models.TextField(null=True, blank=True)
     motion_granted = models.BooleanField(default=False)
 
+    # START: Scheduling
+    duration = models.PositiveIntegerField(_("Duration in minutes"), default=30)
+    judge = models.ForeignKey(
+        Judge,
+        db_constraint=False,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="hearings")
+    courtroom = models.CharField(
+        _("Courtroom"), max_length=50, null=True, blank=True)
+    # END: Scheduling
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ShardedManager()
+
     class Meta:
         ordering = ('scheduled_date',)
+        indexes = [
+            models.Index(fields=['pretrial', 'scheduled_date'],
+                         name='hearing_pretrial_date_idx'),
+            # A judge's or courtroom's day, in start order, is one range scan.
+            models.Index(fields=['judge', 'scheduled_date', 'scheduled_time'],
+                         name='hearing_judge_slot_idx'),
+            models.Index(fields=['courtroom', 'scheduled_date', 'scheduled_time'],
+                         name='hearing_courtroom_slot_idx'),
+        ]
 
 
 class Document(models.Model):
@@ -262,6 +355,196 @@ class Document(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ShardedManager()
+
     class Meta:
         ordering = ('name',)
 # END: User Model Additional Data
+
+
+# START: Lookup tables
+class AutocompleteEntry(models.Model):
+    """
+    A row of the type-ahead index over user names, lawyer enrollment numbers
+    and judge bar codes.
+
+    Every indexed value is stored once per word, normalized by
+    ``api.autocomplete.normalize``, so that a prefix of any word is a range
+    scan on ``(kind, term)`` or ``term``. The index is kept current by the
+    signal handlers in ``api.signals`` and can be rebuilt with
+    ``manage.py rebuild_autocomplete``.
+
+    Attributes:
+        kind (CharField): What the entry indexes (name, enrollment_no, bar_code).
+        term (CharField): A normalized word of the indexed value.
+        label (CharField): The indexed value as displayed to the user.
+        user (ForeignKey): The user the value belongs to.
+        user_type (CharField): The user's type, to restrict names to a role.
+        object_id (PositiveIntegerField): The id of the UserAccount, Lawyer or
+            Judge row the value was read from.
+    """
+    class Kinds(models.TextChoices):
+        NAME = 'name', 'Name'
+        ENROLLMENT_NO = 'enrollment_no', 'Enrollment No'
+        BAR_CODE = 'bar_code', 'Bar Code'
+
+    kind = models.CharField(max_length=20, choices=Kinds.choices)
+    term = models.CharField(max_length=255)
+    label = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        UserAccount,
+        on_delete=models.CASCADE,
+        related_name="+")
+    user_type = models.CharField(max_length=50, choices=UserAccount.Roles.choices)
+    object_id = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            # The pattern opclasses let PostgreSQL serve ``LIKE 'prefix%'``
+            # from the index under any collation; other backends ignore them.
+            models.Index(fields=['kind', 'term'], name='autocomplete_kind_term_idx',
+                         opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+            models.Index(fields=['term'], name='autocomplete_term_idx',
+                         opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['kind', 'object_id'], name='autocomplete_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.term}"
+# END: Lookup tables
+
+
+# START: Calendar
+class CalendarEntry(models.Model):
+    """
+    A hearing on the calendar of one of its participants: the client owning
+    the pre-trial and the judge hearing it.
+
+    The table is a materialized view over Hearing, PreTrial and Judge, kept
+    current by ``api.calendars.sync_hearings`` (called from signal handlers
+    and bulk writers) and rebuilt by ``manage.py rebuild_calendar``. A
+    participant's calendar between two dates and a judge's cause list for a
+    day are each a single range scan.
+
+    Attributes:
+        user (ForeignKey): The participant.
+        role (CharField): The participant's part in the hearing.
+        hearing (ForeignKey): The hearing.
+        pretrial (ForeignKey): The hearing's pre-trial.
+        judge (ForeignKey): The hearing's judge, if assigned.
+        date (DateField): The hearing's date.
+        time (TimeField): The hearing's start.
+        duration (PositiveIntegerField): The hearing's length in minutes.
+        courtroom (CharField): The hearing's courtroom.
+        case_act (TextField): The pre-trial's case act, for display.
+    """
+    user = models.ForeignKey(
+        UserAccount,
+        on_delete=models.CASCADE,
+        related_name="+")
+    role = models.CharField(max_length=50, choices=UserAccount.Roles.choices)
+    # Not enforced by the database, like the foreign keys of PreTrial.
+    hearing = models.ForeignKey(
+        Hearing,
+        db_constraint=False,
+        on_delete=models.CASCADE,
+        related_name="+")
+    pretrial = models.ForeignKey(
+        PreTrial,
+        db_constraint=False,
+        on_delete=models.CASCADE,
+        related_name="+")
+    judge = models.ForeignKey(
+        Judge,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+")
+    date = models.DateField()
+    time = models.TimeField()
+    duration = models.PositiveIntegerField()
+    courtroom = models.CharField(max_length=50, null=True, blank=True)
+    case_act = models.TextField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date', 'time'], name='calendar_user_date_idx'),
+            models.Index(fields=['judge', 'role', 'date', 'time'],
+                         name='calendar_cause_list_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.date}:{self.hearing_id}"
+# END: Calendar
+
+
+# START: Dashboard
+class SummaryCount(models.Model):
+    """
+    One counter of the operations dashboard, e.g. the number of criminal
+    lawyers or of hearings on a day.
+
+    Kept current by ``api.dashboard`` from signal handlers and the bulk
+    writers, and rebuilt by ``manage.py rebuild_dashboard``; the dashboard
+    reads these rows instead of grouping the source tables.
+
+    Attributes:
+        metric (CharField): What is counted.
+        key (CharField): The group within the metric: a lawyer or user type,
+            a month (``YYYY-MM``), a day (``YYYY-MM-DD``) or, for motions,
+            ``total``/``granted``. Months and days sort as dates.
+        count (BigIntegerField): The number of rows in the group.
+    """
+    class Metrics(models.TextChoices):
+        LAWYER_TYPE = 'lawyer_type', 'Lawyers per type'
+        USER_TYPE = 'user_type', 'Users per type'
+        PRETRIALS_PER_MONTH = 'pretrials_per_month', 'Pre-trials per month'
+        HEARINGS_PER_DAY = 'hearings_per_day', 'Hearings per day'
+        MOTIONS = 'motions', 'Motions'
+
+    metric = models.CharField(max_length=30, choices=Metrics.choices)
+    key = models.CharField(max_length=50)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'key'], name='summary_metric_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}:{self.key}={self.count}"
+# END: Dashboard
+
+
+# START: Change feed
+class Tombstone(models.Model):
+    """
+    Records the deletion of a row the change feed (``api.sync``) serves, so
+    clients syncing from an older watermark learn to drop it.
+
+    Written by signal handlers; pruned after ``SYNC_TOMBSTONE_DAYS`` by
+    ``manage.py prune_tombstones``.
+
+    Attributes:
+        model (CharField): The change feed the row belonged to.
+        object_id (BigIntegerField): The id of the deleted row.
+        user_id (IntegerField): The owner of the deleted row for per-user
+            feeds, ``None`` for feeds shared by everyone. Not a foreign key:
+            the tombstone outlives its owner.
+        deleted_at (DateTimeField): When the row was deleted.
+    """
+    model = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    user_id = models.IntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'user_id', 'deleted_at', 'id'],
+                         name='tombstone_feed_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}:{self.object_id}"
+# END: Change feed
@@ -0,0 +1,160 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a client supplied cursor cannot be decoded.
+    """
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) paginator for ordered querysets.
+
+    Instead of ``OFFSET``/``COUNT`` the paginator remembers the ordering key of
+    the last row it returned and asks the database for the rows after it, so
+    every page costs the same index range scan no matter how deep it is.
+
+    Attributes:
+        ordering (tuple): The ordering of the queryset, e.g. ``('-id',)`` or
+            ``('date_registered', 'id')``. The last field must be unique.
+        page_size (int): The number of rows returned per page.
+
+    Cursors are opaque urlsafe base64 strings holding the key values of the
+    boundary row and the direction to read in.
+    """
+
+    def __init__(self, ordering, page_size=10):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        self.fields = paginator_fields(self.ordering)
+
+    # START: Cursor encoding
+    @staticmethod
+    def encode_cursor(values, reverse=False) -> str:
+        payload = json.dumps({"v": values, "r": reverse}, default=str,
+                             separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values, reverse = payload["v"], bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor("Invalid cursor")
+        return values, reverse
+    # END: Cursor encoding
+
+    def _key(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field in self.fields]
+        return [getattr(row, field) for field in self.fields]
+
+    def _after(self, values, reverse):
+        """
+        Builds the lexicographic ``(a, b) > (x, y)`` condition for the ordering,
+        flipped when reading backwards.
+        """
+        condition = Q()
+        for i, ordering in enumerate(self.ordering):
+            descending = ordering.startswith('-')
+            lookup = 'lt' if descending != reverse else 'gt'
+            term = Q(**{f"{self.fields[i]}__{lookup}": values[i]})
+            for field, value in zip(self.fields[:i], values[:i]):
+                term &= Q(**{field: value})
+            condition |= term
+        return condition
+
+    def paginate(self, queryset, cursor=None) -> dict:
+        """
+        Returns one page of ``queryset`` starting at ``cursor``.
+
+        Args:
+            queryset (QuerySet): The filtered queryset to page through. It may
+                be a ``values()`` queryset as long as it selects the key fields.
+            cursor (str, optional): A cursor from a previous page.
+
+        Returns:
+            dict: ``results`` (list of rows), ``next`` and ``previous`` cursors
+            (``None`` at either end of the result set).
+
+        Raises:
+            InvalidCursor: If the cursor is malformed.
+        """
+        queryset, values, reverse = self._page_queryset(queryset, cursor)
+        return self._page(list(queryset), values, reverse)
+
+    async def apaginate(self, queryset, cursor=None) -> dict:
+        """
+        Async version of ``paginate`` for async views.
+        """
+        queryset, values, reverse = self._page_queryset(queryset, cursor)
+        return self._page([row async for row in queryset], values, reverse)
+
+    def _page_queryset(self, queryset, cursor):
+        values, reverse = self.decode_cursor(cursor) if cursor else (None, False)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f"-{field}" for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+        return queryset[:self.page_size + 1], values, reverse
+
+    def _page(self, rows, values, reverse) -> dict:
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                next_cursor = self.encode_cursor(self._key(rows[-1]))
+            if (has_more and reverse) or (values is not None and not reverse):
+                previous_cursor = self.encode_cursor(
+                    self._key(rows[0]), reverse=True)
+
+        return {
+            "results": rows,
+            "next": next_cursor,
+            "previous": previous_cursor,
+        }
+
+
+def paginator_fields(ordering) -> tuple:
+    """
+    Returns the field names of a keyset ``ordering`` such as ``('-id',)``.
+    """
+    return tuple(field.lstrip('-') for field in ordering)
+
+
+def cursor_pagination_requested(request) -> bool:
+    """
+    Returns True when the client asked for cursor pagination, either with
+    ``?pagination=cursor`` or by passing a ``cursor`` from a previous page.
+    """
+    return (request.GET.get('pagination') == 'cursor'
+            or bool(request.GET.get('cursor')))
+
+
+def get_page_size(request, default=10, maximum=100, param='page_size') -> int:
+    """
+    Reads ``?page_size=`` (or ``param``) from the request, clamped to
+    ``[1, maximum]``.
+    """
+    try:
+        page_size = int(request.GET.get(param, default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, maximum))
@@ -0,0 +1,86 @@
+from django.db.models import Q
+from rest_framework.permissions import BasePermission
+
+from .models import Judge, UserAccount
+
+
+class _RolePermission(BasePermission):
+    """
+    Grants access to active users of ``role``.
+
+    Works with both ``UserAccount`` instances and the claims-backed users of
+    ``ClaimsJWTAuthentication``, so it never needs a query by itself.
+    """
+    role = None
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.is_active
+                    and user.user_type == self.role)
+
+
+class IsClient(_RolePermission):
+    role = UserAccount.Roles.CLIENT
+
+
+class IsLawyer(_RolePermission):
+    role = UserAccount.Roles.LAWYER
+
+
+class IsJudge(_RolePermission):
+    role = UserAccount.Roles.JUDGE
+
+
+def manages_all_hearings(user) -> bool:
+    """
+    Whether ``user`` may schedule, write and assign hearings and pre-trials
+    of any user: staff only. Anyone can register as a judge, so judges are
+    limited to their own cases by ``pretrial_scope``/``hearing_scope``.
+    """
+    return bool(getattr(user, 'is_staff', False))
+
+
+def _judge_id(user):
+    if getattr(user, 'user_type', None) != UserAccount.Roles.JUDGE:
+        return None
+    return Judge.objects.filter(user_id=user.id).values_list('id', flat=True).first()
+
+
+def pretrial_scope(user) -> Q:
+    """
+    Filter on the pre-trials ``user`` may schedule and write hearings of:
+    all of them for staff, otherwise their own and, for judges, the ones
+    assigned to them.
+    """
+    if manages_all_hearings(user):
+        return Q()
+    scope = Q(user_id=user.id)
+    judge_id = _judge_id(user)
+    if judge_id is not None:
+        scope |= Q(judge_id=judge_id)
+    return scope
+
+
+def hearing_scope(user) -> Q:
+    """
+    Filter on the hearings ``user`` may write, as ``pretrial_scope`` plus,
+    for judges, the hearings they hear.
+    """
+    if manages_all_hearings(user):
+        return Q()
+    scope = Q(pretrial__user_id=user.id)
+    judge_id = _judge_id(user)
+    if judge_id is not None:
+        scope |= Q(judge_id=judge_id) | Q(pretrial__judge_id=judge_id)
+    return scope
+
+
+def may_set_judge(user, assigned_judge_id, judge_id) -> bool:
+    """
+    Whether ``user`` may give a hearing of a pre-trial assigned to
+    ``assigned_judge_id`` the judge ``judge_id``: staff any judge, the
+    assigned judge only themselves, and nobody else a judge at all.
+    """
+    if manages_all_hearings(user):
+        return True
+    return judge_id is not None and judge_id == assigned_judge_id == _judge_id(user)
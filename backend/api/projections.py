@@ -0,0 +1,141 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.fields.files import FieldFile
+
+from .models import Document, Hearing, Lawyer, PreTrial
+
+
+class Projection:
+    """
+    Serializes querysets straight from a ``values()`` projection.
+
+    ``django.core.serializers.serialize("json", qs)`` builds a model instance
+    per row, encodes it to a JSON string which the views then decode again so
+    that DRF can encode it a second time. A projection instead asks the
+    database for the listed columns only and hands plain dicts to the
+    renderer, which encodes them once.
+
+    Attributes:
+        model (Model): The model the projection reads from.
+        fields (tuple): The columns to select. Foreign keys are selected by
+            field name and come back as the related primary key.
+    """
+    model = None
+    fields: tuple = ()
+
+    def __init__(self, fields=None):
+        if fields is not None:
+            self.fields = tuple(fields)
+
+    def restrict(self, fields=None, exclude=None, always=('id',)):
+        """
+        Returns a projection selecting only some of this projection's columns.
+
+        Args:
+            fields (iterable, optional): Columns to keep. Defaults to all.
+            exclude (iterable, optional): Columns to drop.
+            always (tuple): Columns kept regardless, e.g. the primary key and
+                the keys cursor pagination orders by.
+
+        Raises:
+            ValueError: If a requested column is not part of the projection.
+        """
+        requested = set(fields or ()) | set(exclude or ())
+        unknown = requested - set(self.fields)
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(sorted(unknown))}. "
+                f"Available: {', '.join(self.fields)}")
+        keep = set(fields) if fields else set(self.fields)
+        keep = (keep - set(exclude or ())) | set(always)
+        return type(self)(field for field in self.fields if field in keep)
+
+    def from_request(self, request, always=('id',)):
+        """
+        Applies the ``?fields=`` and ``?exclude=`` query parameters (comma
+        separated column names) to the projection.
+        """
+        def parse(name):
+            value = request.GET.get(name)
+            return [field.strip() for field in value.split(',') if field.strip()] if value else None
+        return self.restrict(parse('fields'), parse('exclude'), always)
+
+    def queryset(self, queryset):
+        """
+        Returns ``queryset`` restricted to the projected columns.
+        """
+        return queryset.values(*self.fields)
+
+    def only(self, queryset):
+        """
+        Returns ``queryset`` deferring every column outside the projection,
+        for code paths that need model instances, such as prefetches.
+        """
+        return queryset.only(*self.fields)
+
+    def instance_row(self, instance) -> dict:
+        """
+        Returns the projected columns of a model instance in the same shape
+        ``values()`` produces: foreign keys as ids and files as their names.
+        """
+        row = {}
+        for name in self.fields:
+            value = getattr(instance, self.model._meta.get_field(name).attname)
+            if isinstance(value, FieldFile):
+                value = value.name
+            row[name] = value
+        return row
+
+    def rows(self, queryset) -> list[dict]:
+        """
+        Evaluates ``queryset`` and returns its rows as plain dicts.
+        """
+        return list(self.queryset(queryset))
+
+    async def arows(self, queryset) -> list[dict]:
+        """
+        Async version of ``rows``, streaming the rows with ``aiterator()``.
+        """
+        return [row async for row in self.queryset(queryset).aiterator()]
+
+    def legacy_rows(self, rows) -> list[dict]:
+        """
+        Reshapes projected rows into the ``serialize("json")`` layout, i.e.
+        ``{"model": ..., "pk": ..., "fields": {...}}``, for clients that still
+        depend on it.
+        """
+        label = self.model._meta.label_lower
+        encoder = DjangoJSONEncoder()
+        legacy = []
+        for row in rows:
+            fields = {
+                name: value if value is None or isinstance(value, (str, int, float, bool))
+                else encoder.default(value)
+                for name, value in row.items() if name != 'id'
+            }
+            legacy.append({"model": label, "pk": row['id'], "fields": fields})
+        return legacy
+
+
+class LawyerProjection(Projection):
+    model = Lawyer
+    fields = ('id', 'user', 'enrollment_no', 'registeration_no',
+              'chamber_address', 'lawyer_type', 'created_at', 'updated_at')
+
+
+class PreTrialProjection(Projection):
+    model = PreTrial
+    fields = ('id', 'user', 'case_act', 'details', 'date_registered', 'judge',
+              'created_at', 'updated_at')
+
+
+class HearingProjection(Projection):
+    model = Hearing
+    fields = ('id', 'pretrial', 'scheduled_date', 'scheduled_time', 'duration',
+              'judge', 'courtroom', 'motion_details', 'motion_granted',
+              'created_at', 'updated_at')
+
+
+class DocumentProjection(Projection):
+    model = Document
+    fields = ('id', 'hearing', 'name', 'document_no', 'file',
+              'created_at', 'updated_at')
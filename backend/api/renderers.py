@@ -0,0 +1,26 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by ``orjson`` when it is installed.
+
+    orjson encodes dicts, lists, dates and datetimes natively in C; anything it
+    does not know about (lazy translation strings, Decimals, querysets, ...)
+    is handed to DRF's own encoder. Without orjson the renderer behaves
+    exactly like ``JSONRenderer``.
+    """
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._encoder.default)
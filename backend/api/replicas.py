@@ -0,0 +1,141 @@
+"""
+Routing reads of the heavy read endpoints to replicas of the database.
+
+Writes always go to ``default``, the primary. Views decorated with
+``replica_reads`` read from one of ``settings.DATABASE_REPLICAS``, picked
+per request, except:
+
+- for the rest of a request once it has written, and
+- for ``settings.REPLICA_STICKY_SECONDS`` after a request of the same user
+  wrote, so that users read their own writes while the replicas catch up.
+  The window is kept in the cache, which has to be shared by the workers
+  (``CACHE_BACKEND=file``) for it to hold across them.
+"""
+import random
+from asyncio import iscoroutinefunction
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.decorators import sync_and_async_middleware
+
+PRIMARY = 'default'
+
+# The routing state of the current request: the replica it reads from, if
+# any, and whether it wrote. It is a dict mutated in place so that the
+# router sees it from every thread the request runs in under ASGI. It is
+# replaced at the start of every request rather than reset at the end, as
+# streaming responses keep reading after the middleware returned.
+_state = ContextVar("replica_state", default=None)
+
+
+def _sticky_key(user_id) -> str:
+    return f"db:primary:{user_id}"
+
+
+class ReplicaRouter:
+    """
+    Sends writes to the primary and reads to the replica of the request.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state["wrote"]:
+            return PRIMARY
+        return state["replica"] or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state["wrote"] = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary.
+        return True
+
+
+def reading_replica() -> bool:
+    """
+    Whether the current request reads from a replica, which may lag behind
+    the primary. Shared caches are only filled from primary reads.
+    """
+    state = _state.get()
+    return state is not None and state["replica"] is not None and not state["wrote"]
+
+
+def use_replica(request) -> None:
+    """
+    Lets the rest of ``request`` read from a replica, unless its user wrote
+    within the last ``REPLICA_STICKY_SECONDS``.
+    """
+    state = _state.get()
+    if state is None or not settings.DATABASE_REPLICAS:
+        return
+    user_id = getattr(request.user, 'id', None)
+    if user_id is not None and cache.get(_sticky_key(user_id)):
+        return
+    state["replica"] = random.choice(settings.DATABASE_REPLICAS)
+
+
+async def ause_replica(request) -> None:
+    """
+    Async version of ``use_replica``.
+    """
+    state = _state.get()
+    if state is None or not settings.DATABASE_REPLICAS:
+        return
+    user_id = getattr(request.user, 'id', None)
+    if user_id is not None and await cache.aget(_sticky_key(user_id)):
+        return
+    state["replica"] = random.choice(settings.DATABASE_REPLICAS)
+
+
+def replica_reads(method):
+    """
+    Decorates an ``APIView`` handler to read from a replica.
+    """
+    @wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        use_replica(request)
+        return method(view, request, *args, **kwargs)
+    return wrapper
+
+
+def _writer_key(request, state):
+    """
+    The sticky key of the user of ``request`` if the request wrote.
+    """
+    user_id = getattr(getattr(request, 'user', None), 'id', None)
+    if state["wrote"] and user_id is not None and settings.DATABASE_REPLICAS:
+        return _sticky_key(user_id)
+    return None
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    """
+    Starts the routing state of every request and, after a request wrote,
+    keeps its user on the primary for ``REPLICA_STICKY_SECONDS``.
+
+    DRF authenticates in the view and sets ``request.user`` on the Django
+    request as well, so the user is known by the time the response is.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            state = {"replica": None, "wrote": False}
+            _state.set(state)
+            response = await get_response(request)
+            if key := _writer_key(request, state):
+                await cache.aset(key, 1, settings.REPLICA_STICKY_SECONDS)
+            return response
+    else:
+        def middleware(request):
+            state = {"replica": None, "wrote": False}
+            _state.set(state)
+            response = get_response(request)
+            if key := _writer_key(request, state):
+                cache.set(key, 1, settings.REPLICA_STICKY_SECONDS)
+            return response
+    return middleware
@@ -0,0 +1,432 @@
+import datetime
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import dashboard, sharding
+from .calendars import sync_hearings
+from .db import lock_keys
+from .models import Hearing
+
+
+class SchedulingConflict(Exception):
+    """
+    Raised when a hearing would overlap another hearing of the same judge or
+    in the same courtroom.
+
+    Attributes:
+        hearing_id (int): The hearing already holding the slot.
+        resource (tuple): ``("judge", id)`` or ``("courtroom", name)``.
+    """
+
+    def __init__(self, hearing_id, resource):
+        super().__init__(
+            f"The {resource[0]} {resource[1]} is already booked by hearing {hearing_id}")
+        self.hearing_id = hearing_id
+        self.resource = resource
+
+
+# START: Time helpers
+def _minutes(value) -> int:
+    if isinstance(value, str):
+        value = datetime.time.fromisoformat(value)
+    return value.hour * 60 + value.minute
+
+
+def _time(minutes) -> datetime.time:
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def court_hours() -> tuple[int, int]:
+    """
+    Returns the court day as ``(start, end)`` minutes since midnight.
+    """
+    return _minutes(settings.COURT_DAY_START), _minutes(settings.COURT_DAY_END)
+
+
+def is_court_day(day) -> bool:
+    return day.weekday() in settings.COURT_WORKING_DAYS
+# END: Time helpers
+
+
+class IntervalIndex:
+    """
+    Sorted index over the non-overlapping ``[start, end)`` intervals booked on
+    one resource (a judge or a courtroom) on one day.
+
+    Because the intervals never overlap, sorting them by start sorts them by
+    end as well, so the only interval that can overlap a new one is the last
+    one starting before the new one ends. Finding it is a binary search:
+    checking a conflict costs O(log n) and finding the next free slot
+    O(log n + k), k being the number of bookings skipped over.
+    """
+
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+        self._ids = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends, self._ids))
+
+    def conflict(self, start, end):
+        """
+        Returns the id of an interval overlapping ``[start, end)``, or ``None``.
+        """
+        i = bisect_left(self._starts, end) - 1
+        if i >= 0 and self._ends[i] > start:
+            return self._ids[i]
+        return None
+
+    def add(self, start, end, ident) -> None:
+        """
+        Books ``[start, end)``. The caller checks ``conflict`` first.
+        """
+        i = bisect_left(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._ids.insert(i, ident)
+
+    def remove(self, ident) -> None:
+        """
+        Frees the interval booked as ``ident``, if any.
+        """
+        if ident in self._ids:
+            i = self._ids.index(ident)
+            del self._starts[i], self._ends[i], self._ids[i]
+
+    def next_free(self, after, duration, limit):
+        """
+        Returns the earliest start ``>= after`` of a free ``duration`` long
+        interval ending by ``limit``, or ``None`` if there is none.
+        """
+        start = after
+        i = bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[i] > start:
+            start = self._ends[i]
+        i += 1
+        while i < len(self._starts) and self._starts[i] < start + duration:
+            start = max(start, self._ends[i])
+            i += 1
+        return start if start + duration <= limit else None
+
+
+class Schedule:
+    """
+    The bookings of judges and courtrooms, as one ``IntervalIndex`` per
+    resource and day.
+
+    Days are loaded lazily, each with one range scan over the
+    ``hearing_judge_slot_idx``/``hearing_courtroom_slot_idx`` indexes, or in
+    advance for a date range with ``preload``. Times are minutes since
+    midnight; a hearing never spans court days.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+
+    @staticmethod
+    def resources(judge_id, courtroom) -> list[tuple]:
+        resources = []
+        if judge_id is not None:
+            resources.append(("judge", judge_id))
+        if courtroom:
+            resources.append(("courtroom", courtroom))
+        return resources
+
+    def _load(self, field, values, date_from, date_to) -> None:
+        rows = Hearing.objects.filter(
+            **{f"{field}__in": values},
+            scheduled_date__range=(date_from, date_to),
+        ).order_by().values_list(
+            field, 'scheduled_date', 'scheduled_time', 'duration', 'id')
+        # A judge or courtroom hears the cases of users on every shard.
+        for shard in sharding.scatter(rows):
+            for value, day, start, duration, ident in shard:
+                index = self._indexes[((field, value), day)]
+                start = _minutes(start)
+                index.add(start, start + duration, ident)
+
+    def preload(self, judges=(), courtrooms=(), date_from=None, date_to=None) -> None:
+        """
+        Loads the bookings of ``judges`` and ``courtrooms`` between
+        ``date_from`` and ``date_to`` with one query per kind of resource.
+        """
+        day = date_from
+        while day <= date_to:
+            for resource in [("judge", judge) for judge in judges] + \
+                    [("courtroom", room) for room in courtrooms]:
+                self._indexes.setdefault((resource, day), IntervalIndex())
+            day += datetime.timedelta(days=1)
+        if judges:
+            self._load('judge', list(judges), date_from, date_to)
+        if courtrooms:
+            self._load('courtroom', list(courtrooms), date_from, date_to)
+
+    def index(self, resource, day) -> IntervalIndex:
+        """
+        Returns the bookings of ``resource`` on ``day``, loading them if needed.
+        """
+        key = (resource, day)
+        if key not in self._indexes:
+            self._indexes[key] = IntervalIndex()
+            self._load(resource[0], [resource[1]], day, day)
+        return self._indexes[key]
+
+    def check(self, resources, day, start, duration, ignore=None) -> None:
+        """
+        Raises ``SchedulingConflict`` if ``[start, start + duration)`` on
+        ``day`` is taken on any of ``resources``. The booking of hearing
+        ``ignore`` (the hearing being moved) does not count.
+        """
+        for resource in resources:
+            index = self.index(resource, day)
+            if ignore is not None:
+                index.remove(ignore)
+            conflict = index.conflict(start, start + duration)
+            if conflict is not None:
+                raise SchedulingConflict(conflict, resource)
+
+    def book(self, resources, day, start, duration, ident) -> None:
+        for resource in resources:
+            index = self.index(resource, day)
+            index.remove(ident)
+            index.add(start, start + duration, ident)
+
+    def next_free(self, resources, after, duration, horizon=None):
+        """
+        Returns the earliest ``(day, start)`` at or after the datetime
+        ``after`` at which every resource is free for ``duration`` minutes
+        within court hours, or ``None`` within ``horizon`` days.
+        """
+        day_start, day_end = court_hours()
+        horizon = settings.SCHEDULING_HORIZON_DAYS if horizon is None else horizon
+        day = after.date()
+        earliest = max(day_start, _minutes(after.time()))
+        for _ in range(horizon + 1):
+            if is_court_day(day):
+                start = earliest
+                # Alternate between the resources until every one of them
+                # is free at the same start.
+                while start is not None:
+                    candidates = [
+                        self.index(resource, day).next_free(start, duration, day_end)
+                        for resource in resources
+                    ] or [start if start + duration <= day_end else None]
+                    if None in candidates:
+                        start = None
+                    elif max(candidates) == start:
+                        return day, start
+                    else:
+                        start = max(candidates)
+            day += datetime.timedelta(days=1)
+            earliest = day_start
+        return None
+
+
+# START: Operations
+def _validate_slot(day, start, duration) -> None:
+    day_start, day_end = court_hours()
+    if duration <= 0:
+        raise ValueError("The duration must be positive")
+    if not is_court_day(day) or start < day_start or start + duration > day_end:
+        raise ValueError(
+            f"Hearings must take place on court days between "
+            f"{settings.COURT_DAY_START} and {settings.COURT_DAY_END}")
+
+
+def schedule_hearing(pretrial_id, judge_id=None, courtroom=None, scheduled_date=None,
+                     scheduled_time=None, duration=30, auto=False, **fields) -> Hearing:
+    """
+    Creates a hearing after checking that its judge and courtroom are free.
+
+    Args:
+        pretrial_id (int): The pre-trial the hearing belongs to.
+        judge_id (int, optional): The judge hearing the case.
+        courtroom (str, optional): The courtroom.
+        scheduled_date (date): The requested day.
+        scheduled_time (time): The requested start.
+        duration (int): Length in minutes.
+        auto (bool): Take the next free slot at or after the requested one
+            instead of failing on a conflict.
+        **fields: Any other ``Hearing`` fields.
+
+    Raises:
+        SchedulingConflict: If the slot is taken and ``auto`` is false.
+        ValueError: If the slot is outside court hours, or ``auto`` finds no
+            free slot within the scheduling horizon.
+
+    Returns:
+        Hearing: The created hearing.
+    """
+    schedule = Schedule()
+    resources = Schedule.resources(judge_id, courtroom)
+    day, start = scheduled_date, _minutes(scheduled_time)
+    # The bookings are read from every shard and the hearing is created on
+    # its pre-trial's, while ``default`` (which also gets the calendar
+    # entries) serializes the writers.
+    with sharding.atomic([sharding.DEFAULT, sharding.shard_of(pretrial_id)], write=True):
+        # Concurrent bookings of the same judge or courtroom wait here, so
+        # that each checks the slot after the previous one was written.
+        lock_keys(*resources)
+        if auto:
+            slot = schedule.next_free(
+                resources, datetime.datetime.combine(day, _time(start)), duration)
+            if slot is None:
+                raise ValueError("No free slot within the scheduling horizon")
+            day, start = slot
+        else:
+            _validate_slot(day, start, duration)
+            schedule.check(resources, day, start, duration)
+        return Hearing.objects.create(
+            pretrial_id=pretrial_id, judge_id=judge_id, courtroom=courtroom,
+            scheduled_date=day, scheduled_time=_time(start), duration=duration, **fields)
+
+
+def check_moves(hearings) -> dict:
+    """
+    Checks new hearings, or hearings given new slots in memory, before they
+    are written: against court hours as in ``schedule_hearing``, and against
+    the other bookings of their judges and courtrooms and each other. Call
+    it in the transaction writing them: it locks their judges and courtrooms
+    (see ``lock_keys``).
+
+    Returns:
+        dict: ``{position: error}`` for every hearing of ``hearings`` whose
+        new slot is invalid (``ValueError``) or taken (``SchedulingConflict``).
+        Unsaved hearings are named ``#position`` in the conflicts.
+    """
+    conflicts, booked = {}, []
+    for position, hearing in enumerate(hearings):
+        try:
+            _validate_slot(hearing.scheduled_date, _minutes(hearing.scheduled_time),
+                           hearing.duration)
+        except ValueError as e:
+            conflicts[position] = e
+            continue
+        resources = Schedule.resources(hearing.judge_id, hearing.courtroom)
+        if resources:
+            booked.append((position, hearing, resources))
+    lock_keys(*{resource for _, _, resources in booked for resource in resources})
+
+    schedule = Schedule()
+    # Free the old slots of all of them first, so that hearings may swap.
+    moving = {hearing.pk for _, hearing, _ in booked if hearing.pk is not None}
+    for _, hearing, resources in booked:
+        for resource in resources:
+            index = schedule.index(resource, hearing.scheduled_date)
+            for ident in [ident for _, _, ident in index if ident in moving]:
+                index.remove(ident)
+
+    for position, hearing, resources in booked:
+        start = _minutes(hearing.scheduled_time)
+        try:
+            schedule.check(resources, hearing.scheduled_date, start, hearing.duration)
+        except SchedulingConflict as e:
+            conflicts[position] = e
+            continue
+        ident = hearing.pk if hearing.pk is not None else f"#{position}"
+        schedule.book(resources, hearing.scheduled_date, start, hearing.duration, ident)
+    return conflicts
+
+
+def next_free_slot(judge_id=None, courtroom=None, duration=30, after=None):
+    """
+    Returns the next ``datetime`` at which the judge and the courtroom are
+    both free for ``duration`` minutes, or ``None`` within the horizon.
+    """
+    after = after or timezone.localtime().replace(tzinfo=None)
+    slot = Schedule().next_free(Schedule.resources(judge_id, courtroom), after, duration)
+    if slot is None:
+        return None
+    return datetime.datetime.combine(slot[0], _time(slot[1]))
+
+
+def reschedule_judge(judge_id, date_from, date_to, start=None) -> list[dict]:
+    """
+    Moves every hearing of a judge between ``date_from`` and ``date_to`` to
+    the next free slots, e.g. when the judge is on leave.
+
+    The judge's and the affected courtrooms' bookings over the scheduling
+    horizon are loaded with one query each; the hearings are then placed in
+    their original order through the interval indexes and written with a
+    single ``bulk_update``.
+
+    Args:
+        judge_id (int): The judge.
+        date_from (date): First day to clear.
+        date_to (date): Last day to clear.
+        start (date, optional): First day hearings may move to. Defaults to
+            the day after ``date_to``.
+
+    Raises:
+        ValueError: If not every hearing fits within the horizon. Nothing
+            is moved then.
+
+    Returns:
+        list[dict]: ``id``, ``scheduled_date`` and ``scheduled_time`` of every
+        moved hearing.
+    """
+    start = start or date_to + datetime.timedelta(days=1)
+    horizon_end = start + datetime.timedelta(days=settings.SCHEDULING_HORIZON_DAYS)
+    blocked = (date_from, date_to)
+
+    with ExitStack() as stack:
+        # ``default`` serializes the bookings (see ``schedule_hearing``); of
+        # the shards, only those holding hearings to move are written.
+        stack.enter_context(sharding.atomic([sharding.DEFAULT], write=True))
+        lock_keys(("judge", judge_id))
+        shards = [shard for shard in sharding.scatter(Hearing.objects.filter(
+            judge_id=judge_id, scheduled_date__range=blocked)) if shard.exists()]
+        stack.enter_context(sharding.atomic([shard.db for shard in shards], write=True))
+        hearings = sorted(
+            (hearing for shard in shards for hearing in shard),
+            key=lambda hearing: (hearing.scheduled_date, hearing.scheduled_time, hearing.id))
+        if not hearings:
+            return []
+
+        courtrooms = {hearing.courtroom for hearing in hearings if hearing.courtroom}
+        lock_keys(*(("courtroom", room) for room in courtrooms))
+        schedule = Schedule()
+        schedule.preload([judge_id], courtrooms, min(start, date_from), horizon_end)
+        for hearing in hearings:
+            for resource in Schedule.resources(judge_id, hearing.courtroom):
+                schedule.index(resource, hearing.scheduled_date).remove(hearing.id)
+
+        day_start, _ = court_hours()
+        cursor = datetime.datetime.combine(start, _time(day_start))
+        now = timezone.now()
+        for hearing in hearings:
+            resources = Schedule.resources(judge_id, hearing.courtroom)
+            after = cursor
+            while True:
+                slot = schedule.next_free(
+                    resources, after, hearing.duration, (horizon_end - after.date()).days)
+                # The cleared days stay blocked for the judge.
+                if slot is None or not blocked[0] <= slot[0] <= blocked[1]:
+                    break
+                after = datetime.datetime.combine(
+                    blocked[1] + datetime.timedelta(days=1), _time(day_start))
+            if slot is None:
+                raise ValueError(
+                    f"No free slot for hearing {hearing.id} within the scheduling horizon")
+            day, minute = slot
+            schedule.book(resources, day, minute, hearing.duration, hearing.id)
+            hearing.scheduled_date, hearing.scheduled_time = day, _time(minute)
+            hearing.updated_at = now
+            cursor = datetime.datetime.combine(day, _time(minute + hearing.duration))
+
+        Hearing.objects.bulk_update(
+            hearings, ['scheduled_date', 'scheduled_time', 'updated_at'], batch_size=100)
+        # bulk_update() sends no post_save.
+        dashboard.record(hearings)
+        sync_hearings([hearing.id for hearing in hearings])
+
+    return [{"id": hearing.id, "scheduled_date": hearing.scheduled_date,
+             "scheduled_time": hearing.scheduled_time} for hearing in hearings]
+# END: Operations
@@ -0,0 +1,121 @@
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import PreTrial
+
+# Must match the expression indexed in migration 0016.
+POSTGRES_DOCUMENT = (
+    "to_tsvector('english', coalesce(p.case_act, '') || ' ' || coalesce(p.details, ''))")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _connection():
+    # The raw queries bypass the ORM, so they ask the router for the
+    # database, e.g. a replica, themselves.
+    return connections[router.db_for_read(PreTrial)]
+
+
+def _fts5_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 query: every word must match, the last one
+    as a prefix. Words are quoted so FTS5 operators in user input are inert.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return ""
+    return " ".join(f'"{token}"' for token in tokens) + "*"
+
+
+def _tsquery(query: str) -> str:
+    """
+    Turns free text into a ``to_tsquery`` query matching like ``_fts5_query``:
+    every word, the last one as a prefix. ``\\w+`` words hold no tsquery
+    operators, so user input cannot inject any.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return ""
+    return " & ".join(tokens) + ":*"
+
+
+def _sqlite_search(query, user_id, limit, offset):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    sql = """
+        SELECT p.id, p.case_act, p.details, p.date_registered,
+               bm25(api_pretrial_fts) AS rank,
+               snippet(api_pretrial_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+        FROM api_pretrial_fts
+        JOIN api_pretrial p ON p.id = api_pretrial_fts.rowid
+        WHERE api_pretrial_fts MATCH %s AND p.user_id = %s
+        ORDER BY rank
+        LIMIT %s OFFSET %s
+    """
+    with _connection().cursor() as cursor:
+        cursor.execute(sql, [match, user_id, limit, offset])
+        columns = [column[0] for column in cursor.description]
+        # bm25() is lower-is-better; flip it so that higher ranks first.
+        return [dict(zip(columns, row), rank=-row[4]) for row in cursor.fetchall()]
+
+
+def _postgres_search(query, user_id, limit, offset):
+    tsquery = _tsquery(query)
+    if not tsquery:
+        return []
+    sql = f"""
+        SELECT p.id, p.case_act, p.details, p.date_registered,
+               ts_rank({POSTGRES_DOCUMENT}, q) AS rank,
+               ts_headline('english',
+                           coalesce(p.case_act, '') || ' ' || coalesce(p.details, ''), q,
+                           'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8') AS snippet
+        FROM api_pretrial p, to_tsquery('english', %s) q
+        WHERE {POSTGRES_DOCUMENT} @@ q AND p.user_id = %s
+        ORDER BY rank DESC, p.id
+        LIMIT %s OFFSET %s
+    """
+    with _connection().cursor() as cursor:
+        cursor.execute(sql, [tsquery, user_id, limit, offset])
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _fallback_search(query, user_id, limit, offset):
+    condition = Q()
+    for token in _TOKEN.findall(query):
+        condition &= Q(case_act__icontains=token) | Q(details__icontains=token)
+    if not condition:
+        return []
+    rows = PreTrial.objects.filter(condition, user_id=user_id).order_by('id').values(
+        'id', 'case_act', 'details', 'date_registered')[offset:offset + limit]
+    return [dict(row, rank=None, snippet=None) for row in rows]
+
+
+def search_pretrials(query: str, user_id, limit: int = 10, offset: int = 0) -> list[dict]:
+    """
+    Full-text searches the case act and details of a user's pre-trials.
+
+    Uses the FTS5 table on SQLite and the GIN expression index on PostgreSQL
+    (both created by migration 0016), falling back to ``icontains`` on other
+    backends.
+
+    Args:
+        query (str): Free text; all words must match, the last one as a
+            prefix (as typed so far) on both SQLite and PostgreSQL.
+        user_id: Only pre-trials of this user are searched.
+        limit (int): Maximum number of rows returned.
+        offset (int): Number of best matches to skip.
+
+    Returns:
+        list[dict]: Rows ordered by relevance with ``id``, ``case_act``,
+        ``details``, ``date_registered``, ``rank`` and a ``snippet`` in which
+        matches are wrapped in ``<mark>`` tags.
+    """
+    search = {
+        'sqlite': _sqlite_search,
+        'postgresql': _postgres_search,
+    }.get(_connection().vendor, _fallback_search)
+    return search(query, user_id, limit, offset)
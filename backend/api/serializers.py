@@ -2,8 +2,11 @@ import re
 
 from django.contrib.auth import authenticate
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer)
 
-from .models import Judge, Lawyer, PreTrial, UserAccount
+from .models import Hearing, Judge, Lawyer, PreTrial, UserAccount
+from .tokens import GenerationRefreshToken, check_token_generation
 
 
 # Serializer for base user registration
@@ -70,7 +73,8 @@ class UserLoginSerializer(serializers.ModelSerializer):
         password (str): Password field for user password.
 
     Methods:
-        validate(data): Validates the user login credentials and returns the validated data.
+        validate(data): Validates the user login credentials and returns the validated data, with the
+            authenticated user under "user" so that callers don't need to hash the password again.
 
     """
     email = serializers.EmailField(max_length=255)
@@ -86,11 +90,13 @@ class UserLoginSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 'An email address is required to log in.'
             )
-        user = authenticate(email=email, password=password)
+        user = authenticate(
+            self.context.get("request"), email=email, password=password)
         if user is None:
             raise serializers.ValidationError(
                 'A user with this email is not found.'
             )
+        data["user"] = user
         return data
 
 
@@ -173,3 +179,79 @@ class PreTrialSerializer(serializers.ModelSerializer):
     class Meta:
         model = PreTrial
         fields = "__all__"
+
+
+# Serializers for bulk writes
+
+
+class PreTrialBulkSerializer(serializers.ModelSerializer):
+    """
+    Validates one pre-trial of a bulk write. The owner is always the
+    requesting user, so it is not part of the payload. ``id`` is only used
+    to address the row in bulk updates.
+    """
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = PreTrial
+        fields = ["id", "case_act", "details", "date_registered"]
+
+
+class HearingBulkSerializer(serializers.ModelSerializer):
+    """
+    Validates one hearing of a bulk write. ``pretrial`` and ``judge`` are
+    validated as plain ids; the bulk writer checks all referenced pre-trials
+    and judges with one query each instead of one lookup per item.
+    """
+    id = serializers.IntegerField(required=False)
+    pretrial = serializers.IntegerField(source="pretrial_id")
+    judge = serializers.IntegerField(source="judge_id", required=False, allow_null=True)
+
+    class Meta:
+        model = Hearing
+        fields = ["id", "pretrial", "judge", "courtroom", "scheduled_date",
+                  "scheduled_time", "duration", "motion_details", "motion_granted"]
+
+
+class HearingScheduleSerializer(serializers.ModelSerializer):
+    """
+    Validates a hearing to be scheduled. With ``auto`` the hearing takes the
+    next free slot at or after the requested date and time.
+    """
+    pretrial = serializers.IntegerField(source="pretrial_id")
+    judge = serializers.IntegerField(source="judge_id", required=False, allow_null=True)
+    auto = serializers.BooleanField(default=False, write_only=True)
+
+    class Meta:
+        model = Hearing
+        fields = ["id", "pretrial", "judge", "courtroom", "scheduled_date",
+                  "scheduled_time", "duration", "motion_details", "auto"]
+        read_only_fields = ["id"]
+        extra_kwargs = {"scheduled_date": {"required": True},
+                        "scheduled_time": {"required": True}}
+
+    def validate_judge(self, value):
+        if value is not None and not Judge.objects.filter(pk=value).exists():
+            raise serializers.ValidationError(
+                f"Invalid pk \"{value}\" - object does not exist.")
+        return value
+
+
+# Serializers for the simplejwt token views
+
+
+class GenerationTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Issues token pairs that carry the user's token generation claim.
+    """
+    token_class = GenerationRefreshToken
+
+
+class GenerationTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuses to refresh tokens from a revoked token generation.
+    """
+
+    def validate(self, attrs):
+        check_token_generation(self.token_class(attrs["refresh"]))
+        return super().validate(attrs)
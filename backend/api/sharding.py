@@ -0,0 +1,348 @@
+"""
+Horizontal sharding of the case tables (PreTrial, Hearing, Document) by
+their owning user.
+
+With ``settings.CASE_SHARDS`` set, a user's pre-trials, with their hearings
+and documents, live on the database ``shard_for(user_id)``; every other
+table stays on ``default``, which is also shard 0. Shard ``i`` hands out ids
+from ``i * SHARD_ID_SPAN`` on (see ``prepare_shard``), so ids are unique
+across the shards and ``shard_of(id)`` tells where a row lives.
+
+Queries on the case tables go to:
+
+- the shard an instance was read from, or that its owner (or, for hearings
+  and documents, its parent's id) points to for new rows. This covers
+  ``save()``, ``delete()``, related managers such as ``pretrial.hearings``
+  and ``create()``/``bulk_create()``/``get_or_create()`` on the managers;
+- the shard of the ids a queryset is filtered on (``pk``, or the parent's
+  id of hearings and documents), when they all live on one shard;
+- otherwise the shard of an ``on_shard()`` block, or else that of the user
+  the current request is authenticated as.
+
+Reads across users (staff exports, rebuilding aggregates, a judge's
+bookings) gather from every shard in turn with ``scatter()``; writes by id
+across users split the ids with ``group_by_shard()``. Without
+``CASE_SHARDS`` all of this stays out of the way and everything lives on
+``default``.
+"""
+from asyncio import iscoroutinefunction
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.utils.decorators import sync_and_async_middleware
+
+from .db import write_atomic
+
+DEFAULT = 'default'
+SHARD_ID_SPAN = 10 ** 12
+
+# The lookup from each sharded model to the user owning its rows.
+OWNERS = {
+    'pretrial': 'user_id',
+    'hearing': 'pretrial__user_id',
+    'document': 'hearing__pretrial__user_id',
+}
+
+# The filters naming the ids that tell each sharded model's shard.
+SHARD_KEYS = {
+    'pretrial': ('pk', 'id'),
+    'hearing': ('pk', 'id', 'pretrial', 'pretrial_id'),
+    'document': ('pk', 'id', 'hearing', 'hearing_id'),
+}
+
+_request = ContextVar("shard_request", default=None)
+_shard = ContextVar("shard", default=None)
+
+
+def shards() -> list[str]:
+    """
+    The database aliases of the shards, ``default`` first.
+    """
+    return list(settings.CASE_SHARDS) or [DEFAULT]
+
+
+def shard_for(user_id) -> str:
+    """
+    The shard holding the cases of user ``user_id``.
+    """
+    aliases = shards()
+    return aliases[int(user_id) % len(aliases)]
+
+
+def shard_of(pk) -> str:
+    """
+    The shard a case row with id ``pk`` was created on.
+    """
+    aliases = shards()
+    return aliases[min(int(pk) // SHARD_ID_SPAN, len(aliases) - 1)]
+
+
+def group_by_shard(ids) -> dict:
+    """
+    Splits case row ``ids`` by the shard they live on, in shard order.
+    """
+    groups = defaultdict(list)
+    for pk in ids:
+        groups[shard_of(pk)].append(pk)
+    return dict(sorted(groups.items(), key=lambda item: shards().index(item[0])))
+
+
+def shards_of(objs) -> list:
+    """
+    The shards case rows ``objs`` live on, or are created on, in shard order.
+    """
+    aliases = {_instance_shard(obj) or DEFAULT for obj in objs}
+    return [alias for alias in shards() if alias in aliases]
+
+
+@contextmanager
+def atomic(aliases=None, write=False):
+    """
+    ``transaction.atomic`` (or ``write_atomic`` with ``write``) on each of
+    ``aliases``, every shard by default, nested in that order. A write
+    failing on one shard is rolled back on all of them; a failed commit
+    cannot be, as the shards commit one after the other.
+    """
+    enter = write_atomic if write else transaction.atomic
+    with ExitStack() as stack:
+        for alias in dict.fromkeys(shards() if aliases is None else aliases):
+            stack.enter_context(enter(alias))
+        yield
+
+
+@contextmanager
+def on_shard(alias):
+    """
+    Routes queries on the case tables without an instance to ``alias``.
+    """
+    token = _shard.set(alias)
+    try:
+        yield
+    finally:
+        _shard.reset(token)
+
+
+def current_shard():
+    """
+    The shard of the enclosing ``on_shard()`` block, or else of the
+    authenticated user of the current request, or ``None``.
+    """
+    alias = _shard.get()
+    if alias is not None:
+        return alias
+    user_id = getattr(getattr(_request.get(), 'user', None), 'id', None)
+    return None if user_id is None else shard_for(user_id)
+
+
+def _instance_shard(instance):
+    if instance._state.db is not None:
+        return instance._state.db
+    name = instance._meta.model_name
+    if name == 'pretrial' and instance.user_id is not None:
+        return shard_for(instance.user_id)
+    if name == 'hearing' and instance.pretrial_id is not None:
+        return shard_of(instance.pretrial_id)
+    if name == 'document' and instance.hearing_id is not None:
+        return shard_of(instance.hearing_id)
+    return None
+
+
+class ShardRouter:
+    """
+    Routes the case tables to their shards; see the module docstring.
+    """
+
+    def _route(self, model, **hints):
+        if not settings.CASE_SHARDS or model._meta.model_name not in OWNERS:
+            return None
+        instance = hints.get('instance')
+        if instance is not None:
+            if instance._meta.model_name in OWNERS:
+                alias = _instance_shard(instance)
+                if alias is not None:
+                    return alias
+            elif instance._meta.label == settings.AUTH_USER_MODEL:
+                # e.g. user.PreTrial.all()
+                return shard_for(instance.pk)
+        return current_shard() or DEFAULT
+
+    db_for_read = _route
+    db_for_write = _route
+
+
+def _key_shard(value):
+    """
+    The shard of a shard key filter value: an id, an instance or a list of
+    ids on one shard. ``None`` for anything else, e.g. expressions.
+    """
+    if isinstance(value, models.Model):
+        return _instance_shard(value) if value._meta.model_name in OWNERS else None
+    if isinstance(value, (list, tuple, set, frozenset)):
+        aliases = {_key_shard(item) for item in value}
+        return aliases.pop() if len(aliases) == 1 else None
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return shard_of(value)
+    return None
+
+
+class ShardedQuerySet(models.QuerySet):
+    """
+    Queryset of the sharded case models; routes by the ids it is filtered on
+    and by the owners of the rows it creates.
+    """
+
+    def _pinned(self) -> bool:
+        return self._db is not None or not settings.CASE_SHARDS
+
+    def _on_shard_of(self, obj):
+        """
+        This queryset on the shard new row ``obj`` belongs on.
+        """
+        if self._pinned():
+            return self
+        alias = _instance_shard(obj)
+        return self if alias is None else self.using(alias)
+
+    def filter(self, *args, **kwargs):
+        queryset = super().filter(*args, **kwargs)
+        if self._pinned():
+            return queryset
+        for name, value in kwargs.items():
+            field, _, lookup = name.partition('__')
+            if field in SHARD_KEYS[self.model._meta.model_name] and lookup in ('', 'exact', 'in'):
+                alias = _key_shard(value)
+                if alias is not None:
+                    return queryset.using(alias)
+        return queryset
+
+    def create(self, **kwargs):
+        obj = self.model(**kwargs)
+        self._for_write = True
+        obj.save(force_insert=True, using=self._on_shard_of(obj).db)
+        return obj
+
+    def get_or_create(self, defaults=None, **kwargs):
+        fields = {name: value for name, value in kwargs.items() if '__' not in name}
+        queryset = self._on_shard_of(self.model(**fields))
+        return super(ShardedQuerySet, queryset).get_or_create(defaults, **kwargs)
+
+    def update_or_create(self, defaults=None, **kwargs):
+        fields = {name: value for name, value in kwargs.items() if '__' not in name}
+        queryset = self._on_shard_of(self.model(**fields))
+        return super(ShardedQuerySet, queryset).update_or_create(defaults, **kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        if self._pinned():
+            return super().bulk_create(objs, *args, **kwargs)
+        groups = defaultdict(list)
+        for obj in objs:
+            groups[_instance_shard(obj) or self.db].append(obj)
+        for alias, group in groups.items():
+            self.using(alias).bulk_create(group, *args, **kwargs)
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        if self._pinned():
+            return super().bulk_update(objs, fields, batch_size=batch_size)
+        groups = defaultdict(list)
+        for obj in objs:
+            groups[_instance_shard(obj) or self.db].append(obj)
+        return sum(self.using(alias).bulk_update(group, fields, batch_size=batch_size)
+                   for alias, group in groups.items())
+
+    def in_bulk(self, id_list=None, *, field_name='pk'):
+        if self._pinned() or id_list is None or field_name != 'pk':
+            return super().in_bulk(id_list, field_name=field_name)
+        found = {}
+        for alias, ids in group_by_shard(id_list).items():
+            found.update(self.using(alias).in_bulk(ids))
+        return found
+
+    def for_user(self, user_id):
+        """
+        The rows owned by ``user_id``, read from their shard.
+        """
+        queryset = self.filter(**{OWNERS[self.model._meta.model_name]: user_id})
+        return queryset.using(shard_for(user_id)) if settings.CASE_SHARDS else queryset
+
+    def scatter(self) -> list:
+        """
+        This queryset on every shard, in shard (and so in id) order.
+        """
+        return scatter(self)
+
+
+class ShardedManager(models.Manager.from_queryset(ShardedQuerySet)):
+    """
+    Default manager of the sharded case models.
+    """
+
+
+def scatter(queryset) -> list:
+    """
+    Returns ``queryset`` once per shard, in shard order; unchanged (and so
+    still routed as usual) without shards. Since every shard's ids lie
+    above the previous one's, rows gathered in this order keep id order.
+    """
+    if not settings.CASE_SHARDS:
+        return [queryset]
+    return [queryset.using(alias) for alias in shards()]
+
+
+# START: Shard setup
+def prepare_shard(alias) -> None:
+    """
+    Moves the id sequences of the case tables of shard ``alias`` to the
+    start of its range, unless they are already past it.
+    """
+    start = shards().index(alias) * SHARD_ID_SPAN
+    if not start:
+        return
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        for model_name in OWNERS:
+            table = f"api_{model_name}"
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    "UPDATE sqlite_sequence SET seq = max(seq, %s) WHERE name = %s",
+                    [start, table])
+                if not cursor.rowcount:
+                    cursor.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                        [table, start])
+            elif connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                    f"greatest(%s, (SELECT coalesce(max(id), 0) FROM {table})))",
+                    [table, start])
+            else:
+                raise NotImplementedError(f"Cannot shard {connection.vendor} databases")
+# END: Shard setup
+
+
+@sync_and_async_middleware
+def shard_middleware(get_response):
+    """
+    Remembers the current request, whose user ``current_shard()`` reads
+    once DRF has authenticated it.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = _request.set(request)
+            try:
+                return await get_response(request)
+            finally:
+                _request.reset(token)
+    else:
+        def middleware(request):
+            token = _request.set(request)
+            try:
+                return get_response(request)
+            finally:
+                _request.reset(token)
+    return middleware
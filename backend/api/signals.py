@@ -0,0 +1,207 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import autocomplete, calendars, dashboard, sharding, sync
+from .assignment import adjust_load
+from .cache import bump_namespace
+from .db import configure_sqlite
+from .models import (AutocompleteEntry, CalendarEntry, Hearing, Judge, Lawyer,
+                     PreTrial, UserAccount)
+from .tokens import set_user_active
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        configure_sqlite(connection)
+
+
+@receiver(post_save, sender=UserAccount)
+def refresh_user_active_cache(sender, instance, **kwargs):
+    """
+    Makes (de)activations visible to ``ClaimsJWTAuthentication`` right away on
+    this process instead of after the cache entry expires.
+    """
+    set_user_active(instance.pk, instance.is_active)
+
+
+# START: List cache invalidation
+@receiver(pre_save, sender=UserAccount)
+def remember_lawyer_account(sender, instance, **kwargs):
+    # A lawyer given another role leaves the lawyer list, so the stored
+    # role matters as much as the new one.
+    if not instance._state.adding:
+        dashboard.load_snapshot(instance)
+    instance._was_lawyer = \
+        dashboard.stored_value(instance, 'user_type') == UserAccount.Roles.LAWYER
+
+
+@receiver(post_save, sender=UserAccount)
+@receiver(post_delete, sender=UserAccount)
+def invalidate_lawyer_accounts(sender, instance, **kwargs):
+    if instance.user_type == UserAccount.Roles.LAWYER or \
+            instance.__dict__.pop('_was_lawyer', False):
+        bump_namespace("lawyer")
+
+
+@receiver(post_save, sender=Lawyer)
+@receiver(post_delete, sender=Lawyer)
+def invalidate_lawyers(sender, instance, **kwargs):
+    bump_namespace("lawyer")
+
+
+@receiver(post_save, sender=PreTrial)
+@receiver(post_delete, sender=PreTrial)
+def invalidate_pretrials(sender, instance, **kwargs):
+    bump_namespace(f"pretrial:{instance.user_id}")
+# END: List cache invalidation
+
+
+# START: Autocomplete index
+@receiver(post_save, sender=UserAccount)
+def index_user_name(sender, instance, update_fields=None, **kwargs):
+    # Logins save last_login only; don't rewrite the entries for those.
+    if update_fields is not None and not {'name', 'user_type'} & set(update_fields):
+        return
+    autocomplete.index_user(instance)
+
+
+@receiver(post_save, sender=Lawyer)
+def index_lawyer_enrollment_no(sender, instance, **kwargs):
+    autocomplete.index_lawyer(instance)
+
+
+@receiver(post_save, sender=Judge)
+def index_judge_bar_code(sender, instance, **kwargs):
+    autocomplete.index_judge(instance)
+
+
+@receiver(post_delete, sender=Lawyer)
+def unindex_lawyer(sender, instance, **kwargs):
+    autocomplete.unindex(AutocompleteEntry.Kinds.ENROLLMENT_NO, instance.pk)
+
+
+@receiver(post_delete, sender=Judge)
+def unindex_judge(sender, instance, **kwargs):
+    autocomplete.unindex(AutocompleteEntry.Kinds.BAR_CODE, instance.pk)
+# END: Autocomplete index
+
+
+# START: Calendar
+@receiver(post_save, sender=Hearing)
+def sync_hearing_calendar(sender, instance, **kwargs):
+    with sharding.on_shard(instance._state.db):
+        calendars.sync_hearings([instance.pk])
+
+
+@receiver(post_save, sender=PreTrial)
+def sync_pretrial_calendar(sender, instance, created=False, **kwargs):
+    if not created:
+        with sharding.on_shard(instance._state.db):
+            calendars.sync_pretrials([instance.pk])
+
+
+@receiver(post_delete, sender=Judge)
+def drop_judge_calendar(sender, instance, **kwargs):
+    # The hearings' judge is set to NULL without post_save signals; the
+    # judge's own entries have lost their judge_id the same way.
+    CalendarEntry.objects.filter(
+        user_id=instance.user_id, role=UserAccount.Roles.JUDGE, judge__isnull=True).delete()
+# END: Calendar
+
+
+# START: Judge load counters
+@receiver(post_delete, sender=PreTrial)
+def release_judge_case(sender, instance, **kwargs):
+    if instance.judge_id is not None:
+        adjust_load(cases={instance.judge_id: -1})
+
+
+@receiver(post_delete, sender=Hearing)
+def release_judge_hearing(sender, instance, **kwargs):
+    # The calendar entries go with the hearing (CASCADE), so sync_hearings
+    # never sees the deletion.
+    if instance.judge_id is not None and instance.scheduled_date >= timezone.localdate():
+        adjust_load(hearings={instance.judge_id: -1})
+# END: Judge load counters
+
+
+# START: Dashboard
+def _counted(sender, update_fields) -> bool:
+    return update_fields is None or bool(set(update_fields) & set(dashboard.SOURCES[sender]))
+
+
+@receiver(post_init, sender=UserAccount)
+@receiver(post_init, sender=Lawyer)
+@receiver(post_init, sender=PreTrial)
+@receiver(post_init, sender=Hearing)
+def snapshot_summary_fields(sender, instance, **kwargs):
+    dashboard.snapshot(instance)
+
+
+@receiver(pre_save, sender=UserAccount)
+@receiver(pre_save, sender=Lawyer)
+@receiver(pre_save, sender=PreTrial)
+@receiver(pre_save, sender=Hearing)
+def load_summary_fields(sender, instance, update_fields=None, **kwargs):
+    if not instance._state.adding and _counted(sender, update_fields):
+        dashboard.load_snapshot(instance)
+
+
+@receiver(post_save, sender=UserAccount)
+@receiver(post_save, sender=Lawyer)
+@receiver(post_save, sender=PreTrial)
+@receiver(post_save, sender=Hearing)
+def count_summary_fields(sender, instance, created=False, update_fields=None, **kwargs):
+    # Logins save last_login only; those move no counts.
+    if created or _counted(sender, update_fields):
+        dashboard.record([instance], created=created, names=update_fields)
+
+
+@receiver(post_delete, sender=UserAccount)
+@receiver(post_delete, sender=Lawyer)
+@receiver(post_delete, sender=PreTrial)
+@receiver(post_delete, sender=Hearing)
+def uncount_summary_fields(sender, instance, **kwargs):
+    dashboard.record([instance], deleted=True)
+# END: Dashboard
+
+
+# START: Change feed
+@receiver(post_delete, sender=Lawyer)
+def tombstone_lawyer(sender, instance, **kwargs):
+    sync.record_deletion('lawyer', instance)
+
+
+@receiver(post_delete, sender=PreTrial)
+def tombstone_pretrial(sender, instance, **kwargs):
+    sync.record_deletion('pretrial', instance)
+# END: Change feed
+
+
+# START: Sharding
+# Django cascades deletes on the database of the deleted row only; these
+# carry them over to the other shards.
+@receiver(pre_delete, sender=UserAccount)
+def delete_sharded_cases(sender, instance, **kwargs):
+    alias = sharding.shard_for(instance.pk)
+    if alias != instance._state.db:
+        PreTrial.objects.using(alias).filter(user_id=instance.pk).delete()
+
+
+@receiver(pre_delete, sender=Judge)
+def unassign_sharded_cases(sender, instance, **kwargs):
+    for alias in sharding.shards():
+        if alias != instance._state.db:
+            PreTrial.objects.using(alias).filter(judge_id=instance.pk).update(judge=None)
+            Hearing.objects.using(alias).filter(judge_id=instance.pk).update(judge=None)
+
+
+@receiver(post_delete, sender=Hearing)
+def drop_sharded_hearing_calendar(sender, instance, **kwargs):
+    if instance._state.db != sharding.DEFAULT:
+        CalendarEntry.objects.filter(hearing_id=instance.pk).delete()
+# END: Sharding
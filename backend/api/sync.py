@@ -0,0 +1,145 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Lawyer, PreTrial, Tombstone
+from .pagination import InvalidCursor
+from .projections import LawyerProjection, PreTrialProjection
+
+# Feed name -> (model, projection, owner field for per-user feeds or None).
+FEEDS = {
+    'lawyer': (Lawyer, LawyerProjection(), None),
+    'pretrial': (PreTrial, PreTrialProjection(), 'user_id'),
+}
+
+
+class WatermarkExpired(Exception):
+    """
+    Raised for watermarks older than the tombstones kept: deletions since
+    may have been pruned, so the client has to sync from scratch.
+    """
+
+
+# START: Watermarks
+def encode_watermark(changed, deleted) -> str:
+    """
+    Encodes the feed positions, ``(updated_at, id)`` of the last changed row
+    and ``(deleted_at, id)`` of the last tombstone delivered, as an opaque
+    urlsafe string.
+    """
+    payload = json.dumps({"c": changed, "d": deleted}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_watermark(watermark: str):
+    """
+    Returns the ``(changed, deleted)`` positions of ``watermark``.
+
+    Raises:
+        InvalidCursor: If the watermark is malformed.
+    """
+    try:
+        padded = watermark + "=" * (-len(watermark) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return tuple(
+            None if payload[key] is None
+            else (datetime.datetime.fromisoformat(payload[key][0]), int(payload[key][1]))
+            for key in ("c", "d"))
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError) as e:
+        raise InvalidCursor("Invalid watermark") from e
+
+
+def after_position(field, position):
+    # (field, id) > (moment, pk), with a leading range the index can seek to.
+    moment, pk = position
+    return Q(**{f"{field}__gte": moment}) & (Q(**{f"{field}__gt": moment}) | Q(id__gt=pk))
+# END: Watermarks
+
+
+def record_deletion(name, instance) -> None:
+    """
+    Writes the tombstone of ``instance``, a row of feed ``name``.
+    """
+    _, _, owner = FEEDS[name]
+    Tombstone.objects.create(
+        model=name, object_id=instance.pk,
+        user_id=getattr(instance, owner) if owner else None)
+
+
+def changes(name, user, since=None, limit=100) -> dict:
+    """
+    Returns what changed in feed ``name`` after the watermark ``since``.
+
+    Changed rows are read from the ``(updated_at, id)`` index and deletions
+    from the tombstones, at most ``limit`` of each. Rows written in the last
+    ``SYNC_SETTLE_SECONDS`` are left for the next call: their transaction may
+    still be open, and a later commit with an earlier ``updated_at`` would
+    otherwise fall behind the watermark. Without ``since`` the feed starts
+    from scratch with every row and no deletions.
+
+    Args:
+        name (str): One of ``FEEDS``.
+        user: The user syncing; per-user feeds are limited to their rows.
+        since (str, optional): The ``next`` watermark of a previous call.
+        limit (int): The maximum number of changed rows and of deletions.
+
+    Returns:
+        dict: ``changed`` (projected rows), ``deleted`` (ids), ``next`` (the
+        watermark to send next time) and ``has_more`` (call again now).
+
+    Raises:
+        ValueError: If ``name`` is not a known feed.
+        InvalidCursor: If ``since`` is malformed.
+        WatermarkExpired: If ``since`` predates the tombstones kept.
+    """
+    if name not in FEEDS:
+        raise ValueError(f"Unknown feed: {name}. Available: {', '.join(FEEDS)}")
+    model, projection, owner = FEEDS[name]
+    now = timezone.now()
+    horizon = now - datetime.timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+    # The base manager: Lawyer.objects joins the accounts to check their
+    # type, which keeps the (updated_at, id) index from ordering the scan.
+    rows = model._base_manager.filter(updated_at__lte=horizon)
+    tombstones = Tombstone.objects.filter(
+        model=name, user_id=user.id if owner else None, deleted_at__lte=horizon)
+    if owner:
+        rows = rows.filter(**{owner: user.id})
+
+    if since:
+        changed_at, deleted_at = decode_watermark(since)
+        expiry = now - datetime.timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+        if deleted_at is None or deleted_at[0] < expiry:
+            raise WatermarkExpired("Watermark expired, sync again from scratch")
+    else:
+        # A fresh client has nothing to delete yet.
+        changed_at, deleted_at = None, (horizon, 0)
+    if changed_at:
+        rows = rows.filter(after_position('updated_at', changed_at))
+    tombstones = tombstones.filter(after_position('deleted_at', deleted_at))
+
+    changed = list(projection.queryset(rows.order_by('updated_at', 'id'))[:limit + 1])
+    deleted = list(tombstones.order_by('deleted_at', 'id').values_list(
+        'deleted_at', 'id', 'object_id')[:limit + 1])
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    if changed:
+        changed_at = (changed[-1]['updated_at'], changed[-1]['id'])
+    if deleted:
+        deleted_at = deleted[-1][:2]
+    elif not has_more:
+        # Nothing is left to read up to the horizon, so the next call starts
+        # from it; this keeps idle clients' watermarks from expiring.
+        deleted_at = max(deleted_at, (horizon, 0))
+    return {
+        "changed": changed,
+        "deleted": [object_id for _, _, object_id in deleted],
+        "next": encode_watermark(changed_at, deleted_at),
+        "has_more": has_more,
+    }
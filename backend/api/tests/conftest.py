@@ -3,10 +3,42 @@ from api.models import (Judge,
                         Lawyer,
                         PreTrial,
                         UserAccount)
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     client = APIClient()
     return client
+
+
+@pytest.fixture
+def user(db):
+    return UserAccount.objects.create_user(
+        email="client@example.com", name="Client", password="s3cret-pass")
+
+
+@pytest.fixture
+def auth_client(api_client, user):
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+@pytest.fixture
+def make_lawyers(db):
+    def _make(count, lawyer_type=Lawyer.Roles.CIVIL):
+        lawyers = []
+        for i in range(count):
+            account = UserAccount.objects.create(
+                email=f"lawyer{lawyer_type}{i}@example.com", name=f"Lawyer {i}",
+                user_type=UserAccount.Roles.LAWYER)
+            lawyers.append(Lawyer.objects.create(
+                user=account, enrollment_no=f"D/{i}/2020", lawyer_type=lawyer_type))
+        return lawyers
+    return _make
@@ -0,0 +1,166 @@
+import datetime
+
+import pytest
+from api.assignment import (assign_backlog, assign_pretrial, fairness,
+                            refresh_judge_load)
+from api.models import Hearing, Judge, PreTrial, UserAccount
+from django.utils import timezone
+
+
+@pytest.fixture
+def judges(db):
+    def _make(count):
+        return [
+            Judge.objects.create(
+                user=UserAccount.objects.create(
+                    email=f"judge{i}@example.com", name=f"Judge {i}",
+                    user_type=UserAccount.Roles.JUDGE),
+                bar_code=f"BC-{i}")
+            for i in range(count)
+        ]
+    return _make
+
+
+def counters():
+    return {judge.pk: (judge.caseload, judge.hearing_load, judge.load)
+            for judge in Judge.objects.all()}
+
+
+def upcoming(days=1):
+    return timezone.localdate() + datetime.timedelta(days=days)
+
+
+def test_fairness():
+    assert fairness([4, 4, 4])["jain"] == 1.0
+    assert fairness([4, 4, 4])["cv"] == 0.0
+    skewed = fairness([9, 0, 0])
+    assert skewed["jain"] == pytest.approx(1 / 3, abs=1e-3)
+    assert skewed["max_over_mean"] == 3.0
+
+
+@pytest.mark.django_db
+def test_counters_follow_assignments_and_hearings(user, judges):
+    first, second = judges(2)
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+
+    assert assign_pretrial(pretrial.pk) == first.pk
+    assert counters()[first.pk] == (1, 0, 2)
+
+    hearing = Hearing.objects.create(
+        pretrial=pretrial, judge=first, scheduled_date=upcoming(),
+        scheduled_time=datetime.time(10))
+    Hearing.objects.create(
+        pretrial=pretrial, judge=first, scheduled_date=upcoming(-3),
+        scheduled_time=datetime.time(10))
+    assert counters()[first.pk] == (1, 1, 3)
+
+    hearing.judge = second
+    hearing.save()
+    assert counters() == {first.pk: (1, 0, 2), second.pk: (0, 1, 1)}
+
+    # The least loaded judge takes over on reassignment.
+    assert assign_pretrial(pretrial.pk, reassign=True) == second.pk
+    assert counters() == {first.pk: (0, 0, 0), second.pk: (1, 1, 3)}
+
+    pretrial.refresh_from_db()
+    pretrial.delete()
+    assert counters() == {first.pk: (0, 0, 0), second.pk: (0, 0, 0)}
+
+
+@pytest.mark.django_db
+def test_assign_pretrial_does_not_count(user, judges, django_assert_max_num_queries):
+    judges(50)
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+
+    # Read the pre-trial, pick the judge, lock, update, one counter update,
+    # and two savepoints with their releases.
+    with django_assert_max_num_queries(9) as captured:
+        judge_id = assign_pretrial(pretrial.pk)
+    assert not any("COUNT(" in query["sql"] for query in captured.captured_queries)
+    assert judge_id == Judge.objects.order_by('id').first().pk
+    assert assign_pretrial(pretrial.pk) == judge_id
+
+
+@pytest.mark.django_db
+def test_assign_backlog_balances_loads(user, judges):
+    judges(4)
+    pretrials = PreTrial.objects.bulk_create(
+        [PreTrial(user=user, case_act=f"Case {i}") for i in range(20)])
+    Hearing.objects.bulk_create([
+        Hearing(pretrial=pretrial, scheduled_date=upcoming(),
+                scheduled_time=datetime.time(10))
+        for pretrial in pretrials[:6] for _ in range(3)
+    ])
+
+    result = assign_backlog()
+
+    assert result["assigned"] == 20
+    assert not PreTrial.objects.filter(judge__isnull=True).exists()
+    # 20 cases of weight 2 across four judges; the hearings keep no judge.
+    assert result["after"]["max"] - result["after"]["min"] <= 2
+    assert result["after"]["jain"] > 0.95
+    assert sum(caseload for caseload, _, _ in counters().values()) == 20
+
+
+@pytest.mark.django_db
+def test_assign_backlog_balances_the_stored_counters(user, judges):
+    judges(2)
+    pretrials = PreTrial.objects.bulk_create(
+        [PreTrial(user=user, case_act=f"Case {i}") for i in range(4)])
+    # Hearings of unassigned pre-trials have no judge, so they load no one.
+    Hearing.objects.bulk_create([
+        Hearing(pretrial=pretrials[0], scheduled_date=upcoming(days),
+                scheduled_time=datetime.time(10))
+        for days in range(1, 5)])
+
+    result = assign_backlog()
+
+    stored = counters()
+    assert [caseload for caseload, _, _ in stored.values()] == [2, 2]
+    assert result["after"] == fairness(load for _, _, load in stored.values())
+    assert result["after"]["max"] == result["after"]["min"]
+    Judge.objects.update(caseload=0, hearing_load=0, load=0)
+    refresh_judge_load()
+    assert counters() == stored
+
+
+@pytest.mark.django_db
+def test_refresh_matches_incremental_counters(user, judges):
+    first, second = judges(2)
+    for i in range(5):
+        pretrial = PreTrial.objects.create(user=user, case_act=f"Case {i}")
+        assign_pretrial(pretrial.pk)
+        Hearing.objects.create(
+            pretrial=pretrial, judge=[first, second][i % 2], scheduled_date=upcoming(i),
+            scheduled_time=datetime.time(10))
+    incremental = counters()
+
+    Judge.objects.update(caseload=0, hearing_load=0, load=0)
+    assert refresh_judge_load() == 2
+    assert counters() == incremental
+
+
+@pytest.mark.django_db
+def test_assignment_endpoints_need_staff(auth_client, api_client, user, judges):
+    first, _ = judges(2)
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+
+    assert auth_client.post(f"/api/v1/pretrial/{pretrial.pk}/assign/").status_code == 403
+    assert auth_client.get("/api/v1/judges/load/").status_code == 403
+
+    # Anyone can register as a judge; judges see the loads but assign nothing.
+    api_client.force_authenticate(user=first.user)
+    assert api_client.post(f"/api/v1/pretrial/{pretrial.pk}/assign/").status_code == 403
+    assert api_client.post("/api/v1/pretrial/assign/", {}, format="json").status_code == 403
+    assert api_client.get("/api/v1/judges/load/").status_code == 200
+
+    user.is_staff = True
+    user.save()
+    auth_client.force_authenticate(user=user)
+    response = auth_client.post("/api/v1/pretrial/assign/", {}, format="json")
+    assert response.status_code == 200
+    assert response.data["assigned"] == 1
+
+    loads = auth_client.get("/api/v1/judges/load/")
+    assert [row["load"] for row in loads.data["results"]] == [0, 2]
+    assert loads.data["fairness"]["judges"] == 2
@@ -0,0 +1,81 @@
+import datetime
+import json
+
+import pytest
+from api.models import Document, Hearing, PreTrial
+from api.views import _get_tokens_for_user
+from django.core.cache import cache
+
+
+@pytest.fixture
+def bearer(api_client, user):
+    access = _get_tokens_for_user(user)["access"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return api_client
+
+
+@pytest.fixture
+def cases(user):
+    for i in range(3):
+        pretrial = PreTrial.objects.create(
+            user=user, case_act=f"IPC 42{i}", details="Cheating and fraud",
+            date_registered=datetime.date(2023, 6, 1 + i))
+        hearing = Hearing.objects.create(
+            pretrial=pretrial, scheduled_date=datetime.date(2023, 7, 1 + i),
+            scheduled_time=datetime.time(10))
+        Document.objects.create(hearing=hearing, name="Exhibit", document_no=f"D-{i}",
+                                file=f"documents/{i}.pdf")
+    return list(PreTrial.objects.order_by('id'))
+
+
+def body(client, url, params=None):
+    cache.clear()
+    response = client.get(url, params or {})
+    return response.status_code, json.loads(response.content)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path, params", [
+    ("list/pretrial/", {}),
+    ("list/pretrial/", {"pagination": "cursor", "page_size": 2, "fields": "case_act"}),
+    ("list/lawyer/", {"lawyer_type": "CIVIL"}),
+    ("search/pretrial/", {"q": "fraud", "page_size": 2}),
+    ("search/pretrial/", {}),
+    ("casefile/", {"depth": 1}),
+    ("casefile/", {"ids": "1,3", "hearings_limit": 1}),
+])
+def test_async_endpoints_match_their_sync_versions(bearer, cases, make_lawyers, path, params):
+    make_lawyers(3)
+    assert body(bearer, f"/api/v1/async/{path}", params) == body(bearer, f"/api/v1/{path}", params)
+
+
+@pytest.mark.django_db
+def test_async_case_file(bearer, cases):
+    status, data = body(bearer, f"/api/v1/async/casefile/{cases[0].pk}/")
+    assert status == 200
+    assert data["hearings"][0]["documents"][0]["file"] == "documents/0.pdf"
+    assert body(bearer, f"/api/v1/casefile/{cases[0].pk}/") == (status, data)
+
+    assert body(bearer, "/api/v1/async/casefile/999/")[0] == 404
+
+
+@pytest.mark.django_db
+def test_async_list_shares_cache_and_etags(bearer, cases):
+    first = bearer.get("/api/v1/list/pretrial/")
+    second = bearer.get("/api/v1/async/list/pretrial/")
+    assert second["X-Cache"] == "HIT"
+    assert second["ETag"] == first["ETag"]
+
+    not_modified = bearer.get(
+        "/api/v1/async/list/pretrial/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.django_db
+def test_async_endpoints_require_a_token(api_client):
+    response = api_client.get("/api/v1/async/list/pretrial/")
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"].startswith("Bearer")
+
+    api_client.credentials(HTTP_AUTHORIZATION="Bearer nonsense")
+    assert api_client.get("/api/v1/async/list/pretrial/").status_code == 401
@@ -0,0 +1,84 @@
+import pytest
+from api.authentication import ClaimsUser
+from api.models import Lawyer, PreTrial, UserAccount
+from api.permissions import IsClient, IsLawyer
+from api.views import _get_tokens_for_user
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.fixture
+def lawyer(make_lawyers):
+    return make_lawyers(1)[0]
+
+
+def _bearer(api_client, user):
+    access = _get_tokens_for_user(user)["access"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return access
+
+
+@pytest.mark.django_db
+def test_access_token_carries_role_claims(lawyer):
+    token = AccessToken(_get_tokens_for_user(lawyer.user)["access"])
+
+    assert token["user_type"] == UserAccount.Roles.LAWYER
+    assert token["lawyer_id"] == lawyer.id
+    assert token["judge_id"] is None
+    assert token["is_active"] is True
+
+
+@pytest.mark.django_db
+def test_list_endpoint_needs_no_user_query(api_client, user, django_assert_num_queries):
+    _bearer(api_client, user)
+    api_client.get("/api/v1/list/pretrial/", {"pagination": "cursor"})
+
+    # Warm token caches, cold response cache: only the ETag aggregate and the
+    # page itself are queried, no UserAccount lookup.
+    with django_assert_num_queries(2):
+        response = api_client.get(
+            "/api/v1/list/pretrial/", {"pagination": "cursor", "page_size": 5})
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected(api_client, user):
+    _bearer(api_client, user)
+    user.is_active = False
+    user.save()
+
+    assert api_client.get("/api/v1/list/pretrial/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_role_permissions_use_claims(lawyer):
+    request = APIRequestFactory().get("/")
+    request.user = ClaimsUser(AccessToken(_get_tokens_for_user(lawyer.user)["access"]))
+
+    assert IsLawyer().has_permission(request, None)
+    assert not IsClient().has_permission(request, None)
+
+
+@pytest.mark.django_db
+def test_lawyer_registration_reissues_tokens_with_new_role(api_client, user):
+    _bearer(api_client, user)
+    response = api_client.post(
+        "/api/v1/register/lawyer/", {"enrollment_no": "D/1/2020"}, format="json")
+
+    assert response.status_code == 201
+    token = AccessToken(response.json()["access"])
+    assert token["user_type"] == UserAccount.Roles.LAWYER
+    assert token["lawyer_id"] == Lawyer.objects.get(user=user).id
+
+
+@pytest.mark.django_db
+def test_write_endpoints_check_the_current_role(api_client, user):
+    PreTrial.objects.create(user=user, case_act="IPC 420")
+    UserAccount.objects.filter(pk=user.pk).update(is_staff=True)
+    user.refresh_from_db()
+    _bearer(api_client, user)
+
+    # The token still claims staff after the account lost it.
+    UserAccount.objects.filter(pk=user.pk).update(is_staff=False)
+    response = api_client.post("/api/v1/pretrial/assign/", {}, format="json")
+    assert response.status_code == 403
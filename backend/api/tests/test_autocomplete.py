@@ -0,0 +1,85 @@
+import pytest
+from api.autocomplete import compact, rebuild_index, suggest, words
+from api.models import AutocompleteEntry, Judge, Lawyer, UserAccount
+
+URL = "/api/v1/autocomplete/"
+
+
+def test_normalization():
+    assert words("Rahul K. Sharma") == ["rahul", "k", "sharma"]
+    assert compact("D/1234-2020") == "d12342020"
+
+
+@pytest.fixture
+def people(db):
+    lawyer_user = UserAccount.objects.create(
+        email="rs@example.com", name="Rahul Sharma", user_type=UserAccount.Roles.LAWYER)
+    lawyer = Lawyer.objects.create(user=lawyer_user, enrollment_no="D/1234/2020")
+    judge_user = UserAccount.objects.create(
+        email="ss@example.com", name="Sunita Shah", user_type=UserAccount.Roles.JUDGE)
+    judge = Judge.objects.create(user=judge_user, bar_code="BC-77")
+    return lawyer, judge
+
+
+def labels(results):
+    return [result["label"] for result in results]
+
+
+def test_names_match_word_prefixes_in_any_order(people):
+    assert labels(suggest("sh", kinds=["name"])) == ["Sunita Shah", "Rahul Sharma"]
+    assert labels(suggest("sharma ra", kinds=["name"])) == ["Rahul Sharma"]
+    assert labels(suggest("sh", kinds=["name"], user_type="JUDGE")) == ["Sunita Shah"]
+
+
+def test_codes_match_regardless_of_separators(people):
+    lawyer, judge = people
+    [result] = suggest("d/12", kinds=["enrollment_no"])
+    assert result == {"kind": "enrollment_no", "label": "D/1234/2020", "id": lawyer.pk,
+                      "user": lawyer.user_id, "user_type": "LAWYER"}
+    assert labels(suggest("bc7")) == ["BC-77"]
+
+
+def test_index_follows_profile_changes(people):
+    lawyer, judge = people
+    lawyer.user.name = "Rahul Verma"
+    lawyer.user.save()
+    assert labels(suggest("sharma")) == []
+    assert labels(suggest("verma")) == ["Rahul Verma"]
+
+    judge.delete()
+    assert suggest("bc") == []
+
+
+def test_last_login_updates_do_not_reindex(people, django_assert_num_queries):
+    lawyer, _ = people
+    with django_assert_num_queries(1):
+        lawyer.user.save(update_fields=["last_login"])
+
+
+def test_rebuild_matches_incremental_index(people):
+    def snapshot():
+        return sorted(AutocompleteEntry.objects.values_list(
+            "kind", "term", "label", "user_id", "user_type", "object_id"))
+    before = snapshot()
+    assert rebuild_index(batch_size=2) == len(before)
+    assert snapshot() == before
+
+
+def test_endpoint_reads_the_index_only(auth_client, people, django_assert_num_queries):
+    # One range scan for names and one for codes.
+    with django_assert_num_queries(2):
+        response = auth_client.get(URL, {"q": "rah", "limit": 5})
+    assert response.status_code == 200
+    assert labels(response.data["results"]) == ["Rahul Sharma"]
+
+    assert auth_client.get(URL, {"q": "rah", "kind": "email"}).status_code == 400
+
+
+def test_endpoint_lists_clients_to_staff_only(auth_client, user, people):
+    # ``user`` is the client calling the endpoint.
+    assert labels(auth_client.get(URL, {"q": "cli"}).data["results"]) == []
+    assert labels(suggest("cli")) == ["Client"]
+
+    user.is_staff = True
+    user.save()
+    assert labels(auth_client.get(URL, {"q": "cli"}).data["results"]) == ["Client"]
@@ -0,0 +1,230 @@
+import datetime
+
+import pytest
+from api.models import CalendarEntry, Hearing, Judge, PreTrial, UserAccount
+
+PRETRIALS = "/api/v1/bulk/pretrial/"
+HEARINGS = "/api/v1/bulk/hearing/"
+
+
+@pytest.mark.django_db
+def test_bulk_create_pretrials_for_the_requesting_user(auth_client, user):
+    response = auth_client.post(PRETRIALS, [
+        {"case_act": "IPC 420", "details": "Cheating"},
+        {"case_act": "IPC 302", "date_registered": "2023-05-01"},
+    ], format="json")
+    assert response.status_code == 201
+    ids = response.data["created"]
+    assert list(PreTrial.objects.filter(user=user).order_by("id").values_list(
+        "id", "case_act")) == [(ids[0], "IPC 420"), (ids[1], "IPC 302")]
+
+
+@pytest.mark.django_db
+def test_bulk_create_hearings_validates_in_one_pass(auth_client, user, django_assert_num_queries):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    days = [day for day in range(1, 31) if datetime.date(2023, 6, day).weekday() < 5]
+    items = [{"pretrial": pretrial.pk, "scheduled_date": f"2023-06-{day:02d}",
+              "scheduled_time": "10:30"} for day in days]
+
+    # Reference check, savepoint, INSERT, dashboard counts (savepoint,
+    # INSERT, one UPDATE per distinct delta, release), calendar sync
+    # (savepoint, judge entries, DELETE, SELECT, INSERT, release), release.
+    with django_assert_num_queries(15):
+        response = auth_client.post(HEARINGS, items, format="json")
+    assert response.status_code == 201
+    assert Hearing.objects.filter(pretrial=pretrial).count() == len(days)
+
+
+@pytest.mark.django_db
+def test_bulk_write_reports_every_invalid_item_and_writes_nothing(auth_client, user):
+    other = UserAccount.objects.create_user(email="o@example.com", name="O", password="x")
+    own = PreTrial.objects.create(user=user, case_act="IPC 420")
+    foreign = PreTrial.objects.create(user=other, case_act="IPC 302")
+
+    response = auth_client.post(HEARINGS, [
+        {"pretrial": own.pk, "scheduled_date": "2023-06-01", "scheduled_time": "10:00"},
+        {"pretrial": foreign.pk, "scheduled_date": "2023-06-01", "scheduled_time": "10:00"},
+        {"pretrial": own.pk, "scheduled_date": "not a date", "scheduled_time": "10:00"},
+    ], format="json")
+    assert response.status_code == 400
+    assert [error["index"] for error in response.data["errors"]] == [1, 2]
+    assert "pretrial" in response.data["errors"][0]["errors"]
+    assert "scheduled_date" in response.data["errors"][1]["errors"]
+    assert not Hearing.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_update_hearings(auth_client, user):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    hearings = Hearing.objects.bulk_create([
+        Hearing(pretrial=pretrial, scheduled_date=datetime.date(2023, 6, day),
+                scheduled_time=datetime.time(10))
+        for day in (1, 2)])
+    before = Hearing.objects.get(pk=hearings[0].pk).updated_at
+
+    response = auth_client.patch(HEARINGS, [
+        {"id": hearings[0].pk, "motion_granted": True},
+        {"id": hearings[1].pk, "scheduled_date": "2023-07-03"},
+    ], format="json")
+    assert response.status_code == 200
+    assert response.data == {"updated": 2}
+
+    first, second = Hearing.objects.order_by("id")
+    assert first.motion_granted and first.scheduled_date == datetime.date(2023, 6, 1)
+    assert first.updated_at > before
+    assert second.scheduled_date == datetime.date(2023, 7, 3) and not second.motion_granted
+
+    missing = auth_client.patch(HEARINGS, [{"motion_granted": True}, {"id": 999}], format="json")
+    assert missing.status_code == 400
+    assert [error["index"] for error in missing.data["errors"]] == [0]
+
+
+@pytest.mark.django_db
+def test_bulk_update_invalidates_cached_listing(auth_client, user):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    assert auth_client.get("/api/v1/list/pretrial/")["X-Cache"] == "MISS"
+
+    auth_client.patch(PRETRIALS, [{"id": pretrial.pk, "case_act": "IPC 406"}], format="json")
+    response = auth_client.get("/api/v1/list/pretrial/")
+    assert response["X-Cache"] == "MISS"
+    assert response.data["filtered_pretrials"][0]["fields"]["case_act"] == "IPC 406"
+
+
+@pytest.mark.django_db
+def test_bulk_update_with_shared_values_is_one_update(auth_client, user, django_assert_num_queries):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    hearings = Hearing.objects.bulk_create([
+        Hearing(pretrial=pretrial, scheduled_date=datetime.date(2023, 6, day),
+                scheduled_time=datetime.time(10))
+        for day in range(1, 21)])
+
+    # Lookup, savepoint, UPDATE, dashboard counts (4), calendar sync (6),
+    # release.
+    with django_assert_num_queries(14):
+        response = auth_client.patch(HEARINGS, [
+            {"id": hearing.pk, "motion_granted": True} for hearing in hearings], format="json")
+    assert response.data == {"updated": 20}
+    assert Hearing.objects.filter(motion_granted=True).count() == 20
+
+
+@pytest.mark.django_db
+def test_judges_bulk_write_only_hearings_assigned_to_them(api_client, user):
+    account = UserAccount.objects.create(
+        email="judge@example.com", name="Judge", user_type=UserAccount.Roles.JUDGE)
+    judge = Judge.objects.create(user=account, bar_code="BC-1")
+    assigned = PreTrial.objects.create(user=user, case_act="IPC 420", judge=judge)
+    unassigned = PreTrial.objects.create(user=user, case_act="IPC 302")
+    api_client.force_authenticate(user=account)
+
+    response = api_client.post(HEARINGS, [
+        {"pretrial": assigned.pk, "scheduled_date": "2023-06-01", "scheduled_time": "10:00"},
+        {"pretrial": unassigned.pk, "scheduled_date": "2023-06-01", "scheduled_time": "11:00"},
+    ], format="json")
+    assert response.status_code == 400
+    assert [error["index"] for error in response.data["errors"]] == [1]
+
+    hearing = Hearing.objects.create(
+        pretrial=unassigned, scheduled_date=datetime.date(2023, 6, 1),
+        scheduled_time=datetime.time(10))
+    response = api_client.patch(HEARINGS, [{"id": hearing.pk, "motion_granted": True}],
+                                format="json")
+    assert response.status_code == 400
+
+    response = api_client.post(HEARINGS, [
+        {"pretrial": assigned.pk, "scheduled_date": "2023-06-01", "scheduled_time": "10:00"},
+    ], format="json")
+    assert response.status_code == 201
+
+
+@pytest.mark.django_db
+def test_bulk_update_refuses_double_bookings(auth_client, user):
+    judge = Judge.objects.create(
+        user=UserAccount.objects.create(
+            email="judge@example.com", name="Judge", user_type=UserAccount.Roles.JUDGE),
+        bar_code="BC-1")
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    first, second = Hearing.objects.bulk_create([
+        Hearing(pretrial=pretrial, judge=judge, scheduled_date=datetime.date(2023, 6, 5),
+                scheduled_time=datetime.time(hour))
+        for hour in (10, 11)])
+
+    response = auth_client.patch(HEARINGS, [
+        {"id": first.pk, "motion_granted": True},
+        {"id": second.pk, "scheduled_time": "10:15"},
+    ], format="json")
+    assert response.status_code == 400
+    assert [error["index"] for error in response.data["errors"]] == [1]
+    assert not Hearing.objects.get(pk=first.pk).motion_granted
+
+    # Hearings may trade slots within one write.
+    response = auth_client.patch(HEARINGS, [
+        {"id": first.pk, "scheduled_time": "11:00"},
+        {"id": second.pk, "scheduled_time": "10:00"},
+    ], format="json")
+    assert response.status_code == 200
+    assert Hearing.objects.get(pk=second.pk).scheduled_time == datetime.time(10)
+
+
+@pytest.mark.django_db
+def test_bulk_update_keeps_hearings_within_court_hours(auth_client, user):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    hearing = Hearing.objects.create(
+        pretrial=pretrial, scheduled_date=datetime.date(2023, 6, 5),
+        scheduled_time=datetime.time(10))
+
+    # 2023-06-04 is a Sunday.
+    response = auth_client.patch(HEARINGS, [
+        {"id": hearing.pk, "scheduled_date": "2023-06-04"},
+    ], format="json")
+    assert response.status_code == 400
+    assert "scheduled_time" in response.data["errors"][0]["errors"]
+    response = auth_client.patch(HEARINGS, [{"id": hearing.pk, "scheduled_time": "20:00"}],
+                                 format="json")
+    assert response.status_code == 400
+    assert Hearing.objects.get(pk=hearing.pk).scheduled_date == datetime.date(2023, 6, 5)
+
+
+@pytest.mark.django_db
+def test_bulk_create_books_judges_and_courtrooms(auth_client, user):
+    judge = Judge.objects.create(
+        user=UserAccount.objects.create(
+            email="judge@example.com", name="Judge", user_type=UserAccount.Roles.JUDGE),
+        bar_code="BC-1")
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    Hearing.objects.create(
+        pretrial=pretrial, judge=judge, courtroom="1", scheduled_date=datetime.date(2023, 6, 5),
+        scheduled_time=datetime.time(10))
+
+    def item(time, **fields):
+        return {"pretrial": pretrial.pk, "scheduled_date": "2023-06-05",
+                "scheduled_time": time, **fields}
+
+    response = auth_client.post(HEARINGS, [item("11:00", judge=judge.pk)], format="json")
+    assert response.status_code == 400
+    assert "judge" in response.data["errors"][0]["errors"]
+
+    user.is_staff = True
+    user.save()
+    response = auth_client.post(HEARINGS, [
+        item("11:00", judge=999),
+        item("10:15", courtroom="1"),
+        item("11:00", judge=judge.pk, duration=60),
+        item("11:30", courtroom="2", judge=judge.pk),
+    ], format="json")
+    assert response.status_code == 400
+    assert [error["index"] for error in response.data["errors"]] == [0]
+    response = auth_client.post(HEARINGS, [
+        item("10:15", courtroom="1"),
+        item("11:00", judge=judge.pk, duration=60),
+        item("11:30", courtroom="2", judge=judge.pk),
+    ], format="json")
+    assert response.status_code == 400
+    assert [error["index"] for error in response.data["errors"]] == [0, 2]
+
+    response = auth_client.post(HEARINGS, [
+        item("11:00", judge=judge.pk, courtroom="1", duration=60)], format="json")
+    assert response.status_code == 201
+    hearing = Hearing.objects.get(pk=response.data["created"][0])
+    assert (hearing.judge_id, hearing.courtroom, hearing.duration) == (judge.pk, "1", 60)
+    assert CalendarEntry.objects.filter(
+        hearing_id=hearing.pk, role=UserAccount.Roles.JUDGE).exists()
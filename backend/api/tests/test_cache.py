@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+from api.cache import bump_namespace, namespace_version, single_flight
+from api.models import PreTrial, UserAccount
+from django.core.cache import cache, caches
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+def test_lawyer_list_is_cached_until_a_lawyer_changes(auth_client, make_lawyers):
+    lawyer = make_lawyers(2)[0]
+    url = "/api/v1/list/lawyer/"
+
+    first = auth_client.get(url, {"pagination": "cursor"})
+    assert first["X-Cache"] == "MISS"
+    assert auth_client.get(url, {"pagination": "cursor"})["X-Cache"] == "HIT"
+
+    lawyer.chamber_address = "Court No. 4"
+    lawyer.save()
+    refreshed = auth_client.get(url, {"pagination": "cursor"})
+    assert refreshed["X-Cache"] == "MISS"
+    assert "Court No. 4" in [row["chamber_address"] for row in refreshed.json()["results"]]
+
+
+@pytest.mark.django_db
+def test_lawyer_list_drops_a_lawyer_given_another_role(auth_client, make_lawyers):
+    lawyer = make_lawyers(1)[0]
+    url = "/api/v1/list/lawyer/"
+    etag = auth_client.get(url, {"pagination": "cursor"})["ETag"]
+
+    account = UserAccount.objects.get(pk=lawyer.user_id)
+    account.user_type = UserAccount.Roles.JUDGE
+    account.save()
+    response = auth_client.get(url, {"pagination": "cursor"}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["results"] == []
+
+
+@pytest.mark.django_db
+def test_query_parameter_order_does_not_matter(auth_client, make_lawyers):
+    make_lawyers(1)
+    url = "/api/v1/list/lawyer/"
+    auth_client.get(f"{url}?pagination=cursor&page_size=5")
+    assert auth_client.get(f"{url}?page_size=5&pagination=cursor")["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_pretrial_cache_is_scoped_per_user(auth_client, user, django_user_model):
+    other = django_user_model.objects.create_user(
+        email="other@example.com", name="Other", password="pass")
+    PreTrial.objects.create(user=other, case_act="IPC 420")
+    url = "/api/v1/list/pretrial/"
+    auth_client.get(url)
+
+    other_version = namespace_version(f"pretrial:{user.id}")
+    PreTrial.objects.create(user=other, case_act="IPC 302")
+    assert namespace_version(f"pretrial:{user.id}") == other_version
+    assert auth_client.get(url)["X-Cache"] == "HIT"
+
+    PreTrial.objects.create(user=user, case_act="IPC 302")
+    response = auth_client.get(url)
+    assert response["X-Cache"] == "MISS"
+    assert len(response.json()["filtered_pretrials"]) == 1
+
+
+@pytest.mark.django_db
+def test_errors_are_not_cached(auth_client):
+    url = "/api/v1/list/lawyer/"
+    assert auth_client.get(url, {"cursor": "garbage"}).status_code == 400
+    assert auth_client.get(url, {"cursor": "garbage"}).status_code == 400
+
+
+def test_bump_namespace_survives_eviction():
+    version = namespace_version("evicted")
+    cache.delete("api:ns:evicted")
+    bump_namespace("evicted")
+    assert namespace_version("evicted") > version
+
+
+@override_settings(LIST_CACHE_LOCK_TIMEOUT=5)
+def test_single_flight_computes_once_for_concurrent_misses():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "value", True
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(single_flight("sf", compute, 60)))
+    leader.start()
+    started.wait(2)
+    followers = [threading.Thread(
+        target=lambda: results.append(single_flight("sf", compute, 60)))
+        for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("value", False)] + [("value", True)] * 3
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": "/tmp/nibtara-test-cache"}})
+def test_namespaces_work_with_file_cache():
+    caches["default"].clear()
+    version = namespace_version("file")
+    bump_namespace("file")
+    assert namespace_version("file") == version + 1
@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from api.calendars import rebuild_calendar
+from api.models import CalendarEntry, Hearing, Judge, PreTrial, UserAccount
+from api.scheduling import reschedule_judge
+from django.core.management import call_command
+
+MONDAY = datetime.date(2023, 6, 5)
+
+
+@pytest.fixture
+def judge(db):
+    account = UserAccount.objects.create(
+        email="judge@example.com", name="Judge", user_type=UserAccount.Roles.JUDGE)
+    return Judge.objects.create(user=account, bar_code="BC-1")
+
+
+@pytest.fixture
+def hearings(user, judge):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    return [
+        Hearing.objects.create(pretrial=pretrial, judge=judge, courtroom="1",
+                               scheduled_date=MONDAY + datetime.timedelta(days=day),
+                               scheduled_time=datetime.time(hour))
+        for day, hour in [(0, 11), (0, 10), (1, 10), (9, 10)]]
+
+
+def snapshot():
+    return sorted(CalendarEntry.objects.values_list(
+        "user_id", "role", "hearing_id", "judge_id", "date", "time", "case_act"))
+
+
+@pytest.mark.django_db
+def test_calendar_range_is_one_query(auth_client, hearings, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = auth_client.get("/api/v1/calendar/", {"from": str(MONDAY),
+                                                         "to": str(MONDAY + datetime.timedelta(days=6))})
+    assert response.status_code == 200
+    assert [(e["date"].day, e["time"].hour) for e in response.data["results"]] == [
+        (5, 10), (5, 11), (6, 10)]
+    assert response.data["results"][0]["role"] == UserAccount.Roles.CLIENT
+
+    assert auth_client.get("/api/v1/calendar/", {"from": "2023-01-01", "to": "2024-01-01"}
+                           ).status_code == 400
+
+
+@pytest.mark.django_db
+def test_cause_list(auth_client, judge, hearings, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = auth_client.get(f"/api/v1/judge/{judge.pk}/cause-list/", {"date": str(MONDAY)})
+    assert [entry["hearing"] for entry in response.data["results"]] == [
+        hearings[1].pk, hearings[0].pk]
+    assert response.data["results"][0]["case_act"] == "IPC 420"
+
+
+@pytest.mark.django_db
+def test_calendar_follows_changes(user, judge, hearings):
+    hearing = hearings[0]
+    hearing.scheduled_date = MONDAY + datetime.timedelta(days=2)
+    hearing.save()
+    assert set(CalendarEntry.objects.filter(hearing=hearing).values_list(
+        "date", flat=True)) == {hearing.scheduled_date}
+
+    pretrial = hearing.pretrial
+    pretrial.case_act = "IPC 406"
+    pretrial.save()
+    assert set(CalendarEntry.objects.values_list("case_act", flat=True)) == {"IPC 406"}
+
+    hearings[3].delete()
+    assert not CalendarEntry.objects.filter(hearing_id=hearings[3].pk).exists()
+
+    judge.delete()
+    assert set(CalendarEntry.objects.values_list("role", "judge_id")) == {
+        (UserAccount.Roles.CLIENT, None)}
+
+
+@pytest.mark.django_db
+def test_bulk_writes_and_reschedules_update_the_calendar(auth_client, judge, hearings):
+    auth_client.patch("/api/v1/bulk/hearing/", [
+        {"id": hearings[2].pk, "scheduled_date": "2023-06-08"}], format="json")
+    assert set(CalendarEntry.objects.filter(hearing=hearings[2]).values_list(
+        "date", flat=True)) == {datetime.date(2023, 6, 8)}
+
+    last = MONDAY + datetime.timedelta(days=9)
+    [move] = reschedule_judge(judge.pk, last, last)
+    assert set(CalendarEntry.objects.filter(hearing=hearings[3]).values_list(
+        "date", flat=True)) == {move["scheduled_date"]} != {last}
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental_calendar(hearings):
+    before = snapshot()
+    assert len(before) == 8
+    assert rebuild_calendar(batch_size=3) == 8
+    assert snapshot() == before
+
+    CalendarEntry.objects.all().delete()
+    call_command("rebuild_calendar", stdout=None)
+    assert snapshot() == before
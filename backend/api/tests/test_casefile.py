@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+from api.models import Document, Hearing, PreTrial
+
+URL = "/api/v1/casefile/"
+
+
+def make_case(user, hearings, documents=2):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420", details="Cheating")
+    for day in range(hearings):
+        hearing = Hearing.objects.create(
+            pretrial=pretrial, scheduled_date=datetime.date(2023, 1, 1 + day))
+        Document.objects.bulk_create([
+            Document(hearing=hearing, name=f"Exhibit {i}", document_no=f"{day}-{i}",
+                     file=f"documents/{day}-{i}.pdf")
+            for i in range(documents)])
+    return pretrial
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("hearings", [1, 5, 20])
+def test_query_count_does_not_grow_with_hearings(auth_client, user, hearings,
+                                                 django_assert_num_queries):
+    for _ in range(3):
+        make_case(user, hearings)
+
+    with django_assert_num_queries(3):
+        response = auth_client.get(URL)
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 3
+    assert all(len(case["hearings"]) == hearings for case in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_single_case_file_tree(auth_client, user):
+    pretrial = make_case(user, hearings=2)
+    response = auth_client.get(f"{URL}{pretrial.pk}/")
+    assert response.status_code == 200
+    assert response.data["case_act"] == "IPC 420"
+    first = response.data["hearings"][0]
+    assert first["pretrial"] == pretrial.pk
+    assert first["scheduled_date"] == datetime.date(2023, 1, 1)
+    assert [doc["file"] for doc in first["documents"]] == [
+        "documents/0-0.pdf", "documents/0-1.pdf"]
+
+
+@pytest.mark.django_db
+def test_depth_and_limits(auth_client, user, django_assert_num_queries):
+    pretrial = make_case(user, hearings=4, documents=3)
+
+    with django_assert_num_queries(1):
+        shallow = auth_client.get(f"{URL}{pretrial.pk}/", {"depth": 0})
+    assert "hearings" not in shallow.data
+
+    limited = auth_client.get(URL, {"ids": str(pretrial.pk), "depth": 2,
+                                    "hearings_limit": 2, "documents_limit": 1})
+    [case] = limited.data["results"]
+    assert [h["scheduled_date"].day for h in case["hearings"]] == [1, 2]
+    assert all(len(h["documents"]) == 1 for h in case["hearings"])
+
+
+@pytest.mark.django_db
+def test_other_users_case_files_are_not_found(auth_client, django_user_model):
+    other = django_user_model.objects.create_user(
+        email="other@example.com", name="Other", password="x")
+    pretrial = make_case(other, hearings=1)
+    assert auth_client.get(f"{URL}{pretrial.pk}/").status_code == 404
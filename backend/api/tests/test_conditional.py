@@ -0,0 +1,71 @@
+import pytest
+from api.models import PreTrial
+
+
+@pytest.mark.django_db
+def test_unchanged_listing_returns_not_modified(auth_client, user):
+    PreTrial.objects.create(user=user, case_act="IPC 420")
+    url = "/api/v1/list/pretrial/"
+    first = auth_client.get(url)
+    assert first.status_code == 200
+    assert first["Last-Modified"]
+
+    again = auth_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert again.status_code == 304
+    assert not again.content
+
+
+@pytest.mark.django_db
+def test_not_modified_skips_the_listing_query(auth_client, user, django_assert_num_queries):
+    PreTrial.objects.create(user=user, case_act="IPC 420")
+    url = "/api/v1/list/pretrial/"
+    etag = auth_client.get(url)["ETag"]
+
+    # The validator is cached with the response, so no aggregate runs either.
+    with django_assert_num_queries(0):
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.django_db
+def test_cached_listing_reuses_its_validator(auth_client, make_lawyers, django_assert_num_queries):
+    lawyer = make_lawyers(1)[0]
+    url = "/api/v1/list/lawyer/"
+    etag = auth_client.get(url)["ETag"]
+
+    with django_assert_num_queries(0):
+        hit = auth_client.get(url)
+    assert hit["X-Cache"] == "HIT"
+    assert hit["ETag"] == etag
+
+    lawyer.user.name = "Renamed"
+    lawyer.user.save()
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_etag_changes_on_update_and_delete(auth_client, user):
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    other = PreTrial.objects.create(user=user, case_act="IPC 302")
+    url = "/api/v1/list/pretrial/"
+    etag = auth_client.get(url)["ETag"]
+
+    pretrial.details = "Adjourned"
+    pretrial.save()
+    updated = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert updated.status_code == 200
+
+    other.delete()
+    deleted = auth_client.get(url, HTTP_IF_NONE_MATCH=updated["ETag"])
+    assert deleted.status_code == 200
+    assert deleted["ETag"] != updated["ETag"]
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_query_string(auth_client, make_lawyers):
+    make_lawyers(2)
+    url = "/api/v1/list/lawyer/"
+    etag = auth_client.get(url)["ETag"]
+
+    assert auth_client.get(
+        url, {"pagination": "cursor"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
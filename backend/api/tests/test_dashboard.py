@@ -0,0 +1,91 @@
+import datetime
+
+import pytest
+from api.dashboard import dashboard, rebuild_dashboard
+from api.models import Hearing, Lawyer, PreTrial, SummaryCount, UserAccount
+
+DASHBOARD = "/api/v1/dashboard/"
+JUNE = (datetime.date(2023, 6, 1), datetime.date(2023, 6, 30))
+
+
+def summary():
+    return dashboard(*JUNE)
+
+
+def counts():
+    return set(SummaryCount.objects.exclude(count=0).values_list('metric', 'key', 'count'))
+
+
+@pytest.mark.django_db
+def test_counts_follow_writes(user, make_lawyers):
+    lawyer = make_lawyers(2)[0]
+    pretrial = PreTrial.objects.create(
+        user=user, case_act="IPC 420", date_registered=datetime.date(2023, 6, 2))
+    hearing = Hearing.objects.create(
+        pretrial=pretrial, scheduled_date=datetime.date(2023, 6, 5),
+        scheduled_time=datetime.time(10))
+    Hearing.objects.create(
+        pretrial=pretrial, scheduled_date=datetime.date(2023, 6, 5),
+        scheduled_time=datetime.time(11), motion_granted=True)
+
+    lawyer.lawyer_type = Lawyer.Roles.CRIMINAL
+    lawyer.save()
+    hearing = Hearing.objects.only('id', 'pretrial').get(pk=hearing.pk)
+    hearing.scheduled_date = datetime.date(2023, 6, 6)
+    hearing.save()
+
+    data = summary()
+    assert data["lawyers_per_type"] == {Lawyer.Roles.CIVIL: 1, Lawyer.Roles.CRIMINAL: 1}
+    assert data["users_per_type"] == {UserAccount.Roles.CLIENT: 1, UserAccount.Roles.LAWYER: 2}
+    assert data["pretrials_per_month"] == [{"month": "2023-06", "count": 1}]
+    assert data["hearings_per_day"] == [
+        {"date": "2023-06-05", "count": 1}, {"date": "2023-06-06", "count": 1}]
+    assert data["motions"] == {"total": 2, "granted": 1, "granted_ratio": 0.5}
+
+    incremental = counts()
+    rebuild_dashboard()
+    assert counts() == incremental
+
+    pretrial.delete()
+    assert summary()["hearings_per_day"] == []
+    assert summary()["motions"]["total"] == 0
+
+
+@pytest.mark.django_db
+def test_logins_do_not_touch_the_counts(user, django_assert_num_queries):
+    user.last_login = datetime.datetime(2023, 6, 1, tzinfo=datetime.timezone.utc)
+    with django_assert_num_queries(1):
+        user.save(update_fields=['last_login'])
+
+
+@pytest.mark.django_db
+def test_bulk_writes_are_counted(auth_client, user):
+    user.is_staff = True
+    user.save()
+    pretrial = PreTrial.objects.create(
+        user=user, case_act="IPC 420", date_registered=datetime.date(2023, 6, 2))
+    created = auth_client.post("/api/v1/bulk/hearing/", [
+        {"pretrial": pretrial.pk, "scheduled_date": f"2023-06-{day:02d}",
+         "scheduled_time": "10:30"} for day in (5, 5, 6)], format="json")
+    auth_client.patch("/api/v1/bulk/hearing/", [
+        {"id": pk, "motion_granted": True, "scheduled_date": "2023-06-07"}
+        for pk in created.data["created"][:2]], format="json")
+
+    data = summary()
+    assert data["hearings_per_day"] == [
+        {"date": "2023-06-06", "count": 1}, {"date": "2023-06-07", "count": 2}]
+    assert data["motions"] == {"total": 3, "granted": 2, "granted_ratio": 0.6667}
+
+
+@pytest.mark.django_db
+def test_endpoint_reads_only_the_summary(auth_client, user, django_assert_num_queries):
+    assert auth_client.get(DASHBOARD).status_code == 403
+
+    user.user_type = UserAccount.Roles.JUDGE
+    user.save()
+    with django_assert_num_queries(1):
+        response = auth_client.get(DASHBOARD, {"from": "2023-06-01", "to": "2023-06-30"})
+    assert response.status_code == 200
+    assert response.data["users_per_type"] == {UserAccount.Roles.JUDGE: 1}
+
+    assert auth_client.get(DASHBOARD, {"from": "2023-06-01", "to": "2025-06-01"}).status_code == 400
@@ -0,0 +1,68 @@
+import pytest
+from api.db import lock_keys, write_atomic
+from django.db import connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test.utils import CaptureQueriesContext, override_settings
+
+
+@pytest.mark.django_db
+def test_pragmas_are_applied_to_new_connections(tmp_path):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, 'NAME': str(tmp_path / "db.sqlite3")}, alias="tuned")
+    try:
+        with wrapper.cursor() as cursor:
+            values = {}
+            for name in ("journal_mode", "synchronous", "busy_timeout", "temp_store"):
+                cursor.execute(f"PRAGMA {name}")
+                values[name] = cursor.fetchone()[0]
+    finally:
+        wrapper.close()
+    # synchronous NORMAL is 1, temp_store MEMORY is 2.
+    assert values == {"journal_mode": "wal", "synchronous": 1,
+                      "busy_timeout": 5000, "temp_store": 2}
+
+
+def _begins(**settings):
+    with override_settings(**settings), CaptureQueriesContext(connection) as queries:
+        with write_atomic():
+            with write_atomic():
+                connection.cursor().execute("SELECT 1")
+    return [query["sql"] for query in queries if query["sql"].startswith("BEGIN")]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_atomic_begins_immediate_transactions():
+    assert _begins(SQLITE_BEGIN_IMMEDIATE=True) == ["BEGIN IMMEDIATE"]
+    assert _begins(SQLITE_BEGIN_IMMEDIATE=False) == ["BEGIN"]
+
+    # Plain atomic blocks stay deferred.
+    with CaptureQueriesContext(connection) as queries:
+        with transaction.atomic():
+            connection.cursor().execute("SELECT 1")
+    assert queries[0]["sql"] == "BEGIN"
+
+
+def test_lock_keys_takes_ordered_advisory_locks_on_postgresql(monkeypatch):
+    locked = []
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            pass
+
+        def execute(self, sql, params):
+            assert sql == "SELECT pg_advisory_xact_lock(%s)"
+            locked.append(params[0])
+
+    wrapper = transaction.get_connection()
+    monkeypatch.setattr(wrapper, "vendor", "postgresql")
+    monkeypatch.setattr(wrapper, "cursor", Cursor)
+    lock_keys(("judge", 1), ("courtroom", "2"), ("judge", 1))
+    assert len(locked) == 2 and locked == sorted(locked)
+
+    first = list(locked)
+    locked.clear()
+    lock_keys(("courtroom", "2"), ("judge", 1))
+    assert locked == first
@@ -0,0 +1,66 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from api.models import Hearing, PreTrial, UserAccount
+from django.core.management import call_command
+
+URL = "/api/v1/export/"
+
+
+def read(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.fixture
+def pretrials(user):
+    other = UserAccount.objects.create_user(email="o@example.com", name="O", password="x")
+    PreTrial.objects.create(user=other, case_act="IPC 1")
+    return [PreTrial.objects.create(user=user, case_act=f"IPC {i}",
+                                    date_registered=datetime.date(2023, 1, i))
+            for i in range(2, 6)]
+
+
+@pytest.mark.django_db
+def test_ndjson_export_streams_own_rows_and_resumes(auth_client, pretrials):
+    response = auth_client.get(f"{URL}pretrial/")
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in read(response).splitlines()]
+    assert [row["case_act"] for row in rows] == ["IPC 2", "IPC 3", "IPC 4", "IPC 5"]
+    assert rows[0]["date_registered"] == "2023-01-02"
+
+    resumed = auth_client.get(f"{URL}pretrial/", {"after": rows[1]["id"]})
+    assert [json.loads(line)["id"] for line in read(resumed).splitlines()] == [
+        row["id"] for row in rows[2:]]
+
+
+@pytest.mark.django_db
+def test_csv_export(auth_client, pretrials):
+    Hearing.objects.create(pretrial=pretrials[0], scheduled_date=datetime.date(2023, 2, 1),
+                           scheduled_time=datetime.time(10, 30))
+    response = auth_client.get(f"{URL}hearing/", {"output": "csv"})
+    header, row = list(csv.reader(io.StringIO(read(response))))
+    assert header[:4] == ["id", "pretrial", "scheduled_date", "scheduled_time"]
+    assert row[1:4] == [str(pretrials[0].pk), "2023-02-01", "10:30:00"]
+
+
+@pytest.mark.django_db
+def test_unknown_export(auth_client):
+    assert auth_client.get(f"{URL}useraccount/").status_code == 400
+
+
+@pytest.mark.django_db
+def test_export_command_resumes_into_the_same_file(user, pretrials, tmp_path):
+    path = tmp_path / "pretrials.csv"
+    call_command("export_data", "pretrial", "--format", "csv", "--output", str(path),
+                 "--after", str(pretrials[1].pk), stderr=io.StringIO())
+    last = PreTrial.objects.latest("id").pk
+    PreTrial.objects.create(user=user, case_act="IPC 6")
+    call_command("export_data", "pretrial", "--format", "csv", "--output", str(path),
+                 "--after", str(last), "--append", stderr=io.StringIO())
+    rows = list(csv.DictReader(path.open()))
+    assert [row["case_act"] for row in rows] == ["IPC 4", "IPC 5", "IPC 6"]
@@ -0,0 +1,45 @@
+import pytest
+from api.models import PreTrial
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_fields_are_pushed_down_to_the_select(auth_client, make_lawyers):
+    make_lawyers(3)
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get("/api/v1/list/lawyer/", {
+            "pagination": "cursor", "fields": "lawyer_type,enrollment_no"})
+
+    assert response.status_code == 200
+    assert set(response.json()["results"][0]) == {"id", "lawyer_type", "enrollment_no"}
+    page_query = queries.captured_queries[-1]["sql"]
+    assert "chamber_address" not in page_query
+    assert "LIMIT" in page_query
+
+
+@pytest.mark.django_db
+def test_exclude_drops_columns_but_keeps_cursor_keys(auth_client, user):
+    PreTrial.objects.create(user=user, case_act="IPC 420", details="Long text")
+    response = auth_client.get("/api/v1/list/pretrial/", {
+        "pagination": "cursor", "exclude": "details,case_act,date_registered"})
+
+    row = response.json()["results"][0]
+    assert "details" not in row and "case_act" not in row
+    assert "date_registered" in row
+
+
+@pytest.mark.django_db
+def test_fields_apply_to_the_legacy_layout(auth_client, user):
+    PreTrial.objects.create(user=user, case_act="IPC 420")
+    body = auth_client.get("/api/v1/list/pretrial/", {"fields": "case_act"}).json()
+
+    assert body["page_obj"][0]["fields"] == {"case_act": "IPC 420"}
+
+
+@pytest.mark.django_db
+def test_unknown_field_is_rejected(auth_client):
+    response = auth_client.get("/api/v1/list/lawyer/", {"fields": "password"})
+
+    assert response.status_code == 400
+    assert "password" in response.json()["errors"]
@@ -0,0 +1,54 @@
+import pytest
+from api.models import UserAccount
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+
+
+@pytest.fixture
+def count_hashes(monkeypatch):
+    from api.hashers import TunedArgon2PasswordHasher
+    calls = []
+    original = TunedArgon2PasswordHasher.verify
+
+    def verify(self, password, encoded):
+        calls.append(encoded)
+        return original(self, password, encoded)
+    monkeypatch.setattr(TunedArgon2PasswordHasher, "verify", verify)
+    return calls
+
+
+@pytest.mark.django_db
+def test_login_verifies_password_once(api_client, user, count_hashes):
+    response = api_client.post(
+        "/api/v1/login/", {"email": user.email, "password": "s3cret-pass"}, format="json")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"refresh", "access"}
+    assert len(count_hashes) == 1
+
+
+@pytest.mark.django_db
+def test_login_rejects_wrong_password(api_client, user):
+    response = api_client.post(
+        "/api/v1/login/", {"email": user.email, "password": "nope"}, format="json")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_login_upgrades_pbkdf2_hash_to_argon2(api_client, user):
+    UserAccount.objects.filter(pk=user.pk).update(
+        password=make_password("s3cret-pass", hasher="pbkdf2_sha256"))
+
+    api_client.post(
+        "/api/v1/login/", {"email": user.email, "password": "s3cret-pass"}, format="json")
+    user.refresh_from_db()
+    assert user.password.startswith("argon2$argon2id$v=19$m=19456,t=2,p=1$")
+
+
+@pytest.mark.django_db
+def test_login_rehashes_when_argon2_costs_change(api_client, user):
+    with override_settings(ARGON2_TIME_COST=3):
+        api_client.post(
+            "/api/v1/login/", {"email": user.email, "password": "s3cret-pass"}, format="json")
+    user.refresh_from_db()
+    assert ",t=3," in user.password
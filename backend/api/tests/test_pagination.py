@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+from api.models import PreTrial
+from api.pagination import InvalidCursor, KeysetPaginator
+
+
+def _walk(client, url, params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, pagination="cursor")
+        if cursor:
+            query["cursor"] = cursor
+        body = client.get(url, query).json()
+        pages.append(body)
+        cursor = body["next"]
+        if not cursor:
+            return pages
+
+
+@pytest.mark.django_db
+def test_lawyer_cursor_pages_cover_all_rows_once(auth_client, make_lawyers):
+    lawyers = make_lawyers(25)
+    pages = _walk(auth_client, "/api/v1/list/lawyer/", {"page_size": 10})
+
+    assert [len(page["results"]) for page in pages] == [10, 10, 5]
+    ids = [row["id"] for page in pages for row in page["results"]]
+    assert ids == sorted((lawyer.id for lawyer in lawyers), reverse=True)
+    assert "filtered_users" not in pages[0]
+    assert pages[0]["previous"] is None
+
+
+@pytest.mark.django_db
+def test_lawyer_previous_cursor_returns_previous_page(auth_client, make_lawyers):
+    make_lawyers(25)
+    url = "/api/v1/list/lawyer/"
+    first = auth_client.get(url, {"pagination": "cursor"}).json()
+    second = auth_client.get(url, {"cursor": first["next"]}).json()
+    back = auth_client.get(url, {"cursor": second["previous"]}).json()
+
+    assert back["results"] == first["results"]
+    assert back["previous"] is None
+    assert back["next"] == first["next"]
+
+
+@pytest.mark.django_db
+def test_pretrial_cursor_orders_by_date_then_id(auth_client, user):
+    today = datetime.date(2023, 10, 1)
+    for i in range(7):
+        PreTrial.objects.create(
+            user=user, case_act=f"Act {i}", date_registered=today - datetime.timedelta(days=i % 3))
+    pages = _walk(auth_client, "/api/v1/list/pretrial/", {"page_size": 3})
+
+    rows = [row for page in pages for row in page["results"]]
+    keys = [(row["date_registered"], row["id"]) for row in rows]
+    assert len(rows) == 7
+    assert keys == sorted(keys)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(InvalidCursor):
+        KeysetPaginator(('-id',)).decode_cursor("not-a-cursor")
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_bad_request(auth_client):
+    response = auth_client.get("/api/v1/list/lawyer/", {"cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+from api.models import PreTrial
+from api.replicas import ReplicaRouter, replica_middleware, use_replica
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+router = ReplicaRouter()
+
+
+def serve(user_id, write=False, replica=True):
+    """
+    Runs a request through the middleware and returns the databases its
+    reads went to before and after it (optionally) wrote.
+    """
+    reads = []
+
+    def view(request):
+        request.user = SimpleNamespace(id=user_id)
+        if replica:
+            use_replica(request)
+        reads.append(router.db_for_read(PreTrial))
+        if write:
+            assert router.db_for_write(PreTrial) == "default"
+            reads.append(router.db_for_read(PreTrial))
+        return HttpResponse()
+
+    replica_middleware(view)(RequestFactory().get("/"))
+    return reads
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"], REPLICA_STICKY_SECONDS=60)
+def test_reads_go_to_a_replica_until_the_user_writes():
+    assert serve(1)[0] in ("replica1", "replica2")
+    assert serve(1, replica=False) == ["default"]
+
+    reads = serve(1, write=True)
+    assert reads[0].startswith("replica") and reads[1] == "default"
+
+    # The writer sticks to the primary, other users do not.
+    assert serve(1) == ["default"]
+    assert serve(2)[0].startswith("replica")
+
+
+@override_settings(DATABASE_REPLICAS=[])
+def test_without_replicas_everything_reads_from_the_primary():
+    assert serve(1) == ["default"]
+    # Outside of requests, too.
+    assert router.db_for_read(PreTrial) == "default"
+
+
+@pytest.mark.django_db
+def test_list_endpoint_reads_from_the_replica(auth_client, user, monkeypatch):
+    seen = []
+    original = ReplicaRouter.db_for_read
+
+    def db_for_read(self, model, **hints):
+        seen.append(original(self, model, **hints))
+        return "default"
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", db_for_read)
+
+    with override_settings(DATABASE_REPLICAS=["replica1"]):
+        assert auth_client.get("/api/v1/list/pretrial/").status_code == 200
+    assert seen and set(seen) == {"replica1"}
+
+
+@pytest.mark.django_db
+def test_replica_reads_do_not_fill_the_list_cache(auth_client, user, monkeypatch):
+    # The "replica" is the test database itself; only the routing matters.
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", lambda self, model, **hints: "default")
+    url = "/api/v1/list/pretrial/"
+
+    with override_settings(DATABASE_REPLICAS=["replica1"]):
+        assert auth_client.get(url)["X-Cache"] == "MISS"
+        assert auth_client.get(url)["X-Cache"] == "MISS"
+
+    assert auth_client.get(url)["X-Cache"] == "MISS"
+    with override_settings(DATABASE_REPLICAS=["replica1"]):
+        assert auth_client.get(url)["X-Cache"] == "HIT"
@@ -0,0 +1,162 @@
+import datetime
+
+import pytest
+from api.models import Hearing, Judge, PreTrial, UserAccount
+from api.scheduling import IntervalIndex, Schedule, reschedule_judge
+
+MONDAY = datetime.date(2023, 6, 5)
+SCHEDULE = "/api/v1/hearing/schedule/"
+
+
+def test_interval_index():
+    index = IntervalIndex()
+    for start, end, ident in [(600, 630, 1), (660, 720, 2), (720, 750, 3)]:
+        assert index.conflict(start, end) is None
+        index.add(start, end, ident)
+
+    assert index.conflict(620, 640) == 1
+    assert index.conflict(630, 660) is None
+    assert index.conflict(500, 1000) == 3
+    assert index.next_free(600, 30, 1020) == 630
+    assert index.next_free(600, 31, 1020) == 750
+    assert index.next_free(600, 300, 1020) is None
+
+    index.remove(2)
+    assert index.next_free(600, 60, 1020) == 630
+
+
+@pytest.fixture
+def judge(db):
+    account = UserAccount.objects.create(
+        email="judge@example.com", name="Judge", user_type=UserAccount.Roles.JUDGE)
+    return Judge.objects.create(user=account, bar_code="BC-1")
+
+
+@pytest.fixture
+def pretrial(user):
+    return PreTrial.objects.create(user=user, case_act="IPC 420")
+
+
+def book(pretrial, judge, day, time, duration=30, courtroom="1"):
+    return Hearing.objects.create(
+        pretrial=pretrial, judge=judge, courtroom=courtroom, scheduled_date=day,
+        scheduled_time=time, duration=duration)
+
+
+@pytest.mark.django_db
+def test_schedule_rejects_double_booking(auth_client, user, pretrial, judge):
+    # Only staff may pick any judge.
+    user.is_staff = True
+    user.save()
+    taken = book(pretrial, judge, MONDAY, datetime.time(10))
+    payload = {"pretrial": pretrial.pk, "judge": judge.pk, "courtroom": "2",
+               "scheduled_date": str(MONDAY), "scheduled_time": "10:15", "duration": 30}
+
+    conflict = auth_client.post(SCHEDULE, payload, format="json")
+    assert conflict.status_code == 409
+    assert conflict.data["hearing"] == taken.pk
+
+    # Another judge in the same courtroom collides too.
+    clash = auth_client.post(SCHEDULE, dict(payload, judge=None, courtroom="1"), format="json")
+    assert clash.status_code == 409
+
+    auto = auth_client.post(SCHEDULE, dict(payload, auto=True), format="json")
+    assert auto.status_code == 201
+    assert auto.data["scheduled_time"] == "10:30:00"
+
+    outside = auth_client.post(SCHEDULE, dict(payload, scheduled_time="18:00"), format="json")
+    assert outside.status_code == 400
+
+
+@pytest.mark.django_db
+def test_conflict_check_only_reads_the_day(pretrial, judge, django_assert_num_queries):
+    for day in range(30):
+        book(pretrial, judge, MONDAY + datetime.timedelta(days=day), datetime.time(10))
+
+    schedule = Schedule()
+    with django_assert_num_queries(1):
+        index = schedule.index(("judge", judge.pk), MONDAY)
+    assert len(index) == 1
+
+
+@pytest.mark.django_db
+def test_next_free_slot_skips_booked_and_non_court_days(auth_client, pretrial, judge):
+    book(pretrial, judge, MONDAY, datetime.time(10), duration=420)
+    response = auth_client.get("/api/v1/hearing/next-slot/", {
+        "judge": judge.pk, "duration": 60, "after": "2023-06-05T09:00"})
+    assert response.data["slot"] == datetime.datetime(2023, 6, 6, 10)
+
+    friday = auth_client.get("/api/v1/hearing/next-slot/", {
+        "duration": 60, "after": "2023-06-09T16:30"})
+    assert friday.data["slot"] == datetime.datetime(2023, 6, 12, 10)
+
+
+@pytest.mark.django_db
+def test_reschedule_judge_moves_hearings_in_order(pretrial, judge):
+    moved = [book(pretrial, judge, MONDAY, datetime.time(hour)) for hour in (10, 11, 12)]
+    other_judge = Judge.objects.create(
+        user=UserAccount.objects.create(email="j2@example.com", name="J2"), bar_code="BC-2")
+    # Courtroom 1 is busy on Tuesday morning with another judge.
+    book(pretrial, other_judge, MONDAY + datetime.timedelta(days=1), datetime.time(10),
+         duration=60)
+
+    moves = reschedule_judge(judge.pk, MONDAY, MONDAY)
+    assert [(m["scheduled_date"], m["scheduled_time"]) for m in moves] == [
+        (datetime.date(2023, 6, 6), datetime.time(11)),
+        (datetime.date(2023, 6, 6), datetime.time(11, 30)),
+        (datetime.date(2023, 6, 6), datetime.time(12)),
+    ]
+    assert list(Hearing.objects.filter(pk__in=[h.pk for h in moved]).order_by("id")
+                .values_list("scheduled_time", flat=True)) == [
+        datetime.time(11), datetime.time(11, 30), datetime.time(12)]
+
+
+@pytest.mark.django_db
+def test_only_the_judge_or_staff_may_reschedule(auth_client, api_client, judge):
+    url = f"/api/v1/judge/{judge.pk}/reschedule/"
+    days = {"from": str(MONDAY), "to": str(MONDAY)}
+    assert auth_client.post(url, days, format="json").status_code == 403
+
+    other = UserAccount.objects.create(
+        email="other@example.com", name="Other", user_type=UserAccount.Roles.JUDGE)
+    Judge.objects.create(user=other, bar_code="BC-2")
+    api_client.force_authenticate(user=other)
+    assert api_client.post(url, days, format="json").status_code == 403
+    api_client.force_authenticate(user=judge.user)
+    assert api_client.post(url, days, format="json").status_code == 200
+
+
+@pytest.mark.django_db
+def test_judges_schedule_only_pretrials_assigned_to_them(api_client, pretrial, judge):
+    api_client.force_authenticate(user=judge.user)
+    payload = {"pretrial": pretrial.pk, "judge": judge.pk, "scheduled_date": str(MONDAY),
+               "scheduled_time": "10:00"}
+    assert api_client.post(SCHEDULE, payload, format="json").status_code == 404
+
+    pretrial.judge = judge
+    pretrial.save()
+    assert api_client.post(SCHEDULE, payload, format="json").status_code == 201
+
+
+@pytest.mark.django_db
+def test_only_staff_or_the_assigned_judge_choose_the_judge(api_client, user, pretrial, judge):
+    payload = {"pretrial": pretrial.pk, "judge": judge.pk, "scheduled_date": str(MONDAY),
+               "scheduled_time": "10:00"}
+    api_client.force_authenticate(user=user)
+    assert api_client.post(SCHEDULE, payload, format="json").status_code == 403
+    assert api_client.post(SCHEDULE, dict(payload, judge=None), format="json").status_code == 201
+
+    pretrial.judge = judge
+    pretrial.save()
+    assert api_client.post(
+        SCHEDULE, dict(payload, scheduled_time="11:00"), format="json").status_code == 403
+    api_client.force_authenticate(user=judge.user)
+    assert api_client.post(
+        SCHEDULE, dict(payload, scheduled_time="11:00"), format="json").status_code == 201
+
+    user.is_staff = True
+    user.save()
+    api_client.force_authenticate(user=user)
+    unknown = api_client.post(SCHEDULE, dict(payload, judge=999), format="json")
+    assert unknown.status_code == 400
+    assert "judge" in unknown.data["errors"]
@@ -0,0 +1,84 @@
+import pytest
+from api.models import PreTrial, UserAccount
+from api.search import _fts5_query, _tsquery, search_pretrials
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+URL = "/api/v1/search/pretrial/"
+
+
+def test_fts5_query_quotes_words_and_prefixes_the_last():
+    assert _fts5_query('cheating AND "fraud') == '"cheating" "AND" "fraud"*'
+    assert _fts5_query("  -- ") == ""
+
+
+def test_tsquery_requires_every_word_and_prefixes_the_last():
+    assert _tsquery("land sale joh") == "land & sale & joh:*"
+    assert _tsquery("cheating | !fraud's") == "cheating & fraud & s:*"
+    assert _tsquery("  -- ") == ""
+
+
+@pytest.mark.django_db
+def test_search_follows_inserts_updates_and_deletes(user):
+    pretrial = PreTrial.objects.create(
+        user=user, case_act="IPC 420", details="Cheating over a land sale")
+    assert [row["id"] for row in search_pretrials("cheating", user.id)] == [pretrial.id]
+
+    pretrial.details = "Forgery of a sale deed"
+    pretrial.save()
+    assert search_pretrials("cheating", user.id) == []
+    assert [row["id"] for row in search_pretrials("forgery", user.id)] == [pretrial.id]
+
+    pretrial.delete()
+    assert search_pretrials("forgery", user.id) == []
+
+
+@pytest.mark.django_db
+def test_search_is_scoped_ranked_and_snippeted(user):
+    other = UserAccount.objects.create_user(
+        email="other@example.com", name="Other", password="x")
+    PreTrial.objects.create(user=other, case_act="IPC 302", details="murder murder")
+    weak = PreTrial.objects.create(
+        user=user, case_act="IPC 302", details="Witness statements on the murder weapon and " * 5)
+    strong = PreTrial.objects.create(user=user, case_act="IPC 302", details="Murder, murder trial")
+
+    rows = search_pretrials("murd", user.id)
+    assert [row["id"] for row in rows] == [strong.id, weak.id]
+    assert rows[0]["rank"] > rows[1]["rank"]
+    assert "<mark>Murder</mark>" in rows[0]["snippet"]
+
+
+@pytest.mark.django_db
+def test_search_endpoint_paginates(auth_client, user):
+    for i in range(3):
+        PreTrial.objects.create(user=user, case_act=f"IPC {i}", details="bail application")
+
+    first = auth_client.get(URL, {"q": "bail", "page_size": 2})
+    assert first.status_code == 200
+    assert len(first.data["results"]) == 2
+    assert first.data["next"] == 2 and first.data["previous"] is None
+
+    second = auth_client.get(URL, {"q": "bail", "page_size": 2, "page": 2})
+    assert len(second.data["results"]) == 1
+    assert second.data["next"] is None and second.data["previous"] == 1
+
+
+@pytest.mark.django_db
+def test_search_endpoint_requires_a_query(auth_client):
+    assert auth_client.get(URL).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_search_survives_migrating_to_the_latest_migration(user):
+    # Migrations that rebuild api_pretrial on SQLite drop its triggers.
+    executor = MigrationExecutor(connection)
+    latest = executor.loader.graph.leaf_nodes("api")
+    executor.migrate([("api", "0022_change_feed")])
+    executor.loader.build_graph()
+    executor.migrate(latest)
+
+    pretrial = PreTrial.objects.create(
+        user=user, case_act="IPC 420", details="Cheating over a land sale")
+    assert [row["id"] for row in search_pretrials("cheating", user.id)] == [pretrial.id]
+    pretrial.delete()
+    assert search_pretrials("cheating", user.id) == []
@@ -0,0 +1,46 @@
+import datetime
+import json
+
+import pytest
+from api.models import PreTrial
+from api.projections import LawyerProjection, PreTrialProjection
+from api.renderers import FastJSONRenderer
+from django.core.serializers import serialize
+from django.utils.translation import gettext_lazy as _
+
+
+@pytest.mark.django_db
+def test_legacy_rows_match_django_serializer(user):
+    PreTrial.objects.create(user=user, case_act="IPC 420", details="Fraud")
+    PreTrial.objects.create(user=user, case_act="IPC 302")
+    queryset = PreTrial.objects.order_by('id')
+    projection = PreTrialProjection()
+
+    expected = json.loads(serialize("json", queryset))
+    assert projection.legacy_rows(projection.rows(queryset)) == expected
+
+
+@pytest.mark.django_db
+def test_lawyer_legacy_rows_match_django_serializer(make_lawyers):
+    make_lawyers(3)
+    queryset = LawyerProjection.model.objects.order_by('-id')
+    projection = LawyerProjection()
+
+    expected = json.loads(serialize("json", queryset))
+    assert projection.legacy_rows(projection.rows(queryset)) == expected
+
+
+@pytest.mark.django_db
+def test_offset_listing_keeps_legacy_shape(auth_client, user):
+    PreTrial.objects.create(user=user, case_act="IPC 420")
+    body = auth_client.get("/api/v1/list/pretrial/").json()
+
+    assert body["filtered_pretrials"][0]["model"] == "api.pretrial"
+    assert body["page_obj"] == body["filtered_pretrials"]
+
+
+def test_fast_renderer_handles_lazy_strings_and_dates():
+    rendered = FastJSONRenderer().render(
+        {"message": _("Something went wrong"), "day": datetime.date(2023, 10, 1)})
+    assert json.loads(rendered) == {
+        "message": "Something went wrong", "day": "2023-10-01"}
@@ -0,0 +1,225 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from api import sharding
+from api.assignment import assign_pretrial
+from api.bulk import HearingBulkWriter
+from api.models import (CalendarEntry, Document, Hearing, Judge, PreTrial,
+                        UserAccount)
+from api.scheduling import SchedulingConflict, reschedule_judge, schedule_hearing
+from api.views import _get_tokens_for_user
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+# The shard databases are declared in nyay/settings/test.py.
+SHARDS = ["default", "shard1", "shard2"]
+
+pytestmark = [
+    pytest.mark.skipif(
+        not set(SHARDS) <= set(settings.DATABASES), reason="needs nyay.settings.test"),
+    pytest.mark.django_db(databases=SHARDS),
+]
+
+
+@pytest.fixture(autouse=True)
+def case_shards(settings):
+    settings.CASE_SHARDS = SHARDS
+    for alias in SHARDS:
+        sharding.prepare_shard(alias)
+
+
+def make_case(user, i=0):
+    pretrial = PreTrial.objects.create(
+        user=user, case_act=f"IPC 42{i}", date_registered=datetime.date(2023, 6, 1 + i))
+    hearing = Hearing.objects.create(
+        pretrial=pretrial, scheduled_date=datetime.date(2023, 7, 1 + i),
+        scheduled_time=datetime.time(10))
+    document = Document.objects.create(
+        hearing=hearing, name="Exhibit", document_no=f"D-{i}", file=f"documents/{i}.pdf")
+    return pretrial, hearing, document
+
+
+def make_users(count):
+    return [UserAccount.objects.create_user(
+        email=f"owner{i}@example.com", name=f"Owner {i}", password="s3cret-pass")
+        for i in range(count)]
+
+
+def test_cases_live_on_their_owners_shard():
+    for user in make_users(3):
+        alias = sharding.shard_for(user.pk)
+        for row in make_case(user):
+            assert row._state.db == alias
+            assert sharding.shard_of(row.pk) == alias
+            assert row.pk // sharding.SHARD_ID_SPAN == SHARDS.index(alias)
+
+        assert PreTrial.objects.for_user(user.pk).count() == 1
+        assert Document.objects.for_user(user.pk).get().hearing.pretrial.user_id == user.pk
+        # Related managers follow the instance.
+        pretrial = user.PreTrial.get()
+        assert pretrial.hearings.get().documents.count() == 1
+
+
+def test_calendar_entries_stay_on_default():
+    user, = make_users(1)
+    pretrial, hearing, _ = make_case(user)
+
+    entries = CalendarEntry.objects.filter(hearing_id=hearing.pk)
+    assert entries.exists()
+    assert set(entries.values_list("pretrial_id", flat=True)) == {pretrial.pk}
+
+    pretrial.case_act = "IPC 406"
+    pretrial.save()
+    assert set(entries.values_list("case_act", flat=True)) == {"IPC 406"}
+
+    hearing.delete()
+    assert not entries.exists()
+
+
+def test_scatter_reads_every_shard_in_id_order():
+    for i, user in enumerate(make_users(4)):
+        make_case(user, i)
+
+    ids = [pk for queryset in PreTrial.objects.order_by("id").scatter()
+           for pk in queryset.values_list("id", flat=True)]
+    assert len(ids) == 4
+    assert ids == sorted(ids)
+
+
+def test_deleting_a_user_deletes_their_sharded_cases():
+    # Consecutive ids spread three users over the three shards.
+    user, other = [u for u in make_users(3) if sharding.shard_for(u.pk) != "default"]
+    make_case(user)
+    make_case(other, 1)
+
+    user_id = user.pk
+    user.delete()
+
+    assert not PreTrial.objects.for_user(user_id).exists()
+    assert not Hearing.objects.for_user(user_id).exists()
+    assert PreTrial.objects.for_user(other.pk).exists()
+
+
+def test_list_endpoint_reads_from_the_users_shard(api_client):
+    users = make_users(3)
+    for i, user in enumerate(users):
+        make_case(user, i)
+
+    for i, user in enumerate(users):
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {_get_tokens_for_user(user)['access']}")
+        response = api_client.get("/api/v1/list/pretrial/")
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert f"IPC 42{i}" in content
+        assert all(f"IPC 42{j}" not in content for j in range(3) if j != i)
+
+
+def upcoming(days=7):
+    day = datetime.date.today() + datetime.timedelta(days=days)
+    while day.weekday() >= 5:
+        day += datetime.timedelta(days=1)
+    return day
+
+
+def make_judge(i=0):
+    account = UserAccount.objects.create(
+        email=f"judge{i}@example.com", name=f"Judge {i}", user_type=UserAccount.Roles.JUDGE)
+    return Judge.objects.create(user=account, bar_code=f"BC-{i}")
+
+
+def test_creates_and_lookups_by_id_follow_the_owner():
+    users = make_users(3)
+    pretrials = PreTrial.objects.bulk_create(
+        [PreTrial(user_id=user.pk, case_act=f"IPC {i}") for i, user in enumerate(users)])
+    for user, pretrial in zip(users, pretrials):
+        assert sharding.shard_of(pretrial.pk) == sharding.shard_for(user.pk)
+        # No request, no on_shard(): the id alone tells where to look.
+        assert PreTrial.objects.get(pk=pretrial.pk).user_id == user.pk
+        hearing, created = Hearing.objects.get_or_create(
+            pretrial_id=pretrial.pk, scheduled_date=upcoming(), scheduled_time=datetime.time(10))
+        assert created and hearing._state.db == sharding.shard_for(user.pk)
+
+    assert set(PreTrial.objects.in_bulk([p.pk for p in pretrials])) == {p.pk for p in pretrials}
+
+
+def test_judges_schedule_and_assign_cases_on_every_shard():
+    judge = make_judge()
+    first, second = [user for user in make_users(3) if sharding.shard_for(user.pk) != "default"]
+    theirs = PreTrial.objects.create(user=first, case_act="IPC 420")
+    other = PreTrial.objects.create(user=second, case_act="IPC 406")
+
+    assert assign_pretrial(theirs.pk) == judge.pk
+    assert PreTrial.objects.get(pk=theirs.pk).judge_id == judge.pk
+
+    day = upcoming()
+    hearing = schedule_hearing(
+        theirs.pk, judge_id=judge.pk, scheduled_date=day, scheduled_time=datetime.time(10))
+    assert hearing._state.db == sharding.shard_for(first.pk)
+    # The judge's booking on the first shard blocks the slot on the second.
+    with pytest.raises(SchedulingConflict):
+        schedule_hearing(
+            other.pk, judge_id=judge.pk, scheduled_date=day,
+            scheduled_time=datetime.time(10, 15))
+
+
+def test_bulk_hearings_span_shards():
+    users = make_users(3)
+    pretrials = [PreTrial.objects.create(user=user, case_act="IPC 420") for user in users]
+    staff = SimpleNamespace(id=None, is_staff=True, user_type=None)
+
+    ids = HearingBulkWriter(staff).create([
+        {"pretrial": pretrial.pk, "scheduled_date": str(upcoming()), "scheduled_time": "10:00"}
+        for pretrial in pretrials])
+    assert [sharding.shard_of(pk) for pk in ids] == \
+        [sharding.shard_for(user.pk) for user in users]
+    assert CalendarEntry.objects.filter(hearing_id__in=ids).count() == 3
+
+    assert HearingBulkWriter(staff).update(
+        [{"id": pk, "motion_details": "Bail"} for pk in ids]) == 3
+    assert {Hearing.objects.get(pk=pk).motion_details for pk in ids} == {"Bail"}
+
+
+def test_middleware_forgets_the_request_user():
+    user = [user for user in make_users(3) if sharding.shard_for(user.pk) != "default"][0]
+    seen = []
+
+    def view(request):
+        request.user = user
+        seen.append(sharding.current_shard())
+        return HttpResponse()
+
+    sharding.shard_middleware(view)(RequestFactory().get("/"))
+    assert seen == [sharding.shard_for(user.pk)]
+    assert sharding.current_shard() is None
+
+
+def test_writes_lock_only_the_shards_they_touch(monkeypatch):
+    judge = make_judge()
+    user = [user for user in make_users(3) if sharding.shard_for(user.pk) != "default"][0]
+    pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+    staff = SimpleNamespace(id=None, is_staff=True, user_type=None)
+    locked = []
+    write_atomic = sharding.write_atomic
+
+    def spy(using=None):
+        locked.append(using)
+        return write_atomic(using)
+    monkeypatch.setattr(sharding, "write_atomic", spy)
+
+    expected = ["default", sharding.shard_for(user.pk)]
+    ids = HearingBulkWriter(staff).create([
+        {"pretrial": pretrial.pk, "judge": judge.pk, "scheduled_date": str(upcoming()),
+         "scheduled_time": "10:00"}])
+    assert locked == expected
+
+    locked.clear()
+    HearingBulkWriter(staff).update([{"id": ids[0], "motion_details": "Bail"}])
+    assert locked == expected
+
+    locked.clear()
+    day = Hearing.objects.get(pk=ids[0]).scheduled_date
+    assert len(reschedule_judge(judge.pk, day, day)) == 1
+    assert locked == expected
@@ -0,0 +1,88 @@
+import datetime
+
+import pytest
+from api.models import PreTrial, Tombstone, UserAccount
+from api.sync import decode_watermark, encode_watermark
+from django.utils import timezone
+
+CHANGES = "/api/v1/changes/pretrial/"
+
+
+@pytest.fixture(autouse=True)
+def settled(settings):
+    settings.SYNC_SETTLE_SECONDS = 0
+
+
+def sync(client, since=None, **params):
+    params = dict(params, since=since) if since else params
+    response = client.get(CHANGES, params)
+    assert response.status_code == 200
+    return response.data
+
+
+@pytest.mark.django_db
+def test_feed_returns_only_what_changed(auth_client, user):
+    other = UserAccount.objects.create_user(email="o@example.com", name="O", password="x")
+    first, second = (PreTrial.objects.create(user=user, case_act=f"Case {i}") for i in range(2))
+    PreTrial.objects.create(user=other, case_act="Not mine")
+
+    initial = sync(auth_client)
+    assert [row["id"] for row in initial["changed"]] == [first.pk, second.pk]
+    assert initial["deleted"] == [] and not initial["has_more"]
+
+    idle = sync(auth_client, initial["next"])
+    assert idle["changed"] == [] and idle["deleted"] == []
+
+    first.case_act = "Amended"
+    first.save()
+    deleted = second.pk
+    second.delete()
+    third = PreTrial.objects.create(user=user, case_act="Case 2")
+
+    delta = sync(auth_client, idle["next"])
+    assert [row["id"] for row in delta["changed"]] == [first.pk, third.pk]
+    assert delta["changed"][0]["case_act"] == "Amended"
+    assert delta["deleted"] == [deleted]
+
+    assert sync(auth_client, delta["next"])["changed"] == []
+
+
+@pytest.mark.django_db
+def test_feed_pages_through_large_deltas(auth_client, user):
+    PreTrial.objects.bulk_create([PreTrial(user=user, case_act=f"Case {i}") for i in range(25)])
+
+    seen, since = [], None
+    for _ in range(10):
+        page = sync(auth_client, since, page_size=10)
+        seen += [row["id"] for row in page["changed"]]
+        since = page["next"]
+        if not page["has_more"]:
+            break
+    assert sorted(seen) == sorted(PreTrial.objects.values_list('id', flat=True))
+    assert len(seen) == 25
+
+
+@pytest.mark.django_db
+def test_unsettled_rows_wait_for_the_next_call(auth_client, user, settings):
+    settings.SYNC_SETTLE_SECONDS = 60
+    PreTrial.objects.create(user=user, case_act="IPC 420")
+    assert sync(auth_client)["changed"] == []
+
+
+@pytest.mark.django_db
+def test_expired_and_invalid_watermarks(auth_client, user):
+    old = timezone.now() - datetime.timedelta(days=365)
+    expired = encode_watermark(None, (old, 0))
+    assert decode_watermark(expired) == (None, (old, 0))
+
+    assert auth_client.get(CHANGES, {"since": expired}).status_code == 410
+    assert auth_client.get(CHANGES, {"since": "garbage"}).status_code == 400
+    assert auth_client.get("/api/v1/changes/hearing/").status_code == 400
+
+
+@pytest.mark.django_db
+def test_deleting_a_lawyer_leaves_a_shared_tombstone(make_lawyers):
+    lawyer = make_lawyers(1)[0]
+    pk = lawyer.pk
+    lawyer.delete()
+    assert Tombstone.objects.filter(model='lawyer', object_id=pk, user_id=None).exists()
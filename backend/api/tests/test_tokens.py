@@ -0,0 +1,101 @@
+import datetime
+import io
+
+import pytest
+from api.tokens import (bump_token_generation, get_token_generation,
+                        revoke_user_tokens)
+from api.views import _get_tokens_for_user
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (BlacklistedToken,
+                                                             OutstandingToken)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def _issue(user, count):
+    return [RefreshToken.for_user(user) for _ in range(count)]
+
+
+@pytest.mark.django_db
+def test_revoke_user_tokens_skips_expired_and_blacklisted(user):
+    tokens = _issue(user, 4)
+    tokens[0].blacklist()
+    OutstandingToken.objects.create(
+        user=user, jti="expired", token="expired",
+        expires_at=timezone.now() - datetime.timedelta(minutes=1))
+
+    assert revoke_user_tokens(user) == 3
+    assert BlacklistedToken.objects.filter(token__user=user).count() == 4
+    assert revoke_user_tokens(user) == 0
+
+
+@pytest.mark.django_db
+def test_revoke_user_tokens_leaves_other_users_alone(user, django_user_model):
+    other = django_user_model.objects.create_user(
+        email="other@example.com", name="Other", password="pass")
+    _issue(user, 2)
+    _issue(other, 2)
+
+    revoke_user_tokens(user)
+    assert not BlacklistedToken.objects.filter(token__user=other).exists()
+
+
+@pytest.mark.django_db
+def test_revoke_user_tokens_is_a_single_query(user, django_assert_num_queries):
+    _issue(user, 50)
+    with django_assert_num_queries(1):
+        assert revoke_user_tokens(user) == 50
+
+
+@pytest.mark.django_db
+def test_logout_all_reports_revoked_count(auth_client, user):
+    _issue(user, 3)
+    response = auth_client.post("/api/v1/logout/", {"all": True}, format="json")
+
+    assert response.status_code == 200
+    assert response.json()["revoked"] == 3
+
+
+@pytest.mark.django_db
+def test_generation_bump_rejects_existing_tokens(api_client, user):
+    tokens = _get_tokens_for_user(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert api_client.get("/api/v1/list/pretrial/").status_code == 200
+
+    assert api_client.post(
+        "/api/v1/logout/", {"all": True}, format="json").status_code == 200
+    assert api_client.get("/api/v1/list/pretrial/").status_code == 401
+
+    refresh = api_client.post(
+        "/api/token/refresh/", {"refresh": tokens["refresh"]}, format="json")
+    assert refresh.status_code == 401
+
+
+@pytest.mark.django_db
+def test_tokens_issued_after_bump_are_accepted(api_client, user):
+    bump_token_generation(user)
+    user.refresh_from_db()
+    tokens = _get_tokens_for_user(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    assert api_client.get("/api/v1/list/pretrial/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_generation_is_served_from_cache(user, django_assert_num_queries):
+    get_token_generation(user.pk)
+    with django_assert_num_queries(0):
+        assert get_token_generation(user.pk) == 0
+
+
+@pytest.mark.django_db
+def test_prune_tokens_removes_only_expired(user):
+    live = RefreshToken.for_user(user)
+    past = timezone.now() - datetime.timedelta(days=1)
+    expired = [OutstandingToken.objects.create(
+        user=user, jti=f"old-{i}", token="x", expires_at=past) for i in range(5)]
+    BlacklistedToken.objects.create(token=expired[0])
+
+    call_command("prune_tokens", batch_size=2, stdout=io.StringIO())
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [live["jti"]]
+    assert not BlacklistedToken.objects.exists()
@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (BlacklistedToken,
+                                                             OutstandingToken)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import Judge, Lawyer, UserAccount
+
+GENERATION_CLAIM = "gen"
+
+
+# START: Token generations
+def _generation_cache_key(user_id) -> str:
+    return f"api:token-generation:{user_id}"
+
+
+def get_token_generation(user_id) -> int:
+    """
+    Returns the current token generation of a user, read through the cache.
+
+    Args:
+        user_id: The primary key of the user.
+
+    Returns:
+        int: The generation tokens must carry to be accepted. Unknown users
+        get ``-1`` so that none of their tokens can match.
+    """
+    key = _generation_cache_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = UserAccount.objects.filter(pk=user_id).values_list(
+            'token_generation', flat=True).first()
+        generation = -1 if generation is None else generation
+        cache.set(key, generation, settings.TOKEN_GENERATION_CACHE_TIMEOUT)
+    return generation
+
+
+def bump_token_generation(user) -> None:
+    """
+    Revokes every token issued to ``user`` so far with a single UPDATE.
+
+    Tokens carry the generation they were issued in; once the counter moves
+    on they no longer match and are rejected by ``check_token_generation``.
+    """
+    UserAccount.objects.filter(pk=user.pk).update(
+        token_generation=F('token_generation') + 1)
+    cache.delete(_generation_cache_key(user.pk))
+
+
+def check_token_generation(token) -> None:
+    """
+    Rejects ``token`` if it was issued before the user's last generation bump.
+
+    Tokens issued before the claim existed count as generation 0.
+
+    Raises:
+        InvalidToken: If the token has been revoked.
+    """
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return
+    if token.get(GENERATION_CLAIM, 0) != get_token_generation(user_id):
+        raise InvalidToken("Token has been revoked")
+
+
+# END: Token generations
+
+
+# START: Active status
+def _active_cache_key(user_id) -> str:
+    return f"api:user-active:{user_id}"
+
+
+def is_user_active(user_id) -> bool:
+    """
+    Returns whether a user is still active, read through a short-lived cache.
+
+    Used by ``ClaimsJWTAuthentication`` so that deactivating an account takes
+    effect within ``TOKEN_ACTIVE_CACHE_TIMEOUT`` seconds instead of only when
+    the user's tokens expire.
+    """
+    key = _active_cache_key(user_id)
+    is_active = cache.get(key)
+    if is_active is None:
+        is_active = bool(UserAccount.objects.filter(pk=user_id).values_list(
+            'is_active', flat=True).first())
+        cache.set(key, is_active, settings.TOKEN_ACTIVE_CACHE_TIMEOUT)
+    return is_active
+
+
+def set_user_active(user_id, is_active) -> None:
+    """
+    Primes the active status cache after the user row changed.
+    """
+    if settings.TOKEN_ACTIVE_CACHE_TIMEOUT:
+        cache.set(_active_cache_key(user_id), bool(is_active),
+                  settings.TOKEN_ACTIVE_CACHE_TIMEOUT)
+# END: Active status
+
+
+class GenerationRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's token generation (``gen``) and the
+    claims ``ClaimsJWTAuthentication`` authorizes from: ``user_type``,
+    ``is_active``, ``is_staff``, ``lawyer_id`` and ``judge_id``. Access tokens
+    derived from it copy the claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[GENERATION_CLAIM] = user.token_generation
+        token["user_type"] = user.user_type
+        token["is_active"] = user.is_active
+        token["is_staff"] = user.is_staff
+        token["lawyer_id"] = token["judge_id"] = None
+        if user.user_type == UserAccount.Roles.LAWYER:
+            token["lawyer_id"] = Lawyer.objects.filter(
+                user=user).values_list('id', flat=True).first()
+        elif user.user_type == UserAccount.Roles.JUDGE:
+            token["judge_id"] = Judge.objects.filter(
+                user=user).values_list('id', flat=True).first()
+        return token
+
+
+def revoke_user_tokens(user) -> int:
+    """
+    Blacklists every live refresh token of ``user`` in a single statement.
+
+    The rows are copied with one ``INSERT ... SELECT`` instead of a
+    ``get_or_create`` per token, so the cost is one round trip regardless of
+    how many tokens the user has. Tokens that already expired or are already
+    blacklisted are skipped.
+
+    Args:
+        user: The user whose refresh tokens should be revoked.
+
+    Returns:
+        int: The number of tokens that were blacklisted.
+    """
+    outstanding = OutstandingToken._meta
+    blacklisted = BlacklistedToken._meta
+    qn = connection.ops.quote_name
+
+    sql = (
+        f"INSERT INTO {qn(blacklisted.db_table)} "
+        f"({qn(blacklisted.get_field('token').column)}, "
+        f"{qn(blacklisted.get_field('blacklisted_at').column)}) "
+        f"SELECT o.{qn(outstanding.pk.column)}, %s "
+        f"FROM {qn(outstanding.db_table)} o "
+        f"WHERE o.{qn(outstanding.get_field('user').column)} = %s "
+        f"AND o.{qn(outstanding.get_field('expires_at').column)} > %s "
+        f"AND NOT EXISTS (SELECT 1 FROM {qn(blacklisted.db_table)} b "
+        f"WHERE b.{qn(blacklisted.get_field('token').column)} = o.{qn(outstanding.pk.column)})"
+    )
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [now, user.pk, now])
+        return cursor.rowcount
@@ -1,8 +1,17 @@
 from django.urls import path
 
-from .views import (JudgeRegisterAPIView, LawyerRegisterAPIView,
-                    ListLawyersAPIView, ListPreTrialsAPIView, LoginAPIView,
-                    LogoutAPIView, UserRegisterAPIView)
+from .async_views import (AsyncCaseFileView, AsyncListLawyersView,
+                          AsyncListPreTrialsView, AsyncSearchPreTrialsView)
+from .views import (AssignBacklogAPIView, AssignPreTrialAPIView,
+                    AutocompleteAPIView, BulkHearingsAPIView,
+                    BulkPreTrialsAPIView, CalendarAPIView, CaseFileAPIView,
+                    CauseListAPIView, ChangesAPIView, DashboardAPIView,
+                    ExportAPIView, JudgeLoadAPIView, JudgeRegisterAPIView,
+                    LawyerRegisterAPIView, ListLawyersAPIView,
+                    ListPreTrialsAPIView, LoginAPIView, LogoutAPIView,
+                    NextFreeSlotAPIView, RescheduleJudgeAPIView,
+                    ScheduleHearingAPIView, SearchPreTrialsAPIView,
+                    UserRegisterAPIView)
 
 urlpatterns = [
     path("api/v1/login/", LoginAPIView.as_view()),
@@ -12,4 +21,27 @@ urlpatterns = [
     path("api/v1/register/judge/", JudgeRegisterAPIView.as_view()),
     path("api/v1/list/lawyer/", ListLawyersAPIView.as_view()),
     path("api/v1/list/pretrial/", ListPreTrialsAPIView.as_view()),
+    path("api/v1/search/pretrial/", SearchPreTrialsAPIView.as_view()),
+    path("api/v1/autocomplete/", AutocompleteAPIView.as_view()),
+    path("api/v1/casefile/", CaseFileAPIView.as_view()),
+    path("api/v1/casefile/<int:pk>/", CaseFileAPIView.as_view()),
+    path("api/v1/bulk/pretrial/", BulkPreTrialsAPIView.as_view()),
+    path("api/v1/bulk/hearing/", BulkHearingsAPIView.as_view()),
+    path("api/v1/export/<str:name>/", ExportAPIView.as_view()),
+    path("api/v1/hearing/schedule/", ScheduleHearingAPIView.as_view()),
+    path("api/v1/hearing/next-slot/", NextFreeSlotAPIView.as_view()),
+    path("api/v1/judge/<int:pk>/reschedule/", RescheduleJudgeAPIView.as_view()),
+    path("api/v1/judge/<int:pk>/cause-list/", CauseListAPIView.as_view()),
+    path("api/v1/calendar/", CalendarAPIView.as_view()),
+    path("api/v1/pretrial/assign/", AssignBacklogAPIView.as_view()),
+    path("api/v1/pretrial/<int:pk>/assign/", AssignPreTrialAPIView.as_view()),
+    path("api/v1/judges/load/", JudgeLoadAPIView.as_view()),
+    path("api/v1/dashboard/", DashboardAPIView.as_view()),
+    path("api/v1/changes/<str:name>/", ChangesAPIView.as_view()),
+    # Async versions of the read endpoints, for ASGI deployments.
+    path("api/v1/async/list/lawyer/", AsyncListLawyersView.as_view()),
+    path("api/v1/async/list/pretrial/", AsyncListPreTrialsView.as_view()),
+    path("api/v1/async/search/pretrial/", AsyncSearchPreTrialsView.as_view()),
+    path("api/v1/async/casefile/", AsyncCaseFileView.as_view()),
+    path("api/v1/async/casefile/<int:pk>/", AsyncCaseFileView.as_view()),
 ]
@@ -1,22 +1,44 @@
-import json
+import datetime
 
-from django.contrib.auth import authenticate
+from django.conf import settings
 from django.core.paginator import Paginator
-from django.core.serializers import serialize
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.token_blacklist.models import (BlacklistedToken,
-                                                             OutstandingToken)
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .assignment import assign_backlog, assign_pretrial, fairness, judge_loads
+from .authentication import ClaimsJWTAuthentication, GenerationJWTAuthentication
+from .autocomplete import PUBLIC_USER_TYPES, suggest
+from .bulk import (BulkValidationError, HearingBulkWriter,
+                   PreTrialBulkWriter)
+from .casefile import MAX_DEPTH, load_case_files
+from .cache import cache_list_response
+from .calendars import calendar, cause_list
+from .conditional import conditional_list_response
+from .dashboard import dashboard
+from .export import FORMATS, export_queryset, stream_export
+from .permissions import IsJudge, manages_all_hearings, may_set_judge, pretrial_scope
+from .scheduling import (SchedulingConflict, next_free_slot, reschedule_judge,
+                         schedule_hearing)
 from .filters import LawyerFilter, PreTrialFilter
-from .models import Judge, Lawyer, PreTrial, UserAccount
-from .serializers import (JudgeRegisterationSerializer,
+from .models import AutocompleteEntry, Judge, Lawyer, PreTrial, UserAccount
+from .pagination import (KeysetPaginator, cursor_pagination_requested,
+                         get_page_size, paginator_fields)
+from .projections import LawyerProjection, PreTrialProjection
+from .replicas import replica_reads
+from .search import search_pretrials
+from .serializers import (HearingScheduleSerializer,
+                          JudgeRegisterationSerializer,
                           LawyerRegisterationSerializer, PreTrialSerializer,
                           UserLoginSerializer, UserRegistrationSerializer)
+from .sync import WatermarkExpired, changes
+from .tokens import (GenerationRefreshToken, bump_token_generation,
+                     revoke_user_tokens)
 
 # START: Token Generation
 
@@ -33,7 +55,7 @@ def _get_tokens_for_user(user) -> dict[str, str]:
     -------
         A dictionary containing the refresh and access tokens for the user.
     """
-    refresh = RefreshToken.for_user(user)
+    refresh = GenerationRefreshToken.for_user(user)
 
     return {
         "refresh": str(refresh),
@@ -46,7 +68,9 @@ class LogoutAPIView(APIView):
     """
     API view to logout a user by blacklisting their refresh token(s).
 
-    If the request data contains "all" key with a truthy value, all refresh tokens for the user will be blacklisted.
+    If the request data contains "all" key with a truthy value, the user's token generation is bumped, which
+    revokes every access and refresh token issued so far. With JWT_REVOCATION_MODE "blacklist" all live refresh
+    tokens are additionally blacklisted in bulk and the number of revoked tokens is returned as "revoked".
     Otherwise, the refresh token provided in the request data will be blacklisted.
 
     Returns a JSON response with a message and HTTP status code.
@@ -56,11 +80,11 @@ class LogoutAPIView(APIView):
 
     def post(self, request, *args, **kwargs):
         if self.request.data.get("all"):
-            token: OutstandingToken
-            for token in OutstandingToken.objects.filter(user=request.user):
-                _, _ = BlacklistedToken.objects.get_or_create(token=token)
-            return Response(
-                {"message": "OK, goodbye, all refresh tokens blacklisted"}, status=status.HTTP_200_OK)
+            bump_token_generation(request.user)
+            context = {"message": "OK, goodbye, all refresh tokens blacklisted"}
+            if settings.JWT_REVOCATION_MODE == "blacklist":
+                context["revoked"] = revoke_user_tokens(request.user)
+            return Response(context, status=status.HTTP_200_OK)
         refresh_token = self.request.data.get("refresh_token")
         token = RefreshToken(token=refresh_token)
         token.blacklist()
@@ -72,6 +96,8 @@ class LoginAPIView(APIView):
     API view for user login.
 
     Accepts email and password in the request body and returns JWT tokens if the credentials are valid.
+    The password is verified exactly once, by ``UserLoginSerializer``, which hands the authenticated user on
+    to token issuance.
     """
     serializer_class = UserLoginSerializer
     permission_classes = (AllowAny,)
@@ -79,21 +105,13 @@ class LoginAPIView(APIView):
     def post(self, request):
         try:
             data = request.data
-            serializer = UserLoginSerializer(data=data)
+            serializer = UserLoginSerializer(
+                data=data, context={"request": request})
             if serializer.is_valid():
-                email = serializer.validated_data["email"]
-                password = serializer.validated_data["password"]
-
-                user = authenticate(email=email, password=password)
-                if user:
-                    return Response(
-                        _get_tokens_for_user(user), status=status.HTTP_200_OK
-                    )
-                else:
-                    return Response(
-                        {"detail": "Invalid credentials"},
-                        status=status.HTTP_401_UNAUTHORIZED,
-                    )
+                user = serializer.validated_data["user"]
+                return Response(
+                    _get_tokens_for_user(user), status=status.HTTP_200_OK
+                )
             return Response(
                 {"message": "Something went wrong", "errors": serializer.errors},
                 status=status.HTTP_401_UNAUTHORIZED,
@@ -194,9 +212,11 @@ class LawyerRegisterAPIView(APIView):
 
             serializer = self.serializer_class(data=context)
             if serializer.is_valid():
-                lawyer = serializer.save()
+                serializer.save()
+                # Re-issue tokens so that they carry the new role claims.
                 return Response(
-                    {"message": "Lawyer registered successfully", "lawyer": lawyer},
+                    {"message": "Lawyer registered successfully", "lawyer": serializer.data,
+                     **_get_tokens_for_user(user)},
                     status=status.HTTP_201_CREATED,
                 )
             return Response(
@@ -244,9 +264,11 @@ class JudgeRegisterAPIView(APIView):
 
             serializer = self.serializer_class(data=context)
             if serializer.is_valid():
-                lawyer = serializer.save()
+                serializer.save()
+                # Re-issue tokens so that they carry the new role claims.
                 return Response(
-                    {"message": "Lawyer registered successfully", "lawyer": lawyer},
+                    {"message": "Lawyer registered successfully", "lawyer": serializer.data,
+                     **_get_tokens_for_user(user)},
                     status=status.HTTP_201_CREATED,
                 )
             return Response(
@@ -268,30 +290,63 @@ class JudgeRegisterAPIView(APIView):
 class ListLawyersAPIView(APIView):
     """
     API view to list lawyers based on lawyer_type and paginate the results.
+
+    With ``?pagination=cursor`` (or a ``cursor`` from a previous page) the
+    results are keyset paginated on ``-id`` and only the requested page is
+    returned, together with opaque ``next``/``previous`` cursors. Cursor pages
+    carry flat rows from ``LawyerProjection``; the default offset response
+    keeps the ``serialize("json")`` row layout. ``?fields=`` and ``?exclude=``
+    (comma separated) limit the columns selected from the database; ``id``
+    is always included.
+
+    Responses are cached per query string until a lawyer changes, and carry an
+    ETag so that unchanged listings can be answered with 304 Not Modified.
     """
     serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
+    cursor_ordering = ('-id',)
+    projection = LawyerProjection()
 
+    def get_queryset(self, request):
+        """
+        Returns the filtered, unpaginated lawyers for ``request``.
+        """
+        lawyer_type = request.GET.get('lawyer_type', Lawyer.Roles.CIVIL)
+        return LawyerFilter(
+            request.GET, queryset=Lawyer.objects.filter(lawyer_type=lawyer_type).order_by('-id')).qs
+
+    @replica_reads
+    @conditional_list_response(
+        last_modified=('updated_at', 'user__updated_at'),
+        view_name="lawyers", namespaces=lambda request: ["lawyer"])
+    @cache_list_response("lawyers", namespaces=lambda request: ["lawyer"])
     def get(self, request):
         context: dict = {}
-        filtered_users = None
         try:
+            filtered_users = self.get_queryset(request)
 
-            lawyer_type = request.GET.get('lawyer_type', Lawyer.Roles.CIVIL)
-            filtered_users = LawyerFilter(
-                request.GET, queryset=Lawyer.objects.filter(lawyer_type=lawyer_type).order_by('-id'))
+            if cursor_pagination_requested(request):
+                projection = self.projection.from_request(
+                    request, always=('id',) + paginator_fields(self.cursor_ordering))
+                paginator = KeysetPaginator(
+                    self.cursor_ordering, get_page_size(request))
+                page = paginator.paginate(
+                    projection.queryset(filtered_users), request.GET.get('cursor'))
+                return Response(page, status=status.HTTP_200_OK)
 
-            context['filtered_users'] = json.loads(
-                serialize("json", filtered_users.qs))
+            projection = self.projection.from_request(request)
+            context['filtered_users'] = projection.legacy_rows(
+                projection.rows(filtered_users))
 
             # Pagination
-            print(filtered_users.qs)
-            paginated_users = Paginator(filtered_users.qs, 10)
+            paginated_users = Paginator(
+                projection.queryset(filtered_users), 10)
             page_number = request.GET.get('page')
             page_obj = paginated_users.get_page(
                 page_number) if page_number else paginated_users.get_page(1)
 
-            context['page_obj'] = json.loads(serialize("json", page_obj))
+            context['page_obj'] = projection.legacy_rows(page_obj)
 
             return Response(context, status=status.HTTP_200_OK)
         except Exception as e:
@@ -307,32 +362,63 @@ class ListLawyersAPIView(APIView):
 class ListPreTrialsAPIView(APIView):
     """
     API endpoint that returns a list of pre-trials for the authenticated user.
+
+    Supports the same cursor pagination mode as ``ListLawyersAPIView``, keyed
+    on ``(date_registered, id)``, and the same ``?fields=``/``?exclude=``
+    column selection (cursor pages always include ``date_registered``).
+    Responses are cached per user and query
+    string until one of the user's pre-trials changes, and support the same
+    conditional GETs.
     """
     serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
+    cursor_ordering = ('date_registered', 'id')
+    projection = PreTrialProjection()
 
+    def get_queryset(self, request):
+        """
+        Returns the filtered, unpaginated pre-trials of the requesting user.
+        """
+        return PreTrialFilter(
+            request.GET, queryset=PreTrial.objects.all().filter(user_id=request.user.id).order_by('date_registered')).qs
+
+    @replica_reads
+    @conditional_list_response(
+        view_name="pretrials", namespaces=lambda request: [f"pretrial:{request.user.id}"])
+    @cache_list_response(
+        "pretrials",
+        namespaces=lambda request: [f"pretrial:{request.user.id}"],
+        scope=lambda request: request.user.id)
     def get(self, request):
         """
         GET request handler for the ListPreTrialsAPIView.
         """
         context: dict = {}
-        user = request.user
-        filtered_pretrials = None
         try:
-            filtered_pretrials = PreTrialFilter(
-                request.GET, queryset=PreTrial.objects.all().filter(user__email=user.email).order_by('date_registered'))
+            filtered_pretrials = self.get_queryset(request)
+
+            if cursor_pagination_requested(request):
+                projection = self.projection.from_request(
+                    request, always=('id',) + paginator_fields(self.cursor_ordering))
+                paginator = KeysetPaginator(
+                    self.cursor_ordering, get_page_size(request))
+                page = paginator.paginate(
+                    projection.queryset(filtered_pretrials), request.GET.get('cursor'))
+                return Response(page, status=status.HTTP_200_OK)
 
-            context['filtered_pretrials'] = json.loads(
-                serialize("json", filtered_pretrials.qs))
+            projection = self.projection.from_request(request)
+            context['filtered_pretrials'] = projection.legacy_rows(
+                projection.rows(filtered_pretrials))
 
             # Pagination
-            print(filtered_pretrials.qs)
-            paginated_pretrials = Paginator(filtered_pretrials.qs, 10)
+            paginated_pretrials = Paginator(
+                projection.queryset(filtered_pretrials), 10)
             page_number = request.GET.get('page')
             page_obj = paginated_pretrials.get_page(
                 page_number) if page_number else paginated_pretrials.get_page(1)
 
-            context['page_obj'] = json.loads(serialize("json", page_obj))
+            context['page_obj'] = projection.legacy_rows(page_obj)
 
             return Response(context, status=status.HTTP_200_OK)
 
@@ -344,3 +430,666 @@ class ListPreTrialsAPIView(APIView):
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+
+class SearchPreTrialsAPIView(APIView):
+    """
+    Full-text search over the case act and details of the authenticated
+    user's pre-trials.
+
+    ``?q=`` holds the search terms; every word must match and the last one
+    may be a prefix. Results are ordered by relevance and paginated with
+    ``?page=``/``?page_size=``. Each result carries its ``rank`` and a
+    ``snippet`` of the matching text with hits wrapped in ``<mark>`` tags.
+    Responses are cached per user and query string until one of the user's
+    pre-trials changes.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    @replica_reads
+    @cache_list_response(
+        "pretrial-search",
+        namespaces=lambda request: [f"pretrial:{request.user.id}"],
+        scope=lambda request: request.user.id)
+    def get(self, request):
+        """
+        GET request handler for the SearchPreTrialsAPIView.
+        """
+        try:
+            query = request.GET.get('q', '').strip()
+            if not query:
+                return Response(
+                    {
+                        "message": "Something went wrong",
+                        "errors": _("The q parameter is required"),
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            page_size = get_page_size(request)
+            page = max(1, int(request.GET.get('page', 1)))
+            # One extra row tells whether there is a next page without a COUNT.
+            rows = search_pretrials(
+                query, request.user.id, limit=page_size + 1,
+                offset=(page - 1) * page_size)
+
+            return Response(
+                {
+                    "results": rows[:page_size],
+                    "next": page + 1 if len(rows) > page_size else None,
+                    "previous": page - 1 if page > 1 else None,
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AutocompleteAPIView(APIView):
+    """
+    Type-ahead over user names, lawyer enrollment numbers and judge bar codes.
+
+    ``?q=`` is what the user typed so far. ``?kind=`` (comma separated
+    ``name``, ``enrollment_no``, ``bar_code``) narrows what is searched,
+    ``?user_type=`` restricts matches to one role and ``?limit=`` (at most 50)
+    sets how many matches are returned. Matches are read from the
+    ``AutocompleteEntry`` index only; see ``api.autocomplete.suggest``.
+    Only staff find clients; everyone else looks up lawyers and judges.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    @replica_reads
+    def get(self, request):
+        """
+        GET request handler for the AutocompleteAPIView.
+        """
+        try:
+            kinds = [kind.strip() for kind in request.GET.get('kind', '').split(',')
+                     if kind.strip()]
+            unknown = set(kinds) - set(AutocompleteEntry.Kinds.values)
+            if unknown:
+                raise ValueError(f"Unknown kind(s): {', '.join(sorted(unknown))}")
+
+            results = suggest(
+                request.GET.get('q', ''),
+                kinds=kinds,
+                user_type=request.GET.get('user_type'),
+                user_types=None if getattr(request.user, 'is_staff', False)
+                else PUBLIC_USER_TYPES,
+                limit=get_page_size(request, default=10, maximum=50, param='limit'))
+            return Response({"results": results}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class CaseFileAPIView(APIView):
+    """
+    Returns complete case files of the authenticated user: pre-trials with
+    their hearings and the hearings' documents.
+
+    ``GET api/v1/casefile/<pk>/`` returns one case file and
+    ``GET api/v1/casefile/?ids=1,2`` several; without ``ids`` the first
+    ``?limit=`` (at most 100) pre-trials by registration date are returned.
+    ``?depth=`` (0-2, default 2) controls how deep the tree goes and
+    ``?hearings_limit=``/``?documents_limit=`` cap the children returned per
+    parent. The whole tree is loaded in ``depth + 1`` queries.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    @staticmethod
+    def _optional_int(request, name):
+        value = request.GET.get(name)
+        if value in (None, ''):
+            return None
+        value = int(value)
+        if value < 0:
+            raise ValueError(f"{name} must not be negative")
+        return value
+
+    def get(self, request, pk=None):
+        """
+        GET request handler for the CaseFileAPIView.
+        """
+        try:
+            depth = self._optional_int(request, 'depth')
+            depth = MAX_DEPTH if depth is None else min(depth, MAX_DEPTH)
+
+            pretrials = PreTrial.objects.filter(
+                user_id=request.user.id).order_by('date_registered', 'id')
+            if pk is not None:
+                pretrials = pretrials.filter(pk=pk)
+            elif request.GET.get('ids'):
+                ids = [int(value) for value in request.GET['ids'].split(',') if value.strip()]
+                pretrials = pretrials.filter(pk__in=ids[:100])
+            else:
+                pretrials = pretrials[:get_page_size(request, default=10, param='limit')]
+
+            case_files = load_case_files(
+                pretrials, depth=depth,
+                hearings_limit=self._optional_int(request, 'hearings_limit'),
+                documents_limit=self._optional_int(request, 'documents_limit'))
+
+            if pk is not None:
+                if not case_files:
+                    return Response(
+                        {"message": "Case file not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                return Response(case_files[0], status=status.HTTP_200_OK)
+            return Response({"results": case_files}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class _BulkAPIView(APIView):
+    """
+    Base view for bulk writes. ``POST`` creates one row per item of a JSON
+    list and ``PATCH`` updates the rows addressed by the items' ``id`` with
+    the fields they contain. Either every item is written, in one
+    transaction, or none is and the response lists the errors of each
+    invalid item by its index.
+    """
+    serializer_class = None
+    # Writes check the account as it is now, not the role claims of a token
+    # issued before a demotion.
+    authentication_classes = (GenerationJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    writer_class = None
+
+    def _write(self, request, write, success_status):
+        try:
+            result = write(self.writer_class(request.user), request.data)
+            return Response(result, status=success_status)
+        except BulkValidationError as e:
+            return Response(
+                {
+                    "message": "Validation failed",
+                    "errors": e.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    def post(self, request):
+        """
+        Creates the records, returning their ids in request order.
+        """
+        return self._write(
+            request, lambda writer, items: {"created": writer.create(items)},
+            status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        """
+        Updates the records, returning how many were updated.
+        """
+        return self._write(
+            request, lambda writer, items: {"updated": writer.update(items)},
+            status.HTTP_200_OK)
+
+
+class BulkPreTrialsAPIView(_BulkAPIView):
+    """
+    Bulk creates and updates pre-trials of the authenticated user.
+    """
+    writer_class = PreTrialBulkWriter
+
+
+class BulkHearingsAPIView(_BulkAPIView):
+    """
+    Bulk creates and updates hearings, e.g. a day's cause list. Clients may
+    only write hearings of their own pre-trials, judges also of the
+    pre-trials and hearings assigned to them, and staff of any. Items may
+    book a ``judge``, ``courtroom`` and ``duration``; slots outside court
+    hours or taken are reported like any other invalid item.
+    """
+    writer_class = HearingBulkWriter
+
+
+class ExportAPIView(APIView):
+    """
+    Streams every pre-trial, hearing or document row as NDJSON or CSV.
+
+    ``GET api/v1/export/<name>/`` with ``name`` one of ``pretrial``,
+    ``hearing`` or ``document``. ``?output=csv`` switches from NDJSON to CSV
+    and ``?after=<id>`` resumes an interrupted export after the last id
+    received. Rows come in id order and are streamed as they are read, so
+    memory stays flat however large the table is. Staff export all rows,
+    everyone else the rows of their own pre-trials.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    @replica_reads
+    def get(self, request, name):
+        """
+        GET request handler for the ExportAPIView.
+        """
+        try:
+            output = request.GET.get('output', 'ndjson')
+            after = request.GET.get('after')
+            is_staff = getattr(request.user, 'is_staff', False)
+            queryset = export_queryset(
+                name, user=None if is_staff else request.user,
+                after=int(after) if after else None)
+            response = StreamingHttpResponse(
+                stream_export(queryset, output, all_shards=is_staff),
+                content_type=FORMATS.get(output))
+            response["Content-Disposition"] = f'attachment; filename="{name}.{output}"'
+            return response
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class ScheduleHearingAPIView(APIView):
+    """
+    Schedules a hearing, refusing slots in which its judge or courtroom is
+    already booked.
+
+    The request carries the hearing (``pretrial``, ``judge``, ``courtroom``,
+    ``scheduled_date``, ``scheduled_time``, ``duration`` in minutes). A taken
+    slot is answered with 409 Conflict naming the hearing holding it, unless
+    ``auto`` is set, in which case the hearing takes the next free slot.
+    Clients schedule hearings of their own pre-trials, judges also of those
+    assigned to them, and staff of any. Only staff and the pre-trial's
+    assigned judge may name the ``judge``.
+    """
+    serializer_class = HearingScheduleSerializer
+    authentication_classes = (GenerationJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        """
+        POST request handler for the ScheduleHearingAPIView.
+        """
+        try:
+            serializer = self.serializer_class(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {"message": "Something went wrong", "errors": serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            data = dict(serializer.validated_data)
+
+            assigned = list(PreTrial.objects.filter(
+                pretrial_scope(request.user), pk=data['pretrial_id']).values_list(
+                'judge_id', flat=True)[:1])
+            if not assigned:
+                return Response(
+                    {"message": "Pre-trial not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if data.get('judge_id') is not None and \
+                    not may_set_judge(request.user, assigned[0], data['judge_id']):
+                return Response(
+                    {"message": "Only staff or the assigned judge can choose the judge"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            hearing = schedule_hearing(**data)
+            return Response(
+                self.serializer_class(hearing).data, status=status.HTTP_201_CREATED)
+        except SchedulingConflict as e:
+            return Response(
+                {
+                    "message": "Scheduling conflict",
+                    "errors": _(str(e)),
+                    "hearing": e.hearing_id,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class NextFreeSlotAPIView(APIView):
+    """
+    Returns the next slot in which a judge and/or a courtroom are free.
+
+    ``?judge=``, ``?courtroom=``, ``?duration=`` (minutes, default 30) and
+    ``?after=`` (ISO datetime, default now). ``slot`` is ``null`` if nothing
+    is free within the scheduling horizon.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """
+        GET request handler for the NextFreeSlotAPIView.
+        """
+        try:
+            judge = request.GET.get('judge')
+            after = request.GET.get('after')
+            slot = next_free_slot(
+                judge_id=int(judge) if judge else None,
+                courtroom=request.GET.get('courtroom') or None,
+                duration=int(request.GET.get('duration', 30)),
+                after=datetime.datetime.fromisoformat(after) if after else None)
+            return Response({"slot": slot}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class RescheduleJudgeAPIView(APIView):
+    """
+    Moves every hearing of a judge between ``from`` and ``to`` (inclusive
+    dates) to the next free slots from ``start`` on (default: the day after
+    ``to``), keeping their order. Only the judge and staff may do so.
+    """
+    serializer_class = None
+    authentication_classes = (GenerationJWTAuthentication,)
+    permission_classes = (IsAuthenticated, IsJudge | IsAdminUser)
+
+    def post(self, request, pk):
+        """
+        POST request handler for the RescheduleJudgeAPIView.
+        """
+        try:
+            # The permissions let judges and staff in; judges only for
+            # their own hearings.
+            user = request.user
+            if not user.is_staff and not Judge.objects.filter(pk=pk, user_id=user.id).exists():
+                return Response(
+                    {"message": "You can only reschedule your own hearings"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            date = datetime.date.fromisoformat
+            start = request.data.get('start')
+            moves = reschedule_judge(
+                pk, date(request.data['from']), date(request.data['to']),
+                start=date(start) if start else None)
+            return Response({"moved": moves}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class CalendarAPIView(APIView):
+    """
+    Returns the hearings of the authenticated user, as client or as judge,
+    between ``?from=`` and ``?to=`` (ISO dates, inclusive, at most 92 days
+    apart; ``to`` defaults to ``from``), ordered by date and time. Read from
+    the materialized ``CalendarEntry`` table with one indexed range scan.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    max_days = 92
+
+    def get(self, request):
+        """
+        GET request handler for the CalendarAPIView.
+        """
+        try:
+            date_from = datetime.date.fromisoformat(request.GET['from'])
+            date_to = datetime.date.fromisoformat(request.GET.get('to', request.GET['from']))
+            if not 0 <= (date_to - date_from).days <= self.max_days:
+                raise ValueError(
+                    f"to must be on or after from and at most {self.max_days} days later")
+            entries = list(calendar(request.user.id, date_from, date_to))
+            return Response({"results": entries}, status=status.HTTP_200_OK)
+        except KeyError:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _("The from parameter is required"),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class CauseListAPIView(APIView):
+    """
+    Returns the cause list of a judge for ``?date=`` (default today): the
+    day's hearings in order, read from the materialized calendar with one
+    index seek.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, pk):
+        """
+        GET request handler for the CauseListAPIView.
+        """
+        try:
+            day = request.GET.get('date')
+            day = datetime.date.fromisoformat(day) if day else timezone.localdate()
+            return Response(
+                {"date": day, "results": list(cause_list(pk, day))},
+                status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AssignPreTrialAPIView(APIView):
+    """
+    Assigns a pre-trial to the least loaded judge. A pre-trial that already
+    has a judge keeps it unless ``reassign`` is true. Staff only.
+    """
+    serializer_class = None
+    authentication_classes = (GenerationJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, pk):
+        """
+        POST request handler for the AssignPreTrialAPIView.
+        """
+        if not manages_all_hearings(request.user):
+            return Response(
+                {"message": "Only staff can assign pre-trials"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        try:
+            judge_id = assign_pretrial(pk, reassign=bool(request.data.get('reassign', False)))
+            return Response({"pretrial": pk, "judge": judge_id}, status=status.HTTP_200_OK)
+        except PreTrial.DoesNotExist:
+            return Response({"message": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AssignBacklogAPIView(APIView):
+    """
+    Assigns every unassigned pre-trial (or the oldest ``limit`` ones) to
+    judges in one batch, balancing their loads, and reports the fairness of
+    the loads before and after. Staff only.
+    """
+    serializer_class = None
+    authentication_classes = (GenerationJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        """
+        POST request handler for the AssignBacklogAPIView.
+        """
+        if not manages_all_hearings(request.user):
+            return Response(
+                {"message": "Only staff can assign pre-trials"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        try:
+            limit = request.data.get('limit')
+            result = assign_backlog(limit=int(limit) if limit else None)
+            return Response(result, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class JudgeLoadAPIView(APIView):
+    """
+    Returns the load counters of every judge, least loaded first, with
+    their fairness metrics. Judges and staff only.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated, IsJudge | IsAdminUser)
+
+    def get(self, request):
+        """
+        GET request handler for the JudgeLoadAPIView.
+        """
+        loads = judge_loads()
+        return Response(
+            {"fairness": fairness(row['load'] for row in loads), "results": loads},
+            status=status.HTTP_200_OK,
+        )
+
+
+class DashboardAPIView(APIView):
+    """
+    Returns the operations dashboard: lawyers per type, users per type, the
+    motion-granted ratio, pre-trials per month and hearings per day between
+    ``?from=`` and ``?to=`` (ISO dates, at most 366 days apart; default the
+    30 days either side of today). Read from the ``SummaryCount`` table
+    with one query, never from the source tables. Judges and staff only.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated, IsJudge | IsAdminUser)
+    max_days = 366
+
+    @replica_reads
+    def get(self, request):
+        """
+        GET request handler for the DashboardAPIView.
+        """
+        try:
+            today = timezone.localdate()
+            window = datetime.timedelta(days=30)
+            date_from = request.GET.get('from')
+            date_to = request.GET.get('to')
+            date_from = datetime.date.fromisoformat(date_from) if date_from else today - window
+            date_to = datetime.date.fromisoformat(date_to) if date_to else today + window
+            if not 0 <= (date_to - date_from).days <= self.max_days:
+                raise ValueError(
+                    f"'to' must be within {self.max_days} days on or after 'from'")
+            return Response(dashboard(date_from, date_to), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class ChangesAPIView(APIView):
+    """
+    Change feed for offline clients: the lawyers, or the user's own
+    pre-trials, created, updated or deleted since a watermark.
+
+    ``GET api/v1/changes/<name>/`` with ``name`` one of ``lawyer`` or
+    ``pretrial`` returns every row, then ``?since=`` with the ``next``
+    watermark of the previous response returns only ``changed`` rows and
+    ``deleted`` ids after it. At most ``?page_size=`` (default 100, up to
+    1000) of each are returned; while ``has_more`` is true, call again
+    with the new watermark. Watermarks older than the tombstones kept are
+    answered with 410 Gone: drop the local copy and sync from scratch.
+    """
+    serializer_class = None
+    authentication_classes = (ClaimsJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, name):
+        """
+        GET request handler for the ChangesAPIView.
+        """
+        try:
+            page = changes(
+                name, request.user, since=request.GET.get('since'),
+                limit=get_page_size(request, default=100, maximum=1000))
+            return Response(page, status=status.HTTP_200_OK)
+        except WatermarkExpired as e:
+            return Response({"message": _(str(e))}, status=status.HTTP_410_GONE)
+        except Exception as e:
+            return Response(
+                {
+                    "message": "Something went wrong",
+                    "errors": _(str(e)),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
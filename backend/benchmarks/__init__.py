@@ -0,0 +1,70 @@
+"""
+Micro benchmarks for the API hot paths.
+
+Run them from the ``backend`` directory, e.g.::
+
+    python -m benchmarks.bench_serialization
+
+Each benchmark creates a throwaway test database, so it never touches
+``db.sqlite3``.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup_django(sqlite_path=None):
+    """
+    Configures Django and creates a fresh test database.
+
+    Args:
+        sqlite_path (str, optional): File to create a SQLite test database
+            in instead of memory, so that threads each open their own
+            connection to it as workers would.
+
+    Returns:
+        callable: Tears the test database down again.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nyay.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    if sqlite_path and connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = sqlite_path
+    connection.creation.create_test_db(verbosity=0)
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return teardown
+
+
+@contextmanager
+def timer(label, count, unit="rows"):
+    """
+    Times the wrapped block and prints ``count`` per second.
+    """
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {count / elapsed:14,.0f} {unit}/sec")
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` hook counting executed statements. Unlike
+    ``CaptureQueriesContext`` it is not capped at 9000 queries.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
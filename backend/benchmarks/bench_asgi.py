@@ -0,0 +1,169 @@
+"""
+Sync (WSGI) against async (ASGI) serving of the read endpoints.
+
+    python -m benchmarks.bench_asgi [clients] [seconds] [workers]
+
+Seeds a throwaway SQLite file, then starts the project twice: under
+gunicorn's sync workers (``nyay.wsgi``, ``--threads 4``) and under gunicorn
+with uvicorn workers (``nyay.asgi``). ``clients`` concurrent keep-alive
+connections (default 500) hammer each server for ``seconds`` per endpoint:
+the pre-trial listing, the search and the case files, through the sync
+paths on the WSGI server and the ``api/v1/async/`` paths on the ASGI one.
+Prints requests/sec and the p50/p99 latency of each.
+
+The response cache is disabled (``LIST_CACHE_TIMEOUT=0``) so every request
+reaches the database.
+"""
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+ENDPOINTS = [
+    ("list", "list/pretrial/?pagination=cursor&page_size=20"),
+    ("search", "search/pretrial/?q=fraud&page_size=10"),
+    ("casefile", "casefile/?limit=5&hearings_limit=5"),
+]
+
+
+def _seed(env) -> str:
+    """
+    Migrates and fills the database named by ``env``; returns an access token.
+    """
+    os.environ.update(env)
+    import django
+    django.setup()
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    from api.models import Hearing, PreTrial, UserAccount
+    from api.views import _get_tokens_for_user
+
+    user = UserAccount.objects.create_user(
+        email="bench@example.com", name="Bench", password="x")
+    pretrials = PreTrial.objects.bulk_create([
+        PreTrial(user=user, case_act=f"IPC {400 + i % 100}",
+                 details="Cheating and fraud" if i % 3 else "Criminal breach of trust")
+        for i in range(2000)], batch_size=1000)
+    Hearing.objects.bulk_create([
+        Hearing(pretrial=pretrial, scheduled_time="10:00") for pretrial in pretrials
+        for _ in range(3)], batch_size=1000)
+    return _get_tokens_for_user(user)["access"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(command, env, port):
+    process = subprocess.Popen(
+        command, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{command[0]} did not start")
+
+
+# START: Load generator
+async def _request(reader, writer, request):
+    writer.write(request)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    headers = dict(
+        line.split(b":", 1) for line in head.split(b"\r\n")[1:] if b":" in line)
+    headers = {name.strip().lower(): value.strip().lower() for name, value in headers.items()}
+    await reader.readexactly(int(headers.get(b"content-length", 0)))
+    return int(head.split(b" ", 2)[1]), headers.get(b"connection") == b"close"
+
+
+async def _client(port, request, until, latencies, errors):
+    connection = None
+    while time.monotonic() < until:
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", port)
+            status, close = await _request(*connection, request)
+        except (OSError, asyncio.IncompleteReadError):
+            errors.append(1)
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+        if close:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def _load(port, path, token, clients, seconds):
+    request = (f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+               f"Authorization: Bearer {token}\r\n\r\n").encode()
+    latencies, errors = [], []
+    start = time.monotonic()
+    await asyncio.gather(*(
+        _client(port, request, start + seconds, latencies, errors) for _ in range(clients)))
+    # Requests in flight at the deadline are waited for and counted.
+    return latencies, errors, time.monotonic() - start
+# END: Load generator
+
+
+def _report(label, latencies, errors, elapsed):
+    latencies.sort()
+    if not latencies:
+        print(f"{label:<24} no responses, {len(errors)} errors")
+        return
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"{label:<24} {len(latencies) / elapsed:10,.0f} req/sec"
+          f"  p50 {percentile(0.5):8.1f} ms  p99 {percentile(0.99):8.1f} ms"
+          f"  errors {len(errors)}")
+
+
+def main(clients=500, seconds=10, workers=4):
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ,
+               DJANGO_SETTINGS_MODULE="nyay.settings",
+               SECRET_KEY=os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+               SQLITE_PATH=str(Path(directory) / "bench.sqlite3"),
+               LIST_CACHE_TIMEOUT="0")
+    token = _seed(env)
+
+    servers = {
+        "wsgi": (["gunicorn", "nyay.wsgi", "--workers", str(workers), "--threads", "4",
+                  "--backlog", "4096"], "/api/v1/"),
+        "asgi": (["gunicorn", "nyay.asgi:application", "--workers", str(workers),
+                  "--worker-class", "uvicorn.workers.UvicornWorker",
+                  "--backlog", "4096"], "/api/v1/async/"),
+    }
+    for mode, (command, prefix) in servers.items():
+        port = _free_port()
+        process = _start([*command, "--bind", f"127.0.0.1:{port}"], env, port)
+        try:
+            for name, path in ENDPOINTS:
+                _report(f"{mode} {name}", *asyncio.run(
+                    _load(port, prefix + path, token, clients, seconds)))
+        finally:
+            process.terminate()
+            process.wait()
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
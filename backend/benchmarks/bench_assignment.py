@@ -0,0 +1,59 @@
+"""
+Judge assignment.
+
+    python -m benchmarks.bench_assignment [judges] [pretrials]
+
+Creates ``judges`` judges with random caseloads, times assigning pre-trials
+one at a time through the ``(load, id)`` index, then a batch assignment of
+the remaining backlog, and compares both with a full recount.
+"""
+import random
+import sys
+
+from benchmarks import setup_django, timer
+
+
+def main(judges=500, count=20_000):
+    teardown = setup_django()
+    try:
+        from api.assignment import (assign_backlog, assign_pretrial,
+                                    judge_loads, refresh_judge_load)
+        from api.models import Judge, PreTrial, UserAccount
+
+        user = UserAccount.objects.create_user(
+            email="bench@example.com", name="Bench", password="x")
+        accounts = UserAccount.objects.bulk_create([
+            UserAccount(email=f"judge{i}@example.com", name=f"Judge {i}",
+                        user_type=UserAccount.Roles.JUDGE) for i in range(judges)])
+        rng = random.Random(0)
+        pool = Judge.objects.bulk_create([
+            Judge(user=account, bar_code=f"BC-{i}") for i, account in enumerate(accounts)])
+        pretrials = PreTrial.objects.bulk_create(
+            [PreTrial(user=user, case_act=f"Case {i}") for i in range(count)], batch_size=5000)
+        # Skew the starting loads: a few judges carry most of the old cases.
+        PreTrial.objects.bulk_update([
+            PreTrial(pk=pretrial.pk, judge_id=pool[int(rng.paretovariate(1.2)) % judges].pk)
+            for pretrial in pretrials[:count // 2]], ['judge'], batch_size=1000)
+        refresh_judge_load()
+
+        single = pretrials[count // 2:count // 2 + 1000]
+        with timer("assign_pretrial", len(single), "pre-trials"):
+            for pretrial in single:
+                assign_pretrial(pretrial.pk)
+
+        remaining = PreTrial.objects.filter(judge__isnull=True).count()
+        with timer("assign_backlog", remaining, "pre-trials"):
+            result = assign_backlog()
+        print(f"  before: {result['before']}")
+        print(f"  after:  {result['after']}")
+
+        incremental = judge_loads()
+        with timer("refresh_judge_load", judges, "judges"):
+            refresh_judge_load()
+        assert judge_loads() == incremental, "incremental counters drifted"
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""
+Autocomplete latency.
+
+    python -m benchmarks.bench_autocomplete [users] [lookups]
+
+Loads ``users`` accounts (a tenth of them lawyers), builds the index with
+``rebuild_index`` and reports p50/p99 latencies of ``suggest`` for random
+one to four character prefixes. The target is a p99 under 20ms at 1M users.
+"""
+import random
+import string
+import sys
+import time
+
+from benchmarks import setup_django, timer
+
+FIRST = ["rahul", "sunita", "amit", "priya", "vikram", "anjali", "rohan", "kavya"]
+LAST = ["sharma", "shah", "verma", "iyer", "khan", "singh", "das", "rao"]
+
+
+def main(users=100_000, lookups=2000):
+    teardown = setup_django()
+    try:
+        from api.autocomplete import rebuild_index, suggest
+        from api.models import Lawyer, UserAccount
+
+        rng = random.Random(0)
+        batch = 10_000
+        for start in range(0, users, batch):
+            accounts = UserAccount.objects.bulk_create([
+                UserAccount(
+                    email=f"user{i}@example.com",
+                    name=f"{rng.choice(FIRST)} {rng.choice(LAST)}{i}",
+                    user_type=UserAccount.Roles.LAWYER if i % 10 == 0
+                    else UserAccount.Roles.CLIENT)
+                for i in range(start, min(start + batch, users))])
+            Lawyer.objects.bulk_create([
+                Lawyer(user=account, enrollment_no=f"D/{account.pk}/2020")
+                for account in accounts if account.user_type == UserAccount.Roles.LAWYER])
+
+        with timer("rebuild_index", users, "users"):
+            rebuild_index()
+
+        latencies = []
+        for _ in range(lookups):
+            prefix = "".join(rng.choice(string.ascii_lowercase)
+                             for _ in range(rng.randint(1, 4)))
+            start = time.perf_counter()
+            suggest(prefix, limit=10)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"{'suggest':<40} p50 {p50:6.2f}ms  p99 {p99:6.2f}ms")
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""
+Importing a cause list of hearings.
+
+    python -m benchmarks.bench_bulk [hearings]
+
+Compares saving every hearing on its own with ``POST /api/v1/bulk/hearing/``
+and then updates all of them with ``PATCH``, once setting the same value
+on every hearing and once a distinct value per hearing.
+"""
+import datetime
+import sys
+
+from benchmarks import setup_django, timer
+
+
+def main(count=10_000):
+    teardown = setup_django()
+    try:
+        from rest_framework.test import APIClient
+
+        from api.models import Hearing, PreTrial, UserAccount
+
+        user = UserAccount.objects.create_user(
+            email="clerk@example.com", name="Clerk", password="x")
+        user.is_staff = True
+        pretrials = PreTrial.objects.bulk_create([
+            PreTrial(user=user, case_act=f"IPC {i}") for i in range(100)])
+        items = [
+            {"pretrial": pretrials[i % 100].pk,
+             "scheduled_date": str(datetime.date(2023, 1, 1) + datetime.timedelta(days=i % 300)),
+             "scheduled_time": "10:30"}
+            for i in range(count)]
+
+        with timer("save() per hearing (before)", count, "hearings"):
+            for item in items:
+                Hearing(pretrial_id=item["pretrial"], scheduled_date=item["scheduled_date"],
+                        scheduled_time=item["scheduled_time"]).save()
+        Hearing.objects.all().delete()
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with timer("POST /api/v1/bulk/hearing/ (after)", count, "hearings"):
+            response = client.post("/api/v1/bulk/hearing/", items, format="json")
+        assert response.status_code == 201, response.content
+
+        ids = response.data["created"]
+        for label, updates in [
+            ("PATCH, same values", [{"id": pk, "motion_granted": True} for pk in ids]),
+            ("PATCH, distinct values", [{"id": pk, "motion_details": f"Motion {pk}"}
+                                        for pk in ids]),
+        ]:
+            with timer(label, count, "hearings"):
+                response = client.patch("/api/v1/bulk/hearing/", updates, format="json")
+            assert response.status_code == 200, response.content
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
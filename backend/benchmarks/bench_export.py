@@ -0,0 +1,49 @@
+"""
+Export throughput and peak memory.
+
+    python -m benchmarks.bench_export [rows]
+
+Compares dumping every pre-trial with ``serialize("json")``, as the list
+views did, with ``stream_export`` in both formats. Peak Python memory is
+measured with ``tracemalloc``.
+"""
+import sys
+import tracemalloc
+
+from benchmarks import setup_django, timer
+
+
+def measure(label, count, run):
+    tracemalloc.start()
+    with timer(label, count):
+        run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'':<40} peak {peak / 2**20:8.1f} MiB")
+
+
+def main(count=100_000):
+    teardown = setup_django()
+    try:
+        from django.core import serializers
+
+        from api.export import export_queryset, stream_export
+        from api.models import PreTrial, UserAccount
+
+        user = UserAccount.objects.create_user(
+            email="bench@example.com", name="Bench", password="x")
+        PreTrial.objects.bulk_create(
+            [PreTrial(user=user, case_act=f"IPC {i}", details="Details " * 20)
+             for i in range(count)], batch_size=5000)
+
+        measure('serialize("json") (before)', count,
+                lambda: serializers.serialize("json", PreTrial.objects.all()))
+        for output in ("ndjson", "csv"):
+            measure(f"stream_export {output} (after)", count, lambda: sum(
+                len(line) for line in stream_export(export_queryset('pretrial'), output)))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,59 @@
+"""
+Login throughput on a single core.
+
+    python -m benchmarks.bench_login [logins]
+
+For each password hasher, compares the original login flow (the serializer
+and the view each calling ``authenticate()``) with ``POST /api/v1/login/``,
+which verifies the password once.
+"""
+import sys
+
+from benchmarks import setup_django, timer
+
+PASSWORD = "bench-password-1"
+HASHERS = {
+    "pbkdf2": 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    "argon2": 'api.hashers.TunedArgon2PasswordHasher',
+}
+
+
+def main(count=50):
+    teardown = setup_django()
+    try:
+        from django.conf import settings
+        from django.contrib.auth import authenticate
+        from django.test import override_settings
+        from rest_framework.test import APIClient
+
+        from api.models import UserAccount
+        from api.views import _get_tokens_for_user
+
+        user = UserAccount.objects.create_user(
+            email="bench@example.com", name="Bench", password=PASSWORD)
+        client = APIClient()
+        credentials = {"email": user.email, "password": PASSWORD}
+
+        for name, preferred in HASHERS.items():
+            hashers = [preferred] + [
+                hasher for hasher in settings.PASSWORD_HASHERS if hasher != preferred]
+            with override_settings(PASSWORD_HASHERS=hashers):
+                user.set_password(PASSWORD)
+                user.save()
+
+                with timer(f"{name}: authenticate twice (before)", count, "logins"):
+                    for _ in range(count):
+                        authenticate(**credentials)
+                        _get_tokens_for_user(authenticate(**credentials))
+
+                with timer(f"{name}: POST /api/v1/login/ (after)", count, "logins"):
+                    for _ in range(count):
+                        response = client.post(
+                            "/api/v1/login/", credentials, format="json")
+                assert response.status_code == 200, response.content
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
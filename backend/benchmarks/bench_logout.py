@@ -0,0 +1,62 @@
+"""
+"Logout everywhere" with 10k outstanding refresh tokens.
+
+    python -m benchmarks.bench_logout [tokens]
+
+Compares the original ``get_or_create`` per token loop with
+``api.tokens.revoke_user_tokens`` and reports the query count of each.
+"""
+import datetime
+import sys
+
+from benchmarks import QueryCounter, setup_django, timer
+
+
+def _seed(user, count):
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import \
+        OutstandingToken
+
+    expires_at = timezone.now() + datetime.timedelta(days=3)
+    OutstandingToken.objects.bulk_create(
+        (OutstandingToken(user=user, jti=f"{user.pk}-{i}", token="x",
+                          expires_at=expires_at) for i in range(count)),
+        batch_size=5000)
+
+
+def main(count=10_000):
+    teardown = setup_django()
+    try:
+        from django.db import connection
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken, OutstandingToken)
+
+        from api.models import UserAccount
+        from api.tokens import revoke_user_tokens
+
+        loop_user = UserAccount.objects.create_user(
+            email="loop@example.com", name="Loop", password="bench")
+        bulk_user = UserAccount.objects.create_user(
+            email="bulk@example.com", name="Bulk", password="bench")
+        _seed(loop_user, count)
+        _seed(bulk_user, count)
+
+        print(f"{count:,} outstanding tokens")
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            with timer("get_or_create per token", count, "tokens"):
+                for token in OutstandingToken.objects.filter(user=loop_user):
+                    BlacklistedToken.objects.get_or_create(token=token)
+        print(f"{'':<40} {queries.count:,} queries")
+
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            with timer("revoke_user_tokens", count, "tokens"):
+                revoked = revoke_user_tokens(bulk_user)
+        print(f"{'':<40} {queries.count:,} queries, {revoked:,} revoked")
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""
+Hearing scheduling.
+
+    python -m benchmarks.bench_scheduling [hearings] [checks]
+
+Books ``hearings`` across 50 judges, times conflict checks and next free
+slot lookups through ``Schedule`` and then reschedules two weeks of one
+judge's hearings at once.
+"""
+import datetime
+import random
+import sys
+
+from benchmarks import setup_django, timer
+
+
+def main(count=50_000, checks=500):
+    teardown = setup_django()
+    try:
+        from api.models import Hearing, Judge, PreTrial, UserAccount
+        from api.scheduling import Schedule, reschedule_judge
+
+        user = UserAccount.objects.create_user(
+            email="bench@example.com", name="Bench", password="x")
+        pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+        judges = [Judge.objects.create(
+            user=UserAccount.objects.create(email=f"judge{i}@example.com", name=f"Judge {i}"),
+            bar_code=f"BC-{i}") for i in range(50)]
+
+        # Ten 30 minute hearings a day per judge, on working days only, which
+        # leaves 15:00-17:00 free.
+        first = datetime.date(2023, 1, 2)
+        hearings, day = [], first
+        while len(hearings) < count:
+            if day.weekday() < 5:
+                for judge in judges:
+                    for slot in range(10):
+                        minute = 600 + slot * 30
+                        hearings.append(Hearing(
+                            pretrial=pretrial, judge=judge, courtroom=f"R{judge.pk}",
+                            scheduled_date=day, scheduled_time=datetime.time(minute // 60, minute % 60),
+                            duration=30))
+            day += datetime.timedelta(days=1)
+        Hearing.objects.bulk_create(hearings[:count], batch_size=5000)
+        last = day
+
+        rng = random.Random(0)
+        with timer("conflict check", checks, "checks"):
+            for _ in range(checks):
+                schedule = Schedule()
+                judge = rng.choice(judges)
+                index = schedule.index(("judge", judge.pk), first + datetime.timedelta(
+                    days=rng.randrange((last - first).days)))
+                index.conflict(700, 730)
+
+        with timer("next free slot", checks, "lookups"):
+            for _ in range(checks):
+                judge = rng.choice(judges)
+                Schedule().next_free(
+                    [("judge", judge.pk)], datetime.datetime.combine(first, datetime.time(9)), 30)
+
+        judge = judges[0]
+        moved = Hearing.objects.filter(
+            judge=judge, scheduled_date__range=(first, first + datetime.timedelta(days=13))).count()
+        with timer("reschedule_judge (2 weeks)", moved, "hearings"):
+            reschedule_judge(judge.pk, first, first + datetime.timedelta(days=13))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
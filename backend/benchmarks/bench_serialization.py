@@ -0,0 +1,51 @@
+"""
+Rows/sec of the list view serialization paths on 100k pretrials.
+
+    python -m benchmarks.bench_serialization [rows]
+
+* ``serialize+loads+DRF``: the original ``serialize("json")`` -> ``json.loads``
+  -> ``JSONRenderer`` round trip.
+* ``projection+legacy``: ``values()`` projection reshaped into the legacy
+  layout and rendered with ``FastJSONRenderer``.
+* ``projection+flat``: ``values()`` projection rendered as plain dicts, as
+  served by the cursor pagination mode.
+"""
+import json
+import sys
+
+from benchmarks import setup_django, timer
+
+
+def main(count=100_000):
+    teardown = setup_django()
+    try:
+        from django.core.serializers import serialize
+        from rest_framework.renderers import JSONRenderer
+
+        from api.models import PreTrial, UserAccount
+        from api.projections import PreTrialProjection
+        from api.renderers import FastJSONRenderer
+
+        user = UserAccount.objects.create_user(
+            email="bench@example.com", name="Bench", password="bench")
+        PreTrial.objects.bulk_create(
+            (PreTrial(user=user, case_act=f"Section {i} IPC", details="x" * 200)
+             for i in range(count)),
+            batch_size=5000)
+        queryset = PreTrial.objects.filter(user=user).order_by('date_registered')
+        projection = PreTrialProjection()
+
+        print(f"{count:,} pretrials")
+        with timer("serialize+loads+DRF", count):
+            JSONRenderer().render(json.loads(serialize("json", queryset)))
+        with timer("projection+legacy+FastJSONRenderer", count):
+            FastJSONRenderer().render(
+                projection.legacy_rows(projection.rows(queryset)))
+        with timer("projection+flat+FastJSONRenderer", count):
+            FastJSONRenderer().render(projection.rows(queryset))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
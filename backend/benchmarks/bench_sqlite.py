@@ -0,0 +1,88 @@
+"""
+Write contention on one SQLite file.
+
+    python -m benchmarks.bench_sqlite [threads] [hearings]
+
+``threads`` threads (default 16), each with its own connection like a
+gunicorn worker, schedule ``hearings`` hearings each (default 50) with
+``schedule_hearing``, which reads the bookings and then inserts. Compares
+the rollback journal with deferred transactions (before), the WAL and
+pragmas of ``settings.SQLITE_PRAGMAS``, and those with ``BEGIN
+IMMEDIATE``, printing hearings/sec and how many failed with "database is
+locked".
+"""
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from benchmarks import setup_django, timer
+
+MONDAY = datetime.date(2024, 1, 8)
+
+
+def _worker(thread, count, pretrial_id, failures):
+    from django.db import OperationalError, connection
+
+    from api.scheduling import schedule_hearing
+
+    try:
+        for i in range(count):
+            try:
+                schedule_hearing(
+                    pretrial_id, courtroom=f"Court {thread % 4}", scheduled_date=MONDAY,
+                    scheduled_time=datetime.time(10), duration=15, auto=True)
+            except OperationalError:
+                failures.append(thread)
+    finally:
+        connection.close()
+
+
+def main(threads=16, hearings=50):
+    directory = tempfile.mkdtemp()
+    teardown = setup_django(sqlite_path=os.path.join(directory, "bench.sqlite3"))
+    try:
+        from django.conf import settings
+        from django.db import connection
+        from django.test import override_settings
+
+        from api.models import Hearing, PreTrial, UserAccount
+
+        user = UserAccount.objects.create_user(
+            email="clerk@example.com", name="Clerk", password="x")
+        pretrial = PreTrial.objects.create(user=user, case_act="IPC 420")
+
+        scenarios = [
+            ("rollback journal, BEGIN (before)", {"journal_mode": "DELETE"}, False),
+            ("WAL + pragmas, BEGIN", settings.SQLITE_PRAGMAS, False),
+            ("WAL + pragmas, BEGIN IMMEDIATE (after)", settings.SQLITE_PRAGMAS, True),
+        ]
+        for label, pragmas, immediate in scenarios:
+            with override_settings(SQLITE_PRAGMAS=pragmas, SQLITE_BEGIN_IMMEDIATE=immediate):
+                Hearing.objects.all().delete()
+                # The journal mode can only change while no other connection
+                # is open: reconnect to apply it before the threads start.
+                connection.close()
+                connection.ensure_connection()
+                connection.close()
+
+                failures = []
+                workers = [
+                    threading.Thread(target=_worker,
+                                     args=(thread, hearings, pretrial.pk, failures))
+                    for thread in range(threads)]
+                with timer(label, threads * hearings, "hearings"):
+                    for worker in workers:
+                        worker.start()
+                    for worker in workers:
+                        worker.join()
+                print(f"{'':<40} {len(failures)} database is locked")
+    finally:
+        teardown()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
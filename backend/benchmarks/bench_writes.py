@@ -0,0 +1,98 @@
+"""
+Write throughput under concurrent registrations and hearing creation.
+
+    python -m benchmarks.bench_writes [threads] [operations]
+
+Each of ``threads`` threads (default 1, 8 and 32), with its own database
+connection like a gunicorn worker, performs ``operations`` times: a client
+registration (``POST /api/v1/register/client/``), a pre-trial for them and
+three hearings scheduled through ``POST /api/v1/hearing/schedule/``. Prints
+the operations per second and how many failed, e.g. with "database is
+locked".
+
+Run it once per database backend to compare them::
+
+    python -m benchmarks.bench_writes
+    DATABASE_ENGINE=postgresql POSTGRES_PASSWORD=... python -m benchmarks.bench_writes
+
+Passwords are hashed with MD5 here so that the database writes, not the
+password hasher, are measured.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from benchmarks import setup_django, timer
+
+HEARINGS = 3
+
+
+def _worker(thread, operations, failures):
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from api.models import PreTrial
+
+    client = APIClient()
+    try:
+        for i in range(operations):
+            try:
+                response = client.post("/api/v1/register/client/", {
+                    "email": f"client-{thread}-{i}-{os.urandom(4).hex()}@example.com",
+                    "name": "Client", "password": "bench-password-1"}, format="json")
+                assert response.status_code == 201, response.content
+                token = response.data["access"]
+                pretrial = PreTrial.objects.create(
+                    user_id=_user_id(token), case_act="IPC 420")
+
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+                for hour in range(HEARINGS):
+                    response = client.post("/api/v1/hearing/schedule/", {
+                        "pretrial": pretrial.pk, "scheduled_date": "2024-01-08",
+                        "scheduled_time": f"{10 + hour}:00"}, format="json")
+                    assert response.status_code == 201, response.content
+                client.credentials()
+            except Exception:
+                failures.append(thread)
+                client.credentials()
+    finally:
+        connection.close()
+
+
+def _user_id(token) -> int:
+    from rest_framework_simplejwt.tokens import AccessToken
+    return AccessToken(token)["user_id"]
+
+
+def main(*args):
+    threads = args[:1] or (1, 8, 32)
+    operations = args[1] if len(args) > 1 else 50
+    directory = tempfile.mkdtemp()
+    teardown = setup_django(sqlite_path=os.path.join(directory, "bench.sqlite3"))
+    try:
+        from django.db import connection
+        from django.test import override_settings
+
+        print(f"{connection.vendor}:")
+        with override_settings(PASSWORD_HASHERS=[
+                'django.contrib.auth.hashers.MD5PasswordHasher']):
+            for count in threads:
+                failures = []
+                workers = [
+                    threading.Thread(target=_worker, args=(thread, operations, failures))
+                    for thread in range(count)]
+                with timer(f"{count} threads", count * operations, "operations"):
+                    for worker in workers:
+                        worker.start()
+                    for worker in workers:
+                        worker.join()
+                print(f"{'':<40} {len(failures)} operations failed")
+    finally:
+        teardown()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
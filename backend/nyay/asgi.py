@@ -3,6 +3,16 @@ ASGI config for nyay project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with uvicorn workers under gunicorn, which restarts them as it
+does the sync workers::
+
+    gunicorn nyay.asgi:application -k uvicorn.workers.UvicornWorker --workers 4
+
+(or ``ASGI=1`` in the container). The async endpoints under ``api/v1/async/``
+then read from the database without holding a worker; every other endpoint
+keeps working, run by Django in a thread per request. Under WSGI
+(``nyay.wsgi``) the async endpoints still answer, one event loop per request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
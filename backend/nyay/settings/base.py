@@ -16,7 +16,7 @@ from dotenv import load_dotenv
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 # Load .env file
 load_dotenv()
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'corsheaders',
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'whitenoise',
     'drf_spectacular',
 
@@ -72,6 +73,11 @@ MIDDLEWARE = [
 
     # Add the account middleware:
     "allauth.account.middleware.AccountMiddleware",
+
+    # Routes reads to the database replicas, see api/replicas.py
+    'api.replicas.replica_middleware',
+    # Routes the case tables to the user's shard, see api/sharding.py
+    'api.sharding.shard_middleware',
 ]
 
 
@@ -109,8 +115,12 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
 
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'api.authentication.GenerationJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 
 }
 
@@ -147,13 +157,154 @@ WSGI_APPLICATION = 'nyay.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DATABASE_ENGINE is "sqlite" (the file named by SQLITE_PATH) or "postgresql"
+# (the POSTGRES_* variables). Connections are kept open for
+# DATABASE_CONN_MAX_AGE seconds and checked before being reused, except
+# under ASGI or pgbouncer (below), where they are closed after each request.
+DATABASE_ENGINE = os.getenv("DATABASE_ENGINE", "sqlite")
+# Set DATABASE_POOL to "pgbouncer" when POSTGRES_HOST is a pgbouncer in
+# transaction pooling mode, which hands every transaction whichever server
+# connection is free: server-side cursors and prepared statements, which
+# live on one server connection, are then turned off.
+DATABASE_POOL = os.getenv("DATABASE_POOL", "")
+# Under ASGI (ASGI=1, see the Dockerfile) Django opens a connection per
+# sync_to_async thread, so persistent connections pile up idle; behind
+# pgbouncer the pooler already keeps the server connections, and a client
+# connection held open only takes a pool slot. Both force CONN_MAX_AGE=0.
+ASGI = os.getenv("ASGI") == "1"
+DATABASE_CONN_MAX_AGE = 0 if ASGI or DATABASE_POOL == "pgbouncer" else \
+    int(os.getenv("DATABASE_CONN_MAX_AGE", 60))
+
+_DATABASES = {
+    "sqlite": {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+    },
+    "postgresql": {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv("POSTGRES_DB", "nibtara"),
+        'USER': os.getenv("POSTGRES_USER", "postgres"),
+        'PASSWORD': os.getenv("POSTGRES_PASSWORD", ""),
+        'HOST': os.getenv("POSTGRES_HOST", "localhost"),
+        'PORT': os.getenv("POSTGRES_PORT", "5432"),
+        'DISABLE_SERVER_SIDE_CURSORS': DATABASE_POOL == "pgbouncer",
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv("POSTGRES_CONNECT_TIMEOUT", 5)),
+            **({'prepare_threshold': None} if DATABASE_POOL == "pgbouncer" else {}),
+        },
+    },
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **_DATABASES[DATABASE_ENGINE],
+        'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas, used by the list, search, export and dashboard endpoints
+# (see api/replicas.py): SQLITE_REPLICA_PATHS or POSTGRES_REPLICA_HOSTS
+# ("host" or "host:port"), comma separated. Tests read the replicas from the
+# test database of the primary.
+_REPLICAS = {
+    "sqlite": [{'NAME': path}
+               for path in os.getenv("SQLITE_REPLICA_PATHS", "").split(",") if path],
+    "postgresql": [dict(zip(('HOST', 'PORT'), host.split(":")))
+                   for host in os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",") if host],
+}[DATABASE_ENGINE]
+
+DATABASES.update({
+    f'replica{i}': {**DATABASES['default'], **replica, 'TEST': {'MIRROR': 'default'}}
+    for i, replica in enumerate(_REPLICAS, 1)
+})
+DATABASE_REPLICAS = [f'replica{i}' for i in range(1, len(_REPLICAS) + 1)]
+
+# Shards of the case tables (see api/sharding.py), after `default` which is
+# shard 0: SQLITE_SHARD_PATHS or POSTGRES_SHARD_HOSTS, comma separated. Set
+# them up with `manage.py prepare_shards`. Adding shards moves users to other
+# shards, whose cases then have to be moved along.
+_SHARDS = {
+    "sqlite": [{'NAME': path}
+               for path in os.getenv("SQLITE_SHARD_PATHS", "").split(",") if path],
+    "postgresql": [dict(zip(('HOST', 'PORT'), host.split(":")))
+                   for host in os.getenv("POSTGRES_SHARD_HOSTS", "").split(",") if host],
+}[DATABASE_ENGINE]
+
+DATABASES.update({
+    f'shard{i}': {**DATABASES['default'], **shard}
+    for i, shard in enumerate(_SHARDS, 1)
+})
+CASE_SHARDS = ['default', *(f'shard{i}' for i in range(1, len(_SHARDS) + 1))] if _SHARDS else []
+
+DATABASE_ROUTERS = ['api.sharding.ShardRouter', 'api.replicas.ReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they wrote.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+# Applied to every new SQLite connection (see api/db.py). The busy timeout is
+# in milliseconds, a negative cache_size is in KiB.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024)),
+    "temp_store": "MEMORY",
+}
+# Begin the transactions of write endpoints with BEGIN IMMEDIATE on SQLite.
+SQLITE_BEGIN_IMMEDIATE = os.getenv("SQLITE_BEGIN_IMMEDIATE", "1") == "1"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# CACHE_BACKEND is "locmem" (per process) or "file" (shared by the workers of
+# one host, CACHE_LOCATION is then the directory).
+
+_CACHE_BACKENDS = {
+    "locmem": 'django.core.cache.backends.locmem.LocMemCache',
+    "file": 'django.core.cache.backends.filebased.FileBasedCache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': _CACHE_BACKENDS[os.getenv("CACHE_BACKEND", "locmem")],
+        'LOCATION': os.getenv("CACHE_LOCATION", "nibtara"),
+    }
+}
+
+# Seconds list responses are cached for, on top of signal based invalidation.
+LIST_CACHE_TIMEOUT = int(os.getenv("LIST_CACHE_TIMEOUT", 300))
+# Seconds other requests wait for a response that is being computed.
+LIST_CACHE_LOCK_TIMEOUT = int(os.getenv("LIST_CACHE_LOCK_TIMEOUT", 5))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+
+# The first hasher hashes new passwords; the others can still verify existing
+# hashes, which are upgraded to the first one on the user's next login.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2")
+
+_PASSWORD_HASHERS = {
+    "argon2": 'api.hashers.TunedArgon2PasswordHasher',
+    "pbkdf2": 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Argon2id costs (memory in KiB). The defaults follow the OWASP minimum of
+# 19 MiB, 2 iterations, 1 lane, which is far cheaper per login than
+# Django's 600k PBKDF2 iterations while staying memory-hard.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 19456))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -173,14 +324,53 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# How issued JWTs are revoked:
+# - "blacklist": rotated and logged out refresh tokens are written to the
+#   simplejwt blacklist tables (on top of the generation check below).
+# - "generation": only the per-user token generation counter is used; logging
+#   out everywhere is a single UPDATE and nothing is written to the blacklist.
+JWT_REVOCATION_MODE = os.getenv("JWT_REVOCATION_MODE", "blacklist")
+
+# Seconds a user's token generation is cached for. Other workers notice a
+# "logout all" at the latest after this long unless the cache is shared.
+TOKEN_GENERATION_CACHE_TIMEOUT = int(
+    os.getenv("TOKEN_GENERATION_CACHE_TIMEOUT", 60))
+
+# Seconds the is_active flag is cached for by ClaimsJWTAuthentication, which
+# otherwise trusts the is_active claim until the access token expires.
+# 0 disables the check.
+TOKEN_ACTIVE_CACHE_TIMEOUT = int(os.getenv("TOKEN_ACTIVE_CACHE_TIMEOUT", 30))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=3),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True
+    'BLACKLIST_AFTER_ROTATION': JWT_REVOCATION_MODE == "blacklist",
+    'TOKEN_OBTAIN_SERIALIZER': 'api.serializers.GenerationTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'api.serializers.GenerationTokenRefreshSerializer',
 }
 
 
+# Hearing scheduling: court hours ("HH:MM"), the weekdays courts sit on
+# (Monday is 0) and how many days ahead a free slot is searched for.
+COURT_DAY_START = os.getenv("COURT_DAY_START", "10:00")
+COURT_DAY_END = os.getenv("COURT_DAY_END", "17:00")
+COURT_WORKING_DAYS = tuple(
+    int(day) for day in os.getenv("COURT_WORKING_DAYS", "0,1,2,3,4").split(","))
+SCHEDULING_HORIZON_DAYS = int(os.getenv("SCHEDULING_HORIZON_DAYS", 90))
+
+# Judge assignment balances load = caseload * JUDGE_CASE_WEIGHT +
+# upcoming hearings * JUDGE_HEARING_WEIGHT.
+JUDGE_CASE_WEIGHT = int(os.getenv("JUDGE_CASE_WEIGHT", 2))
+JUDGE_HEARING_WEIGHT = int(os.getenv("JUDGE_HEARING_WEIGHT", 1))
+
+# Change feeds hold back rows written in the last SYNC_SETTLE_SECONDS, whose
+# transactions may not have committed yet, and keep tombstones of deleted
+# rows for SYNC_TOMBSTONE_DAYS; older watermarks have to sync from scratch.
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", 2))
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", 90))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -1,17 +1,3 @@
-from pathlib import Path
-
 DEBUG = True
 
 ALLOWED_HOSTS = ["*"]
-
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-
-# Database
-# https://docs.djangoproject.com/en/4.1/ref/settings/#databases
-
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
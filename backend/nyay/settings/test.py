@@ -0,0 +1,12 @@
+"""
+Settings for the test suite: the development settings plus two shard
+databases. Sharding stays off (``CASE_SHARDS``) unless a test turns it on,
+as api/tests/test_sharding.py does.
+"""
+from . import *  # noqa: F401,F403
+
+for _alias in ('shard1', 'shard2'):
+    DATABASES.setdefault(_alias, {
+        **DATABASES['default'],
+        'TEST': {'NAME': None if DATABASE_ENGINE == 'sqlite' else f"test_{_alias}"},
+    })